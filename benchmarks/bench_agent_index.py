@@ -0,0 +1,88 @@
+"""Benchmark :class:`isek.node.agent_index.AgentCardIndex` at directory scale.
+
+Usage::
+
+    python -m benchmarks.bench_agent_index --agents 20000 --queries 2000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from isek.node.agent_index import AgentCardIndex
+
+MODES = ["text/plain", "application/json", "image/png", "audio/wav", "video/mp4"]
+
+
+def make_card(i: int, rng: random.Random, n_skills: int, n_tags: int) -> dict:
+    skills = []
+    for s in range(rng.randint(1, 4)):
+        skills.append(
+            {
+                "id": f"skill-{rng.randrange(n_skills)}",
+                "name": f"Skill {i}-{s}",
+                "description": "generated",
+                "tags": [f"tag-{rng.randrange(n_tags)}" for _ in range(3)],
+                "inputModes": rng.sample(MODES, 2),
+                "outputModes": rng.sample(MODES, 1),
+            }
+        )
+    return {
+        "name": f"agent-{i}",
+        "url": f"http://agent-{i}.local",
+        "defaultInputModes": ["text/plain"],
+        "defaultOutputModes": ["text/plain"],
+        "skills": skills,
+    }
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--tags", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    cards = [make_card(i, rng, args.skills, args.tags) for i in range(args.agents)]
+
+    index = AgentCardIndex()
+    started = time.perf_counter()
+    for card in cards:
+        index.add(card["url"], card)
+    build_s = time.perf_counter() - started
+
+    queries = [
+        {"tag": f"tag-{rng.randrange(args.tags)}", "mode": rng.choice(MODES)}
+        if i % 2
+        else {"skill": f"skill-{rng.randrange(args.skills)}"}
+        for i in range(args.queries)
+    ]
+    latencies = []
+    hits = 0
+    for query in queries:
+        started = time.perf_counter()
+        hits += len(index.find_agents(**query))
+        latencies.append((time.perf_counter() - started) * 1e6)
+
+    print(f"agents indexed : {len(index)} in {build_s * 1000:.1f} ms")
+    print(f"queries        : {len(queries)} (avg {hits / len(queries):.1f} hits)")
+    print(
+        "latency (us)   : "
+        f"mean={statistics.mean(latencies):.1f} "
+        f"p50={percentile(latencies, 50):.1f} "
+        f"p99={percentile(latencies, 99):.1f} "
+        f"max={max(latencies):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
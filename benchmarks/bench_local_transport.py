@@ -0,0 +1,140 @@
+"""Compare same-host A2A calls over the local Unix-socket transport and over HTTP.
+
+Starts an echo agent in a separate process, publishes it in a temporary
+local registry directory, then sends the same ``message/send`` requests:
+
+* ``http``  straight to the agent over loopback HTTP (one hop; the bridge
+  path makes two of these plus two Node.js and libp2p hops and the relay);
+* ``local`` through :meth:`A2AProtocolV2.send_message` over the Unix socket;
+* ``bridge`` through a running p2p bridge, when ``--bridge-port`` and
+  ``--peer-id`` are given.
+
+Usage::
+
+    python -m benchmarks.bench_local_transport --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.faulty_agent import serve
+from isek.protocol.a2a_protocol_v2 import A2AProtocolV2
+from isek.protocol.local_transport import LocalPeerDirectory
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+RECEIVER_PEER_ID = "bench-receiver"
+
+
+async def run_receiver(port: int, registry: str) -> None:
+    await serve("local-echo", port)
+    receiver = A2AProtocolV2(port=port, local_registry_dir=registry)
+    receiver.peer_id = RECEIVER_PEER_ID
+    receiver.start_local_transport()
+    await asyncio.Event().wait()
+
+
+def start_receiver(port: int, registry: str) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_local_transport",
+            "--receiver",
+            f"--port={port}",
+            f"--registry={registry}",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    directory = LocalPeerDirectory(registry)
+    while not directory.has(RECEIVER_PEER_ID):
+        if process.poll() is not None:
+            raise RuntimeError("receiver exited before becoming ready")
+        time.sleep(0.05)
+    return process
+
+
+def measure(name, send, requests, warmup=20):
+    for i in range(warmup):
+        send(f"warmup {i}")
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        send(f"ping {i}")
+        latencies.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{name:<7} p50={percentile(latencies, 50):7.2f}ms "
+        f"p99={percentile(latencies, 99):7.2f}ms "
+        f"mean={statistics.fmean(latencies):7.2f}ms"
+    )
+    return latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=19200)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--bridge-port", type=int)
+    parser.add_argument("--peer-id", help="Remote peer ID to call via the bridge")
+    parser.add_argument("--receiver", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--registry", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.receiver:
+        asyncio.run(run_receiver(args.port, args.registry))
+        return
+
+    registry = tempfile.mkdtemp(prefix="isek-local-")
+    receiver = start_receiver(args.port, registry)
+    sender = A2AProtocolV2(port=args.port + 1, local_registry_dir=registry)
+
+    http = httpx.Client(timeout=60.0)
+
+    def send_http(text):
+        body = sender._build_jsonrpc_send_message_request("bench-sender", text)
+        response = http.post(f"http://127.0.0.1:{args.port}/", json=body)
+        return json.loads(response.content)
+
+    def send_local(text):
+        return sender.send_message("bench-sender", RECEIVER_PEER_ID, text)
+
+    print(f"{args.requests} sequential message/send calls to an echo agent")
+    http_ms = measure("http", send_http, args.requests)
+    local_ms = measure("local", send_local, args.requests)
+    print(
+        f"local vs http p50: "
+        f"{percentile(http_ms, 50) / percentile(local_ms, 50):.2f}x"
+    )
+
+    if args.bridge_port and args.peer_id:
+        bridge = A2AProtocolV2(port=args.port + 2, p2p_server_port=args.bridge_port)
+        bridge._load_p2p_context()
+        bridge_ms = measure(
+            "bridge",
+            lambda text: bridge.send_message("bench-sender", args.peer_id, text),
+            args.requests,
+        )
+        print(
+            f"local vs bridge p50: "
+            f"{percentile(bridge_ms, 50) / percentile(local_ms, 50):.2f}x"
+        )
+
+    sender.stop_local_transport()
+    receiver.terminate()
+
+
+if __name__ == "__main__":
+    main()
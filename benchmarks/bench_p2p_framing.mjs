@@ -0,0 +1,138 @@
+// Benchmark the bridge-to-bridge wire formats used by p2p_server.js.
+//
+// For one request/response round trip through two bridges, measures the bytes
+// carried over libp2p and the CPU the bridges spend serialising them:
+//
+//   legacy   JSON {path, body} envelopes; each bridge parses and
+//            re-serialises the payload (CHAT_PROTOCOL).
+//   frame    raw JSON bytes in a compact frame (FRAME_PROTOCOL), with the
+//            given compression above the threshold.
+//
+// Usage:
+//
+//   node benchmarks/bench_p2p_framing.mjs [--iterations=200] [--threshold=1024] [--json]
+
+import { encodeFrame, decodeFrame } from '../isek/protocol/p2p/framing.js'
+
+const args = Object.fromEntries(
+  process.argv.slice(2).map(arg => {
+    const [key, value] = arg.replace(/^--/, '').split('=')
+    return [key, value ?? true]
+  })
+)
+const iterations = parseInt(args.iterations ?? '200', 10)
+const threshold = parseInt(args.threshold ?? '1024', 10)
+
+const WORDS = 'agent task message result context artifact status peer relay node skill text'.split(' ')
+
+function makeText (size, seed) {
+  const words = []
+  let length = 0
+  let x = seed
+  while (length < size) {
+    x = (x * 1103515245 + 12345) & 0x7fffffff
+    const word = WORDS[x % WORDS.length]
+    words.push(word)
+    length += word.length + 1
+  }
+  return words.join(' ')
+}
+
+function makeRequest (size) {
+  return {
+    id: 'a'.repeat(32),
+    jsonrpc: '2.0',
+    method: 'message/send',
+    params: {
+      message: {
+        role: 'user',
+        parts: [{ kind: 'text', text: makeText(size, 1) }],
+        messageId: 'b'.repeat(32)
+      },
+      metadata: { sender_node_id: 'node-a' }
+    }
+  }
+}
+
+function makeResponse (size) {
+  return {
+    id: 'a'.repeat(32),
+    jsonrpc: '2.0',
+    result: {
+      kind: 'task',
+      id: 'c'.repeat(32),
+      contextId: 'd'.repeat(32),
+      status: { state: 'completed', timestamp: new Date(0).toISOString() },
+      artifacts: [{ artifactId: 'e'.repeat(32), parts: [{ kind: 'text', text: makeText(size, 2) }] }]
+    }
+  }
+}
+
+const encode = value => Buffer.from(JSON.stringify(value))
+const decode = bytes => JSON.parse(new TextDecoder().decode(bytes))
+
+// Mirrors the legacy code path: express.json() -> envelope -> remote parse ->
+// fetch body -> response.json() -> reply envelope -> local parse -> res.json().
+async function legacyRoundTrip (requestBytes, responseBytes) {
+  const body = decode(requestBytes)
+  const wireRequest = encode({ path: '/query', body })
+  const { body: remoteBody } = decode(wireRequest)
+  encode(remoteBody)
+  const agentReply = decode(responseBytes)
+  const wireResponse = encode(agentReply)
+  encode(decode(wireResponse))
+  return wireRequest.length + wireResponse.length
+}
+
+// Mirrors the framed code path: bytes in, bytes out, compression on the wire.
+async function frameRoundTrip (requestBytes, responseBytes, options) {
+  const wireRequest = await encodeFrame('/query', requestBytes, options)
+  await decodeFrame(wireRequest)
+  const wireResponse = await encodeFrame('', responseBytes, options)
+  await decodeFrame(wireResponse)
+  return wireRequest.length + wireResponse.length
+}
+
+async function measure (fn) {
+  await fn() // warm up
+  const cpuStart = process.cpuUsage()
+  const wallStart = process.hrtime.bigint()
+  let bytes = 0
+  for (let i = 0; i < iterations; i++) {
+    bytes = await fn()
+  }
+  const wall = Number(process.hrtime.bigint() - wallStart) / 1e3 / iterations
+  const cpu = process.cpuUsage(cpuStart)
+  return { bytes, cpu_us: (cpu.user + cpu.system) / iterations, wall_us: wall }
+}
+
+const results = []
+for (const size of [256, 4 * 1024, 64 * 1024, 1024 * 1024]) {
+  const requestBytes = encode(makeRequest(size))
+  const responseBytes = encode(makeResponse(size))
+  const raw = requestBytes.length + responseBytes.length
+
+  const variants = {
+    legacy: () => legacyRoundTrip(requestBytes, responseBytes),
+    'frame/none': () => frameRoundTrip(requestBytes, responseBytes, { codec: 'none', threshold }),
+    'frame/gzip': () => frameRoundTrip(requestBytes, responseBytes, { codec: 'gzip', threshold }),
+    'frame/brotli': () => frameRoundTrip(requestBytes, responseBytes, { codec: 'brotli', threshold })
+  }
+  for (const [format, fn] of Object.entries(variants)) {
+    results.push({ payload_bytes: raw, format, ...(await measure(fn)) })
+  }
+}
+
+if (args.json) {
+  console.log(JSON.stringify({ iterations, threshold, results }, null, 2))
+} else {
+  console.log(`iterations=${iterations} threshold=${threshold}B (bytes are per round trip)`)
+  console.log('payload_B   format         wire_B  wire/raw   cpu_us   wall_us')
+  for (const r of results) {
+    console.log(
+      `${String(r.payload_bytes).padStart(9)}   ${r.format.padEnd(12)} ` +
+      `${String(r.bytes).padStart(8)}  ${(r.bytes / r.payload_bytes).toFixed(2).padStart(8)} ` +
+      `${r.cpu_us.toFixed(1).padStart(8)}  ${r.wall_us.toFixed(1).padStart(8)}`
+    )
+  }
+}
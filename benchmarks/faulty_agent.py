@@ -0,0 +1,174 @@
+"""Local stand-in agent server that injects faults, for exercising Node resilience.
+
+Usage::
+
+    python -m benchmarks.faulty_agent --error-rate 0.3 --slow-rate 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from starlette.responses import JSONResponse
+
+from isek.adapter.base import AgentAdapter, AgentAdapterExecutor
+from isek.node.node_v3_a2a import Node
+from isek.node.resilience import HedgePolicy, ResilientCaller, RetryPolicy
+
+
+class EchoAdapter(AgentAdapter):
+    """Adapter that answers every query with ``echo: <query>``."""
+
+    async def run(self, query: str, context_id: str) -> str:
+        return f"echo: {query}"
+
+
+class FaultInjectionMiddleware:
+    """ASGI middleware failing or delaying a share of JSON-RPC calls.
+
+    Agent-card requests are never faulted so that only the task call is
+    affected.
+
+    :param error_rate: Share of calls answered with *status_code*.
+    :param slow_rate: Share of calls delayed by *slow_delay* seconds.
+    """
+
+    def __init__(
+        self,
+        app,
+        error_rate: float = 0.0,
+        status_code: int = 503,
+        slow_rate: float = 0.0,
+        slow_delay: float = 1.0,
+        seed: int = 0,
+    ) -> None:
+        self.app = app
+        self.error_rate = error_rate
+        self.status_code = status_code
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.injected_errors = 0
+        self.injected_delays = 0
+        self._rng = random.Random(seed)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/.well-known"):
+            await self.app(scope, receive, send)
+            return
+        roll = self._rng.random()
+        if roll < self.error_rate:
+            self.injected_errors += 1
+            response = JSONResponse({"error": "injected"}, status_code=self.status_code)
+            await response(scope, receive, send)
+            return
+        if roll < self.error_rate + self.slow_rate:
+            self.injected_delays += 1
+            await asyncio.sleep(self.slow_delay)
+        await self.app(scope, receive, send)
+
+
+def make_card(name: str, port: int) -> AgentCard:
+    return AgentCard(
+        name=name,
+        url=f"http://127.0.0.1:{port}",
+        description="Fault-injecting stand-in agent",
+        version="1.0",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text/plain"],
+        defaultOutputModes=["text/plain"],
+        skills=[
+            AgentSkill(
+                id="echo", name="Echo", description="Echo the query", tags=["echo"]
+            )
+        ],
+    )
+
+
+async def serve(name: str, port: int, **faults) -> FaultInjectionMiddleware:
+    """Start a faulty agent on *port* in the running loop and return its middleware."""
+    import uvicorn
+
+    card = make_card(name, port)
+    app = Node.create_server(AgentAdapterExecutor(EchoAdapter(card)), card)
+    faulty = FaultInjectionMiddleware(app.build(), **faults)
+    server = uvicorn.Server(
+        uvicorn.Config(faulty, host="127.0.0.1", port=port, log_level="error")
+    )
+    asyncio.get_running_loop().create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return faulty
+
+
+async def run(args) -> None:
+    primary = await serve(
+        "faulty-primary",
+        args.port,
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay,
+    )
+    await serve("healthy-backup", args.port + 1)
+
+    client = Node(
+        host="127.0.0.1",
+        port=args.port + 2,
+        node_id="resilience-client",
+        resilience=ResilientCaller(
+            retry=RetryPolicy(max_attempts=args.attempts, base_delay=0.01),
+            hedge=HedgePolicy(percentile=95, min_samples=10) if args.hedge else None,
+        ),
+    )
+    primary_url = f"http://127.0.0.1:{args.port}"
+    await client.add_peers([primary_url, f"http://127.0.0.1:{args.port + 1}"])
+
+    latencies, failures = [], 0
+    for i in range(args.requests):
+        started = time.perf_counter()
+        try:
+            await client.send_message(
+                primary_url, f"ping {i}", hedge_urls=True, failover_peers=True
+            )
+        except Exception:
+            failures += 1
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    print(f"requests       : {args.requests} ({failures} failed)")
+    print(
+        f"injected       : {primary.injected_errors} errors, "
+        f"{primary.injected_delays} delays"
+    )
+    print(
+        f"resilience     : {client.resilience.retries} retries, "
+        f"{client.resilience.hedges} hedges, "
+        f"breaker={client.resilience.breaker(primary_url).state}"
+    )
+    print(
+        f"latency (ms)   : p50={latencies[len(latencies) // 2] * 1000:.1f} "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1000:.1f}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=19100)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-delay", type=float, default=1.0)
+    parser.add_argument("--attempts", type=int, default=3)
+    parser.add_argument("--no-hedge", dest="hedge", action="store_false")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as workdir:
+        # Throwaway wallets for the stand-in agents, not the package's wallet.json.
+        os.environ["ISEK_WALLET_DATA_FILE"] = os.path.join(workdir, "w.json")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
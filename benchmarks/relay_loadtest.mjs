@@ -0,0 +1,260 @@
+// Load test for relay.js: simulated bridges reserve a circuit on the relay
+// and call each other through it, in steps of increasing population, until
+// the relay saturates.
+//
+// Usage:
+//   node benchmarks/relay_loadtest.mjs [--relay=<multiaddr>] [--metrics=<url>]
+//                                      [--steps=10,20,50,100,200] [--duration=10]
+//                                      [--payload=1024] [--concurrency=1] [--port=9290]
+//
+// The libp2p packages are taken from isek/protocol/p2p/node_modules, so run
+// `isek setup` first.  Without --relay a relay.js is started locally on --port with its metrics on
+// port+100, without per-circuit data/duration caps (so the test measures
+// relay capacity rather than the default limits) and with room for every
+// simulated bridge.  Half of the bridges in each step send --payload bytes to
+// an echo handler on the other half, --concurrency calls at a time each.
+//
+// Each step prints one JSON line: call rate, latency percentiles, errors,
+// failed reservations and, when metrics are available, the relay's CPU, RSS
+// and circuit counts.  The test stops at the first step whose error rate
+// exceeds 1% or whose call rate grows less than 5% over the previous step,
+// and reports the previous step as the saturation point.  The simulated
+// bridges run in this process: check that its own CPU use (`driver_cpu_percent`)
+// stays below one core, or the driver rather than the relay is the limit.
+
+import { spawn } from 'child_process'
+import { register } from 'module'
+import path from 'path'
+import { fileURLToPath, pathToFileURL } from 'url'
+
+const P2P_DIR = path.join(path.dirname(fileURLToPath(import.meta.url)), '..', 'isek', 'protocol', 'p2p')
+
+// Resolve the packages this script imports from the bridge's node_modules,
+// which node would not search from benchmarks/.
+register('data:text/javascript,' + encodeURIComponent(`
+export async function resolve (specifier, context, next) {
+  try {
+    return await next(specifier, context)
+  } catch (err) {
+    if (err.code !== 'ERR_MODULE_NOT_FOUND') throw err
+    return next(specifier, { ...context, parentURL: ${JSON.stringify(pathToFileURL(path.join(P2P_DIR, 'package.json')).href)} })
+  }
+}
+`))
+
+const { createLibp2p } = await import('libp2p')
+const { noise } = await import('@chainsafe/libp2p-noise')
+const { yamux } = await import('@chainsafe/libp2p-yamux')
+const { webSockets } = await import('@libp2p/websockets')
+const filters = await import('@libp2p/websockets/filters')
+const { identify } = await import('@libp2p/identify')
+const { circuitRelayTransport } = await import('@libp2p/circuit-relay-v2')
+const { multiaddr } = await import('@multiformats/multiaddr')
+const { lpStream } = await import('it-length-prefixed-stream')
+
+const ECHO_PROTOCOL = '/isek/loadtest-echo/1.0.0'
+const RESERVATION_TIMEOUT_MS = 15000
+
+const args = process.argv.slice(2)
+function option (name, fallback) {
+  const arg = args.find(a => a.startsWith(`--${name}=`))
+  return arg ? arg.slice(name.length + 3) : fallback
+}
+
+const steps = option('steps', '10,20,50,100,200').split(',').map(n => parseInt(n, 10))
+const durationMs = parseFloat(option('duration', '10')) * 1000
+const payloadSize = parseInt(option('payload', '1024'), 10)
+const concurrency = parseInt(option('concurrency', '1'), 10)
+const relayPort = parseInt(option('port', '9290'), 10)
+
+function percentile (samples, pct) {
+  if (samples.length === 0) {
+    return null
+  }
+  const ordered = [...samples].sort((a, b) => a - b)
+  return ordered[Math.min(ordered.length - 1, Math.floor(ordered.length * pct / 100))]
+}
+
+// Start relay.js and resolve with its address once it prints its peer id
+function startRelay () {
+  const script = path.join(P2P_DIR, 'relay.js')
+  const child = spawn(process.execPath, [
+    script,
+    `--port=${relayPort}`,
+    `--metrics_port=${relayPort + 100}`,
+    `--max_reservations=${Math.max(...steps) + 16}`,
+    '--data_limit=0',
+    '--duration_limit=0'
+  ], { stdio: ['ignore', 'pipe', 'inherit'] })
+  return new Promise((resolve, reject) => {
+    child.once('exit', code => reject(new Error(`relay.js exited with code ${code}`)))
+    child.stdout.on('data', chunk => {
+      const match = /peerId=(\S+)/.exec(chunk.toString())
+      if (match) {
+        resolve({
+          child,
+          address: `/ip4/127.0.0.1/tcp/${relayPort}/ws/p2p/${match[1]}`,
+          metrics: `http://127.0.0.1:${relayPort + 100}/metrics`
+        })
+      }
+    })
+  })
+}
+
+async function relayMetrics (url) {
+  if (!url) {
+    return null
+  }
+  try {
+    const response = await fetch(url)
+    return await response.json()
+  } catch (err) {
+    return null
+  }
+}
+
+// A simulated bridge: reserves a circuit on the relay and echoes calls.
+async function startBridge (relayAddress) {
+  const node = await createLibp2p({
+    addresses: { listen: ['/p2p-circuit'] },
+    transports: [webSockets({ filter: filters.all }), circuitRelayTransport()],
+    connectionEncrypters: [noise()],
+    streamMuxers: [yamux()],
+    connectionGater: { denyDialMultiaddr: () => false },
+    services: { identify: identify() }
+  })
+  await node.handle(ECHO_PROTOCOL, async ({ stream }) => {
+    try {
+      const lp = lpStream(stream, { maxDataLength: payloadSize + 1024 })
+      await lp.write(await lp.read())
+      await stream.close()
+    } catch (err) {
+      stream.abort(err)
+    }
+  }, { runOnLimitedConnection: true })
+  await node.start()
+  await node.dial(multiaddr(relayAddress))
+
+  const circuit = `${relayAddress}/p2p-circuit/p2p/${node.peerId.toString()}`
+  const deadline = Date.now() + RESERVATION_TIMEOUT_MS
+  while (!node.getMultiaddrs().some(ma => ma.toString() === circuit)) {
+    if (Date.now() > deadline) {
+      return { node, circuit: null }
+    }
+    await new Promise(resolve => setTimeout(resolve, 100))
+  }
+  return { node, circuit }
+}
+
+async function call (sender, circuit, payload) {
+  const stream = await sender.node.dialProtocol(multiaddr(circuit), ECHO_PROTOCOL, {
+    runOnLimitedConnection: true,
+    signal: AbortSignal.timeout(10000)
+  })
+  const lp = lpStream(stream, { maxDataLength: payloadSize + 1024 })
+  await lp.write(payload)
+  await lp.read()
+  await stream.close()
+}
+
+async function runStep (bridges, relayAddress, metricsUrl) {
+  const reserved = bridges.filter(b => b.circuit)
+  const pairs = []
+  for (let i = 0; i + 1 < reserved.length; i += 2) {
+    pairs.push([reserved[i], reserved[i + 1]])
+  }
+  const payload = new Uint8Array(payloadSize)
+  const latencies = []
+  let errors = 0
+  await relayMetrics(metricsUrl) // reset the relay's CPU window
+  const cpuBefore = process.cpuUsage()
+  const started = Date.now()
+  const deadline = started + durationMs
+
+  await Promise.all(pairs.flatMap(([sender, receiver]) =>
+    Array.from({ length: concurrency }, async () => {
+      while (Date.now() < deadline) {
+        const t0 = performance.now()
+        try {
+          await call(sender, receiver.circuit, payload)
+          latencies.push(performance.now() - t0)
+        } catch (err) {
+          errors += 1
+        }
+      }
+    })
+  ))
+
+  const elapsedS = (Date.now() - started) / 1000
+  const cpu = process.cpuUsage(cpuBefore)
+  const relay = await relayMetrics(metricsUrl)
+  const total = latencies.length + errors
+  return {
+    bridges: bridges.length,
+    reserved: reserved.length,
+    calls_per_s: latencies.length / elapsedS,
+    p50_ms: percentile(latencies, 50),
+    p99_ms: percentile(latencies, 99),
+    errors,
+    error_rate: total ? errors / total : 0,
+    driver_cpu_percent: (cpu.user + cpu.system) / 1e6 / elapsedS * 100,
+    relay: relay && {
+      cpu_percent: relay.process.cpu_percent,
+      rss_bytes: relay.process.rss_bytes,
+      connections: relay.connections,
+      reservations: relay.reservations,
+      circuits_opened: relay.circuits.opened,
+      circuits_failed: relay.circuits.failed,
+      bytes_relayed: relay.circuits.bytes_relayed
+    }
+  }
+}
+
+async function main () {
+  let relay = null
+  let relayAddress = option('relay', null)
+  let metricsUrl = option('metrics', null)
+  if (!relayAddress) {
+    relay = await startRelay()
+    relayAddress = relay.address
+    metricsUrl = relay.metrics
+  }
+
+  const bridges = []
+  let previous = null
+  let saturation = null
+  try {
+    for (const population of steps) {
+      while (bridges.length < population) {
+        const batch = Array.from({ length: Math.min(20, population - bridges.length) },
+          () => startBridge(relayAddress))
+        bridges.push(...await Promise.all(batch))
+      }
+      const result = await runStep(bridges, relayAddress, metricsUrl)
+      console.log(JSON.stringify(result))
+
+      const saturated = result.reserved < result.bridges || result.error_rate > 0.01 ||
+        (previous && result.calls_per_s < previous.calls_per_s * 1.05)
+      if (saturated) {
+        saturation = previous || result
+        break
+      }
+      previous = result
+    }
+  } finally {
+    await Promise.all(bridges.map(b => b.node.stop()))
+    relay?.child.kill('SIGTERM')
+  }
+
+  if (saturation) {
+    console.log(`Saturation at about ${saturation.bridges} bridges, ` +
+      `${saturation.calls_per_s.toFixed(0)} calls/s of ${payloadSize} bytes`)
+  } else {
+    console.log('Relay did not saturate; add larger --steps')
+  }
+}
+
+main().catch(err => {
+  console.error('Load test failed:', err)
+  process.exit(1)
+})
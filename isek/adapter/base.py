@@ -0,0 +1,170 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from a2a.server.agent_execution.agent_executor import AgentExecutor
+from a2a.server.agent_execution.context import RequestContext
+from a2a.server.events.event_queue import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import AgentCard, InternalError, TaskState
+from a2a.utils import new_agent_text_message, new_task
+from a2a.utils.errors import ServerError
+
+from isek.adapter.conversation_memory import ConversationStore
+from isek.utils.common import (
+    log_agent_activity,
+    log_agent_request,
+    log_agent_response,
+    log_error,
+)
+from isek.utils.log import log
+
+ResponsePayload = Dict[str, Any]
+
+PROCESSING_MESSAGE = "Processing your request..."
+
+
+class AgentAdapter(ABC):
+    """Base class for wrapping an agent framework behind the ISEK contract.
+
+    A framework adapter only implements :meth:`run`, which returns the final
+    reply text for a query.  The base class turns that into the ``invoke`` /
+    ``stream`` interface consumed by :class:`AgentAdapterExecutor`, including
+    logging and mapping failures to an input-required response.  Adapters whose
+    framework can stream partial output may override :meth:`stream` as well.
+    """
+
+    def __init__(
+        self, agent_card: AgentCard, memory: Optional[ConversationStore] = None
+    ) -> None:
+        """Create the adapter.
+
+        Parameters
+        ----------
+        agent_card:
+            The card describing the wrapped agent.
+        memory:
+            Optional conversation store.  When set, the history recorded for a
+            ``context_id`` is replayed to the agent so follow-up turns only need
+            to carry the new message.
+        """
+        self._agent_card: AgentCard = agent_card
+        self._memory: Optional[ConversationStore] = memory
+
+    @property
+    def memory(self) -> Optional[ConversationStore]:
+        """The conversation store replaying history to the agent, if any.
+
+        Wrappers layered on top of an adapter (cache, micro-batcher) expose
+        the memory of the adapter they wrap under the same name.
+        """
+        return self._memory
+
+    @abstractmethod
+    async def run(self, query: str, context_id: str) -> Any:
+        """Run the agent on *query* and return the final reply."""
+
+    async def invoke(self, query: str, context_id: str) -> ResponsePayload:
+        """Run the agent and return the *final* response.
+
+        This convenience wrapper is useful when the caller is not interested in
+        the intermediate streaming messages produced by :meth:`stream`.
+        """
+        name = self._agent_card.name
+        log_agent_request(name, query, context_id)
+        try:
+            content = await self.run(query, context_id)
+        except Exception as exc:  # noqa: BLE001
+            log_error(f"Error during invoke: {exc}")
+            return {
+                "is_task_complete": False,
+                "require_user_input": True,
+                "content": f"Error: {exc}",
+            }
+        log_agent_response(name, "Task completed successfully", context_id)
+        return {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": content,
+        }
+
+    async def stream(
+        self, query: str, context_id: str
+    ) -> AsyncGenerator[ResponsePayload, None]:
+        """Yield incremental updates while the agent processes *query*."""
+        # Initial placeholder so the caller can display progress feedback
+        yield {
+            "is_task_complete": False,
+            "require_user_input": False,
+            "content": PROCESSING_MESSAGE,
+        }
+        yield await self.invoke(query, context_id)
+
+
+class AgentAdapterExecutor(AgentExecutor):
+    """A2A executor driving any adapter with the ``invoke``/``stream`` interface.
+
+    Handles task creation, status transitions, cancellation and error mapping
+    for every framework adapter.  Per-item work on the streaming path is kept
+    to building the outgoing message; diagnostics go through lazily formatted
+    debug logging.
+    """
+
+    def __init__(self, agent: AgentAdapter) -> None:
+        self.agent = agent
+        self._name: str = agent._agent_card.name
+        # task id -> asyncio task currently driving ``execute`` for it
+        self._running_tasks: Dict[str, asyncio.Task] = {}
+        log_agent_activity(self._name, "Initialized")
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        """Execute the agent."""
+        query = context.get_user_input()
+        task = context.current_task or new_task(context.message)
+        await event_queue.enqueue_event(task)
+        task_id, context_id = task.id, task.context_id
+        log_agent_activity(self._name, f"Started task {task_id}")
+
+        updater = TaskUpdater(event_queue, task_id, context_id)
+        current = asyncio.current_task()
+        if current is not None:
+            self._running_tasks[task_id] = current
+
+        try:
+            async for item in self.agent.stream(query, context_id):
+                message = new_agent_text_message(item["content"], context_id, task_id)
+                if item["is_task_complete"]:
+                    await updater.complete(message)
+                    log_agent_activity(self._name, f"Task {task_id} completed")
+                elif item["require_user_input"]:
+                    await updater.update_status(TaskState.input_required, message)
+                    log_agent_activity(
+                        self._name, f"Task {task_id} requires user input"
+                    )
+                else:
+                    await updater.update_status(TaskState.working, message)
+                    log.debug("[%s] task %s in progress", self._name, task_id)
+        except asyncio.CancelledError:
+            log_agent_activity(self._name, f"Task {task_id} canceled")
+            raise
+        except Exception as e:
+            log_error(f"Error in executor: {type(e).__name__}: {e}")
+            raise ServerError(error=InternalError()) from e
+        finally:
+            self._running_tasks.pop(task_id, None)
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        """Cancel a running task and publish its ``canceled`` state.
+
+        The asyncio task executing the agent is cancelled so the in-flight
+        agent run (and its model request) is abandoned instead of running to
+        completion for a client that has gone away.
+        """
+        task_id = context.task_id
+        running = self._running_tasks.pop(task_id, None)
+        if running is not None and not running.done():
+            running.cancel()
+            log_agent_activity(self._name, f"Cancelling running task {task_id}")
+
+        updater = TaskUpdater(event_queue, task_id, context.context_id)
+        await updater.cancel()
@@ -0,0 +1,178 @@
+import asyncio
+from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple
+
+from a2a.types import AgentCard
+
+from isek.adapter.base import ResponsePayload
+from isek.adapter.conversation_memory import ConversationStore
+from isek.adapter.response_cache import normalize_query
+from isek.utils.log import log
+
+# (query, context_id) handed to ``invoke_batch``
+BatchItem = Tuple[str, str]
+
+
+class MicroBatchingAgentWrapper:
+    """Coalesce bursts of requests to one agent into micro-batches.
+
+    Requests are collected until either *max_batch_size* are pending or
+    *max_wait* seconds have passed since the first one arrived.  Identical
+    queries within a batch are executed once and share the response.  If the
+    wrapped object exposes ``invoke_batch(items)`` (a list of
+    ``(query, context_id)`` tuples returning a list of payloads) the distinct
+    queries are dispatched through it in a single call; otherwise they run
+    concurrently through ``invoke``.
+
+    The wrapper has the same ``invoke``/``stream`` interface as
+    :class:`~isek.adapter.pydantic_ai_adapter.PydanticAIAgentWrapper`.  Since a
+    batched request has no intermediate progress to report, ``stream`` yields
+    only the final payload.
+
+    Parameters
+    ----------
+    wrapper:
+        The agent wrapper requests are dispatched to.
+    max_batch_size:
+        Number of pending requests that triggers an immediate dispatch.
+    max_wait:
+        Longest time, in seconds, a request waits for companions.
+    """
+
+    def __init__(
+        self, wrapper, max_batch_size: int = 16, max_wait: float = 0.005
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer.")
+        if max_wait < 0:
+            raise ValueError("max_wait cannot be negative.")
+
+        self._wrapped = wrapper
+        self._agent_card: AgentCard = wrapper._agent_card
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self.batches_dispatched = 0
+        self.requests_received = 0
+        self.requests_coalesced = 0
+
+        self._pending: List[Tuple[str, str, str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Dispatches in flight; referenced so they are not garbage-collected.
+        self._dispatches: Set[asyncio.Task] = set()
+
+    @property
+    def memory(self) -> Optional[ConversationStore]:
+        """The conversation memory of the wrapped agent, if any."""
+        return getattr(self._wrapped, "memory", None)
+
+    async def invoke(self, query: str, context_id: str) -> ResponsePayload:
+        """Queue *query* for the next batch and return its response."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(
+            (self._dedupe_key(query, context_id), query, context_id, future)
+        )
+        self.requests_received += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def stream(
+        self, query: str, context_id: str
+    ) -> AsyncGenerator[ResponsePayload, None]:
+        """Yield the batched response for *query* as a single final update."""
+        yield await self.invoke(query, context_id)
+
+    def _dedupe_key(self, query: str, context_id: str) -> str:
+        # With conversation memory the answer depends on the context's history,
+        # so only requests from the same conversation may share a response.
+        if self.memory is not None:
+            return f"{context_id}\x00{normalize_query(query)}"
+        return normalize_query(query)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        groups: Dict[str, List[Tuple[str, str, asyncio.Future]]] = {}
+        for key, query, context_id, future in batch:
+            if future.done():  # caller already gave up
+                continue
+            groups.setdefault(key, []).append((query, context_id, future))
+        if not groups:
+            return
+
+        self.batches_dispatched += 1
+        self.requests_coalesced += len(batch) - len(groups)
+        log.debug(
+            "[%s] dispatching batch: %d requests, %d distinct",
+            self._agent_card.name,
+            len(batch),
+            len(groups),
+        )
+        task = asyncio.ensure_future(self._dispatch(list(groups.values())))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(
+        self, groups: List[List[Tuple[str, str, asyncio.Future]]]
+    ) -> None:
+        try:
+            invoke_batch = getattr(self._wrapped, "invoke_batch", None)
+            if invoke_batch is None:
+                await asyncio.gather(*(self._run_group(group) for group in groups))
+                return
+            items: List[BatchItem] = [(g[0][0], g[0][1]) for g in groups]
+            results = await invoke_batch(items)
+            if len(results) != len(groups):
+                # Results cannot be matched to queries, so none is trusted.
+                raise RuntimeError(
+                    f"invoke_batch returned {len(results)} results "
+                    f"for {len(groups)} queries"
+                )
+            for group, result in zip(groups, results):
+                self._resolve(group, result=result)
+        except Exception as exc:  # noqa: BLE001
+            # Whatever went wrong, no caller is left waiting forever.
+            for group in groups:
+                self._resolve(group, exc=exc)
+
+    async def _run_group(self, group: List[Tuple[str, str, asyncio.Future]]) -> None:
+        query, context_id, _ = group[0]
+        run = asyncio.ensure_future(self._wrapped.invoke(query, context_id))
+        waiters = [future for _, _, future in group]
+
+        # Abandon the model call once every caller waiting on it has cancelled.
+        def _on_waiter_done(_: asyncio.Future) -> None:
+            if all(w.cancelled() for w in waiters) and not run.done():
+                run.cancel()
+
+        for waiter in waiters:
+            waiter.add_done_callback(_on_waiter_done)
+
+        try:
+            self._resolve(group, result=await run)
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:  # noqa: BLE001
+            self._resolve(group, exc=exc)
+
+    @staticmethod
+    def _resolve(
+        group: List[Tuple[str, str, asyncio.Future]],
+        result: Optional[ResponsePayload] = None,
+        exc: Optional[BaseException] = None,
+    ) -> None:
+        for _, _, future in group:
+            if future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(dict(result))
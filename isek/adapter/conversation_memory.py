@@ -0,0 +1,372 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Deque, List, Optional, Tuple
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+
+# Rough bytes-per-token ratio used to turn serialized history size into a
+# token estimate without depending on a model-specific tokenizer.
+BYTES_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: List[ModelMessage]) -> int:
+    """Estimate the prompt tokens *messages* will cost when replayed."""
+    return len(ModelMessagesTypeAdapter.dump_json(messages)) // BYTES_PER_TOKEN + 1
+
+
+def turn_messages(query: str, result: Any) -> List[ModelMessage]:
+    """Return the messages to record for one agent run on *query*.
+
+    A pydantic-ai run result reports its own messages (tool calls included);
+    for an agent returning the reply itself the turn is the query and the
+    reply's text.
+    """
+    new_messages = getattr(result, "new_messages", None)
+    if callable(new_messages):
+        return new_messages()
+    return [
+        ModelRequest(parts=[UserPromptPart(content=query)]),
+        ModelResponse(parts=[TextPart(content=str(result))]),
+    ]
+
+
+def _system_parts(messages: List[ModelMessage]) -> List[SystemPromptPart]:
+    if messages and isinstance(messages[0], ModelRequest):
+        return [p for p in messages[0].parts if isinstance(p, SystemPromptPart)]
+    return []
+
+
+def _with_system_parts(
+    messages: List[ModelMessage], system_parts: List[SystemPromptPart]
+) -> List[ModelMessage]:
+    """Re-attach the system prompt once the turn that carried it was trimmed.
+
+    pydantic-ai only injects the system prompt when the history is empty, so a
+    trimmed history must carry it itself.
+    """
+    if not system_parts or not messages or _system_parts(messages):
+        return messages
+    first = messages[0]
+    if not isinstance(first, ModelRequest):
+        return messages
+    return [replace(first, parts=[*system_parts, *first.parts]), *messages[1:]]
+
+
+class ConversationStore(ABC):
+    """Bounded per-``context_id`` message history for agent wrappers.
+
+    History is stored as *turns*, the messages produced by one agent run.
+    Whole turns are dropped oldest-first once a conversation exceeds
+    *max_tokens*, so tool calls and their results are never split apart.
+    Conversations beyond *max_contexts* are evicted least-recently-used first,
+    and conversations idle for longer than *idle_ttl* seconds are discarded.
+
+    Parameters
+    ----------
+    max_tokens:
+        Estimated token budget of the history replayed for one conversation.
+    max_contexts:
+        Maximum number of conversations kept.
+    idle_ttl:
+        Seconds after which an untouched conversation is dropped; ``None``
+        keeps conversations until they are evicted by *max_contexts*.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 4000,
+        max_contexts: int = 1000,
+        idle_ttl: Optional[float] = 3600.0,
+    ) -> None:
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be a positive integer.")
+        if max_contexts <= 0:
+            raise ValueError("max_contexts must be a positive integer.")
+        self.max_tokens = max_tokens
+        self.max_contexts = max_contexts
+        self.idle_ttl = idle_ttl
+
+    @abstractmethod
+    def load(self, context_id: str) -> List[ModelMessage]:
+        """Return the stored history for *context_id* (empty if unknown)."""
+
+    @abstractmethod
+    def append(self, context_id: str, messages: List[ModelMessage]) -> None:
+        """Record *messages* as the newest turn of *context_id*."""
+
+    @abstractmethod
+    def clear(self, context_id: str) -> None:
+        """Forget the conversation *context_id*."""
+
+    @abstractmethod
+    def has_history(self, context_id: str) -> bool:
+        """Return whether *context_id* has any stored turns."""
+
+    async def aload(self, context_id: str) -> List[ModelMessage]:
+        """:meth:`load` for callers on the event loop.
+
+        Stores doing blocking I/O override it to run off the loop.
+        """
+        return self.load(context_id)
+
+    async def aappend(self, context_id: str, messages: List[ModelMessage]) -> None:
+        """:meth:`append` for callers on the event loop, like :meth:`aload`."""
+        self.append(context_id, messages)
+
+    def _expired(self, last_used: float, now: float) -> bool:
+        return self.idle_ttl is not None and now - last_used > self.idle_ttl
+
+
+@dataclass
+class _Conversation:
+    turns: Deque[Tuple[List[ModelMessage], int]] = field(default_factory=deque)
+    tokens: int = 0
+    system_parts: List[SystemPromptPart] = field(default_factory=list)
+    last_used: float = 0.0
+
+
+class InMemoryConversationStore(ConversationStore):
+    """Process-local :class:`ConversationStore` backed by an ``OrderedDict``."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, context_id: str) -> List[ModelMessage]:
+        now = time.time()
+        with self._lock:
+            conv = self._conversations.get(context_id)
+            if conv is None:
+                return []
+            if self._expired(conv.last_used, now):
+                del self._conversations[context_id]
+                return []
+            conv.last_used = now
+            self._conversations.move_to_end(context_id)
+            messages = [m for turn, _ in conv.turns for m in turn]
+        return _with_system_parts(messages, conv.system_parts)
+
+    def append(self, context_id: str, messages: List[ModelMessage]) -> None:
+        if not messages:
+            return
+        tokens = estimate_tokens(messages)
+        now = time.time()
+        with self._lock:
+            conv = self._conversations.get(context_id)
+            if conv is None or self._expired(conv.last_used, now):
+                conv = _Conversation(system_parts=_system_parts(messages))
+                self._conversations[context_id] = conv
+            conv.turns.append((list(messages), tokens))
+            conv.tokens += tokens
+            conv.last_used = now
+            # Always keep the newest turn, even if it alone exceeds the budget.
+            while conv.tokens > self.max_tokens and len(conv.turns) > 1:
+                _, dropped = conv.turns.popleft()
+                conv.tokens -= dropped
+            self._conversations.move_to_end(context_id)
+            while len(self._conversations) > self.max_contexts:
+                self._conversations.popitem(last=False)
+
+    def clear(self, context_id: str) -> None:
+        with self._lock:
+            self._conversations.pop(context_id, None)
+
+    def has_history(self, context_id: str) -> bool:
+        conv = self._conversations.get(context_id)
+        return conv is not None and not self._expired(conv.last_used, time.time())
+
+
+class SQLiteConversationStore(ConversationStore):
+    """:class:`ConversationStore` persisted to a SQLite file.
+
+    Useful when conversations must survive restarts or be shared by several
+    processes on the same host.  :meth:`aload` and :meth:`aappend` run their
+    queries and commits in a worker thread, so a turn never blocks the event
+    loop on the disk.
+
+    Parameters
+    ----------
+    path:
+        SQLite database file; ``":memory:"`` gives a private in-memory database.
+    """
+
+    def __init__(self, path: str, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+                context_id TEXT PRIMARY KEY,
+                last_used REAL NOT NULL,
+                tokens INTEGER NOT NULL,
+                system_prompt BLOB
+            );
+            CREATE TABLE IF NOT EXISTS conversation_turns (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                context_id TEXT NOT NULL,
+                tokens INTEGER NOT NULL,
+                messages BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS conversation_turns_ctx
+                ON conversation_turns (context_id, seq);
+            CREATE INDEX IF NOT EXISTS conversations_last_used
+                ON conversations (last_used);
+            """
+        )
+        self._db.commit()
+
+    def load(self, context_id: str) -> List[ModelMessage]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_used, system_prompt FROM conversations WHERE context_id = ?",
+                (context_id,),
+            ).fetchone()
+            if row is None:
+                return []
+            if self._expired(row[0], now):
+                self._delete(context_id)
+                self._db.commit()
+                return []
+            turns = self._db.execute(
+                "SELECT messages FROM conversation_turns WHERE context_id = ? ORDER BY seq",
+                (context_id,),
+            ).fetchall()
+            self._db.execute(
+                "UPDATE conversations SET last_used = ? WHERE context_id = ?",
+                (now, context_id),
+            )
+            self._db.commit()
+
+        messages: List[ModelMessage] = []
+        for (blob,) in turns:
+            messages.extend(ModelMessagesTypeAdapter.validate_json(blob))
+        system_parts = (
+            _system_parts(ModelMessagesTypeAdapter.validate_json(row[1]))
+            if row[1]
+            else []
+        )
+        return _with_system_parts(messages, system_parts)
+
+    def append(self, context_id: str, messages: List[ModelMessage]) -> None:
+        if not messages:
+            return
+        blob = ModelMessagesTypeAdapter.dump_json(messages)
+        tokens = len(blob) // BYTES_PER_TOKEN + 1
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_used, tokens FROM conversations WHERE context_id = ?",
+                (context_id,),
+            ).fetchone()
+            if row is not None and self._expired(row[0], now):
+                self._delete(context_id)
+                row = None
+            if row is None:
+                system_parts = _system_parts(messages)
+                system_blob = (
+                    ModelMessagesTypeAdapter.dump_json(
+                        [ModelRequest(parts=system_parts)]
+                    )
+                    if system_parts
+                    else None
+                )
+                self._db.execute(
+                    "INSERT INTO conversations VALUES (?, ?, 0, ?)",
+                    (context_id, now, system_blob),
+                )
+                total = tokens
+            else:
+                total = row[1] + tokens
+
+            self._db.execute(
+                "INSERT INTO conversation_turns (context_id, tokens, messages) VALUES (?, ?, ?)",
+                (context_id, tokens, blob),
+            )
+            if total > self.max_tokens:
+                total = self._trim(context_id, total)
+            self._db.execute(
+                "UPDATE conversations SET last_used = ?, tokens = ? WHERE context_id = ?",
+                (now, total, context_id),
+            )
+            self._evict()
+            self._db.commit()
+
+    async def aload(self, context_id: str) -> List[ModelMessage]:
+        return await asyncio.to_thread(self.load, context_id)
+
+    async def aappend(self, context_id: str, messages: List[ModelMessage]) -> None:
+        await asyncio.to_thread(self.append, context_id, messages)
+
+    def clear(self, context_id: str) -> None:
+        with self._lock:
+            self._delete(context_id)
+            self._db.commit()
+
+    def has_history(self, context_id: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT last_used FROM conversations WHERE context_id = ?",
+                (context_id,),
+            ).fetchone()
+        return row is not None and not self._expired(row[0], time.time())
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._db.close()
+
+    # Callers must hold ``self._lock``.
+    def _trim(self, context_id: str, total: int) -> int:
+        rows = self._db.execute(
+            "SELECT seq, tokens FROM conversation_turns WHERE context_id = ? ORDER BY seq",
+            (context_id,),
+        ).fetchall()
+        drop = []
+        # Always keep the newest turn, even if it alone exceeds the budget.
+        for seq, tokens in rows[:-1]:
+            if total <= self.max_tokens:
+                break
+            drop.append((seq,))
+            total -= tokens
+        self._db.executemany("DELETE FROM conversation_turns WHERE seq = ?", drop)
+        return total
+
+    def _evict(self) -> None:
+        if self.idle_ttl is not None:
+            cutoff = time.time() - self.idle_ttl
+            for (context_id,) in self._db.execute(
+                "SELECT context_id FROM conversations WHERE last_used < ?", (cutoff,)
+            ).fetchall():
+                self._delete(context_id)
+
+        (count,) = self._db.execute("SELECT COUNT(*) FROM conversations").fetchone()
+        if count > self.max_contexts:
+            for (context_id,) in self._db.execute(
+                "SELECT context_id FROM conversations ORDER BY last_used LIMIT ?",
+                (count - self.max_contexts,),
+            ).fetchall():
+                self._delete(context_id)
+
+    def _delete(self, context_id: str) -> None:
+        self._db.execute(
+            "DELETE FROM conversation_turns WHERE context_id = ?", (context_id,)
+        )
+        self._db.execute(
+            "DELETE FROM conversations WHERE context_id = ?", (context_id,)
+        )
@@ -0,0 +1,272 @@
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncGenerator, Callable, Dict, Optional, Tuple
+
+from a2a.types import AgentCard
+
+from isek.adapter.base import ResponsePayload
+from isek.adapter.conversation_memory import ConversationStore
+from isek.utils.log import log
+from isek.utils.sqlite_writer import SQLiteWriter
+from isek.utils.tools import dict_md5
+
+
+def normalize_query(query: str) -> str:
+    """Collapse runs of whitespace and strip the ends of *query*."""
+    return " ".join(query.split())
+
+
+class ResponseCache:
+    """TTL + LRU cache of final agent responses.
+
+    Entries live in an in-process ``OrderedDict`` so a hit costs a dictionary
+    lookup.  When *persist_path* is given, entries are written through to a
+    SQLite file and lazily re-loaded on a memory miss, which keeps the cache
+    warm across restarts.  Writes are queued to a background thread, so the
+    event loop never waits for a commit (:meth:`flush` waits for them), and
+    lookups read through their own connection rather than behind a commit.
+
+    Parameters
+    ----------
+    max_entries:
+        Maximum number of entries kept in memory; the least recently used
+        entry is evicted first.
+    ttl:
+        Seconds an entry stays valid.  ``None`` disables expiry.
+    persist_path:
+        Optional SQLite file used as a second-level, on-disk store.
+    normalize:
+        Callable applied to the query before hashing it into a key.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        persist_path: Optional[str] = None,
+        normalize: Callable[[str], str] = normalize_query,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive or None.")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.normalize = normalize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[str, Tuple[float, ResponsePayload]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[SQLiteWriter] = (
+            SQLiteWriter(
+                persist_path,
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL, payload TEXT)",
+                name="response-cache-writer",
+            )
+            if persist_path
+            else None
+        )
+
+    def make_key(self, agent_card: AgentCard, query: str) -> str:
+        """Build the cache key for *query* sent to the agent described by *agent_card*."""
+        return dict_md5(
+            {
+                "agent": agent_card.name,
+                "url": agent_card.url,
+                "version": agent_card.version,
+                "query": self.normalize(query),
+            }
+        )
+
+    def get(self, key: str) -> Optional[ResponsePayload]:
+        """Return a copy of the cached payload for *key*, or ``None``."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(payload)
+                del self._entries[key]
+
+            entry = self._load(key, now)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._store(key, *entry)
+            self.hits += 1
+            return dict(entry[1])
+
+    def set(self, key: str, payload: ResponsePayload) -> None:
+        """Cache *payload* under *key*."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else float("inf")
+        payload = dict(payload)
+        with self._lock:
+            self._store(key, expires_at, payload)
+        if self._db is not None:
+            try:
+                row = (key, expires_at, json.dumps(payload, ensure_ascii=False))
+            except TypeError as e:
+                log.debug(f"Response cache persist skipped for {key}: {e}")
+                return
+            self._write("INSERT OR REPLACE INTO response_cache VALUES (?, ?, ?)", row)
+
+    def clear(self) -> None:
+        """Drop every entry, including the on-disk ones."""
+        with self._lock:
+            self._entries.clear()
+        self._write("DELETE FROM response_cache", ())
+
+    def flush(self) -> None:
+        """Block until every queued write has reached the on-disk store."""
+        if self._db is not None:
+            self._db.flush()
+
+    def close(self) -> None:
+        """Write out pending entries and close the on-disk store, if any."""
+        if self._db is not None:
+            self._db.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Callers must hold ``self._lock``.
+    def _store(self, key: str, expires_at: float, payload: ResponsePayload) -> None:
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str, now: float) -> Optional[Tuple[float, ResponsePayload]]:
+        if self._db is None:
+            return None
+        rows = self._db.read(
+            "SELECT expires_at, payload FROM response_cache WHERE key = ?", (key,)
+        )
+        if not rows:
+            return None
+        expires_at, payload = rows[0]
+        if expires_at < now:
+            self._write("DELETE FROM response_cache WHERE key = ?", (key,))
+            return None
+        return expires_at, json.loads(payload)
+
+    def _write(self, sql: str, params: tuple) -> None:
+        if self._db is not None:
+            self._db.write(sql, params)
+
+
+class CachedAgentWrapper:
+    """Opt-in memoization in front of an agent wrapper.
+
+    Exposes the same ``invoke``/``stream`` interface as
+    :class:`~isek.adapter.pydantic_ai_adapter.PydanticAIAgentWrapper`, so it can
+    be handed to an executor unchanged.  Only completed responses are cached;
+    errors and input requests always reach the model again.  Identical queries
+    that arrive while the first one is still running wait for its result
+    instead of issuing their own model call.
+
+    When the wrapped agent keeps conversation memory, requests carrying a
+    ``context_id`` bypass the cache: every turn must reach the agent to be
+    recorded, and later turns depend on the history anyway.
+
+    Parameters
+    ----------
+    wrapper:
+        The agent wrapper to put the cache in front of.
+    cache:
+        The cache to use; a default in-memory :class:`ResponseCache` when omitted.
+    """
+
+    def __init__(self, wrapper, cache: Optional[ResponseCache] = None) -> None:
+        self._wrapped = wrapper
+        self._agent_card: AgentCard = wrapper._agent_card
+        self.cache = cache if cache is not None else ResponseCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def memory(self) -> Optional[ConversationStore]:
+        """The conversation memory of the wrapped agent, if any."""
+        return getattr(self._wrapped, "memory", None)
+
+    async def invoke(self, query: str, context_id: str) -> ResponsePayload:
+        """Return the cached response for *query* or run the wrapped agent."""
+        if self._uses_memory(context_id):
+            return await self._wrapped.invoke(query, context_id)
+        key = self.cache.make_key(self._agent_card, query)
+        cached = await self._lookup(key)
+        if cached is not None:
+            return cached
+
+        future = self._begin(key)
+        result: Optional[ResponsePayload] = None
+        try:
+            result = await self._wrapped.invoke(query, context_id)
+            return result
+        finally:
+            self._finish(key, future, result)
+
+    async def stream(
+        self, query: str, context_id: str
+    ) -> AsyncGenerator[ResponsePayload, None]:
+        """Stream the wrapped agent's updates, or only the final one on a cache hit."""
+        if self._uses_memory(context_id):
+            async for item in self._wrapped.stream(query, context_id):
+                yield item
+            return
+        key = self.cache.make_key(self._agent_card, query)
+        cached = await self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        future = self._begin(key)
+        result: Optional[ResponsePayload] = None
+        try:
+            async for item in self._wrapped.stream(query, context_id):
+                result = item
+                yield item
+        finally:
+            self._finish(key, future, result)
+
+    def _uses_memory(self, context_id: str) -> bool:
+        return bool(context_id) and self.memory is not None
+
+    async def _lookup(self, key: str) -> Optional[ResponsePayload]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            log.debug("[%s] response cache hit", self._agent_card.name)
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            return None
+        # Single-flight: piggyback on the identical request already running.
+        # A ``None`` result means the leader failed, so run the query ourselves.
+        shared = await asyncio.shield(pending)
+        return dict(shared) if shared is not None else None
+
+    def _begin(self, key: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def _finish(
+        self, key: str, future: asyncio.Future, result: Optional[ResponsePayload]
+    ) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if result is None or not result.get("is_task_complete"):
+            result = None
+        else:
+            self.cache.set(key, result)
+        if not future.done():
+            future.set_result(result)
@@ -0,0 +1,240 @@
+import asyncio
+import math
+import random
+from typing import AsyncGenerator, Optional, Tuple, Union
+
+from a2a.types import AgentCard
+
+from isek.adapter.base import (
+    PROCESSING_MESSAGE,
+    AgentAdapter,
+    AgentAdapterExecutor,
+    ResponsePayload,
+)
+from isek.utils.common import log_agent_request, log_agent_response, log_error
+
+__all__ = [
+    "LatencyDistribution",
+    "StubAgentError",
+    "StubAgentWrapper",
+    "StubAgentExecutor",
+    "ResponsePayload",
+]
+
+# Words the stub draws its replies from; one word stands for one token.
+_WORDS = (
+    "agent network relay peer task message stream token model reply "
+    "context query skill card node bridge latency answer result status"
+).split()
+
+
+class StubAgentError(RuntimeError):
+    """Simulated model failure raised by :class:`StubAgentWrapper`."""
+
+
+class LatencyDistribution:
+    """Random delay, in seconds, drawn from a named distribution.
+
+    Parameters
+    ----------
+    kind:
+        ``"constant"``, ``"uniform"``, ``"normal"``, ``"lognormal"`` or
+        ``"exponential"``.
+    mean:
+        Mean delay.
+    spread:
+        Standard deviation for ``"normal"`` and ``"lognormal"``, half-width of
+        the range for ``"uniform"``; unused otherwise.
+    maximum:
+        Optional upper bound applied to every sample.  Samples are never
+        negative.
+    """
+
+    KINDS = ("constant", "uniform", "normal", "lognormal", "exponential")
+
+    def __init__(
+        self,
+        kind: str = "constant",
+        mean: float = 0.0,
+        spread: float = 0.0,
+        maximum: Optional[float] = None,
+    ) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        if mean < 0 or spread < 0:
+            raise ValueError("Latency mean and spread must not be negative.")
+        if kind == "lognormal" and mean == 0 and spread > 0:
+            raise ValueError("A lognormal latency needs a positive mean.")
+        self.kind = kind
+        self.mean = mean
+        self.spread = spread
+        self.maximum = maximum
+
+    @classmethod
+    def parse(cls, spec: Union[str, float]) -> "LatencyDistribution":
+        """Build a distribution from ``"0.2"`` or ``"<kind>:<mean>[,<spread>]"``."""
+        if isinstance(spec, (int, float)):
+            return cls("constant", float(spec))
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("constant", float(kind))
+        values = [float(v) for v in params.split(",")]
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "constant" or self.mean == 0:
+            value = self.mean
+        elif self.kind == "uniform":
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.kind == "normal":
+            value = rng.gauss(self.mean, self.spread)
+        elif self.kind == "lognormal":
+            # Parameters of the underlying normal giving this mean and stddev.
+            sigma2 = math.log(1 + (self.spread / self.mean) ** 2)
+            value = rng.lognormvariate(math.log(self.mean) - sigma2 / 2, sigma2**0.5)
+        else:
+            value = rng.expovariate(1 / self.mean)
+        if self.maximum is not None:
+            value = min(value, self.maximum)
+        return max(0.0, value)
+
+    def __repr__(self) -> str:
+        return f"LatencyDistribution({self.kind!r}, mean={self.mean}, spread={self.spread})"
+
+
+class StubAgentWrapper(AgentAdapter):
+    """Deterministic stand-in for an LLM-backed wrapper, for load testing.
+
+    It honours the same ``run``/``invoke``/``stream`` contract as
+    :class:`~isek.adapter.pydantic_ai_adapter.PydanticAIAgentWrapper` but
+    answers from a seeded random generator instead of a model, so the
+    ``Node``/task-store/bridge pipeline can be benchmarked offline and at no
+    cost.  Each reply waits for a time-to-first-token drawn from *latency*,
+    then produces *response_tokens* tokens at *tokens_per_second*; ``stream``
+    yields them in chunks of *chunk_tokens* as they are "generated".
+
+    Parameters
+    ----------
+    agent_card:
+        The card describing the simulated agent.
+    latency:
+        Time to first token: a :class:`LatencyDistribution`, a spec accepted by
+        :meth:`LatencyDistribution.parse`, or a constant in seconds.
+    tokens_per_second:
+        Generation rate.  ``None`` produces the whole reply instantly.
+    response_tokens:
+        Reply length in tokens (roughly words), or a ``(min, max)`` range to
+        draw it from.
+    chunk_tokens:
+        Tokens per intermediate update yielded by :meth:`stream`.
+    error_rate:
+        Share of requests failing with :class:`StubAgentError` after the
+        first-token delay; like a model error it surfaces as an
+        input-required response.
+    seed:
+        Seed of the generator, so runs with the same seed draw the same
+        delays, lengths and failures in the same order.
+    """
+
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        latency: Union[LatencyDistribution, str, float] = 0.0,
+        tokens_per_second: Optional[float] = None,
+        response_tokens: Union[int, Tuple[int, int]] = 50,
+        chunk_tokens: int = 8,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(agent_card)
+        if tokens_per_second is not None and tokens_per_second <= 0:
+            raise ValueError("tokens_per_second must be positive.")
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1.")
+        if chunk_tokens < 1:
+            raise ValueError("chunk_tokens must be at least 1.")
+        self.latency = (
+            latency
+            if isinstance(latency, LatencyDistribution)
+            else LatencyDistribution.parse(latency)
+        )
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.chunk_tokens = chunk_tokens
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    def _plan(self) -> Tuple[float, int, bool]:
+        """Draw the first-token delay, reply length and failure of one request."""
+        if isinstance(self.response_tokens, int):
+            tokens = self.response_tokens
+        else:
+            tokens = self._rng.randint(*self.response_tokens)
+        fails = self._rng.random() < self.error_rate
+        self.calls += 1
+        return self.latency.sample(self._rng), tokens, fails
+
+    def _token_delay(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _text(self, query: str, start: int, count: int) -> str:
+        words = (_WORDS[(start + i) % len(_WORDS)] for i in range(count))
+        prefix = f"echo: {query} " if start == 0 else ""
+        return prefix + " ".join(words)
+
+    async def run(self, query: str, context_id: str) -> str:
+        first_token, tokens, fails = self._plan()
+        await asyncio.sleep(first_token)
+        if fails:
+            self.errors += 1
+            raise StubAgentError("simulated model error")
+        await asyncio.sleep(self._token_delay(tokens))
+        return self._text(query, 0, tokens)
+
+    async def stream(
+        self, query: str, context_id: str
+    ) -> AsyncGenerator[ResponsePayload, None]:
+        """Yield the reply chunk by chunk at the configured token rate."""
+        yield {
+            "is_task_complete": False,
+            "require_user_input": False,
+            "content": PROCESSING_MESSAGE,
+        }
+        name = self._agent_card.name
+        log_agent_request(name, query, context_id)
+        first_token, tokens, fails = self._plan()
+        await asyncio.sleep(first_token)
+        if fails:
+            self.errors += 1
+            log_error("Error during stream: simulated model error")
+            yield {
+                "is_task_complete": False,
+                "require_user_input": True,
+                "content": "Error: simulated model error",
+            }
+            return
+        chunks = []
+        for start in range(0, tokens, self.chunk_tokens):
+            count = min(self.chunk_tokens, tokens - start)
+            await asyncio.sleep(self._token_delay(count))
+            chunks.append(self._text(query, start, count))
+            yield {
+                "is_task_complete": False,
+                "require_user_input": False,
+                "content": chunks[-1],
+            }
+        log_agent_response(name, "Task completed successfully", context_id)
+        yield {
+            "is_task_complete": True,
+            "require_user_input": False,
+            "content": " ".join(chunks),
+        }
+
+
+class StubAgentExecutor(AgentAdapterExecutor):
+    """Executor for :class:`StubAgentWrapper`."""
+
+    def __init__(self, stub_agent: StubAgentWrapper):
+        super().__init__(stub_agent)
@@ -0,0 +1,558 @@
+"""End-to-end benchmark of local ISEK agents.
+
+Starts ``--agents`` agent servers, each in its own process, built with
+:meth:`Node.create_server` around a :class:`StubAgentExecutor` standing in
+for the LLM (``--latency``, ``--tokens-per-second``, ``--response-tokens``,
+``--error-rate``),
+and sends them ``--requests`` messages from ``--concurrency`` concurrent
+callers over:
+
+* ``http``: :meth:`Node.send_message` straight to each agent;
+* ``p2p`` (with ``--p2p``): :meth:`A2AProtocolV2.send_message` through one
+  p2p bridge per agent and a local relay. Needs Node.js and ``isek setup``.
+
+With ``--inproc`` the agents are also served from the calling process, each
+in a daemon thread as ``Node.build_server(daemon=True)`` does, and messaged
+over loopback HTTP (``loopback``) and through in-process direct dispatch
+(``inproc``); the client's CPU then includes the agents'.
+
+Reports throughput, p50/p95/p99 latency and the CPU and RSS of every agent
+process (and of its bridge) during the run, plus those of the calling process
+so a client-bound run is recognisable, and writes everything as JSON to
+``--output``. ``--baseline`` compares the run against an earlier result file
+and exits non-zero when throughput drops or p99 latency grows by more than
+``--tolerance``. CPU and RSS are read from ``/proc`` and are only reported on
+Linux.
+
+Usage::
+
+    python -m isek.bench.agents --agents 2 --requests 2000 --concurrency 16
+    python -m isek.bench.agents --latency lognormal:0.5,0.2 --tokens-per-second 50
+    python -m isek.bench.agents --inproc --requests 2000
+    isek bench --p2p --output bench.json --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+from isek.adapter.stub_adapter import StubAgentExecutor, StubAgentWrapper
+from isek.node.node_v3_a2a import Node
+from isek.utils.log import LoggerManager
+
+P2P_DIR = Path(__file__).parent.parent / "protocol" / "p2p"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def make_card(name: str, port: int) -> AgentCard:
+    return AgentCard(
+        name=name,
+        url=f"http://127.0.0.1:{port}",
+        description="Benchmark stand-in agent",
+        version="1.0",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text/plain"],
+        defaultOutputModes=["text/plain"],
+        skills=[
+            AgentSkill(
+                id="echo", name="Echo", description="Echo the query", tags=["echo"]
+            )
+        ],
+    )
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def process_usage(pid: Optional[int]) -> Optional[dict]:
+    """CPU seconds and current/peak RSS of *pid*, or ``None`` without ``/proc``."""
+    if pid is None:
+        return None
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return None
+    fields = stat[stat.rindex(")") + 2 :].split()
+    memory = {
+        key: int(value.split()[0]) * 1024
+        for key, value in (line.split(":", 1) for line in status.splitlines())
+        if key in ("VmRSS", "VmHWM")
+    }
+    return {
+        "cpu_s": (int(fields[11]) + int(fields[12])) / CLOCK_TICKS,
+        "rss_bytes": memory.get("VmRSS"),
+        "peak_rss_bytes": memory.get("VmHWM"),
+    }
+
+
+def usage_delta(before: Optional[dict], after: Optional[dict], elapsed: float):
+    if not before or not after:
+        return None
+    cpu_s = after["cpu_s"] - before["cpu_s"]
+    return {
+        "cpu_s": round(cpu_s, 3),
+        "cpu_percent": round(cpu_s / elapsed * 100, 1),
+        "rss_bytes": after["rss_bytes"],
+        "peak_rss_bytes": after["peak_rss_bytes"],
+    }
+
+
+# ------------------------------- agent process -------------------------------
+
+
+async def run_agent(args) -> None:
+    card = make_card(args.name, args.port)
+    stub = StubAgentWrapper(
+        card,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        error_rate=args.error_rate,
+        seed=args.port,
+    )
+    app = Node.create_server(StubAgentExecutor(stub), card)
+    ready = {"pid": os.getpid()}
+    if args.relay:
+        from isek.protocol.a2a_protocol_v2 import A2AProtocolV2
+
+        p2p = A2AProtocolV2(
+            port=args.port,
+            p2p_enabled=True,
+            p2p_server_port=args.bridge_port,
+            relays=[args.relay],
+            p2p_data_dir=args.data_dir,
+            supervise=False,
+        )
+        await asyncio.to_thread(p2p.start_p2p_server, True)
+        ready.update(peer_id=p2p.peer_id, bridge_pid=p2p._p2p_process.pid)
+    Path(args.ready_file).write_text(json.dumps(ready))
+    await Node.run_server(app, host="127.0.0.1", port=args.port, name=args.name)
+
+
+# --------------------------------- harness -----------------------------------
+
+
+class Agent:
+    """An agent process started by the harness."""
+
+    def __init__(self, name: str, port: int, workdir: str) -> None:
+        self.name = name
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self.ready_file = os.path.join(workdir, f"{name}.ready")
+        self.process: Optional[subprocess.Popen] = None
+        self.info: dict = {}
+
+    def start(self, args, workdir: str, relay: Optional[str] = None) -> None:
+        command = [
+            sys.executable,
+            "-m",
+            "isek.bench.agents",
+            "--serve-agent",
+            f"--name={self.name}",
+            f"--port={self.port}",
+            f"--latency={args.latency}",
+            f"--response-tokens={args.response_tokens}",
+            f"--error-rate={args.error_rate}",
+            f"--ready-file={self.ready_file}",
+        ]
+        if args.tokens_per_second:
+            command.append(f"--tokens-per-second={args.tokens_per_second}")
+        if relay:
+            command += [
+                f"--relay={relay}",
+                f"--bridge-port={self.port + 100}",
+                f"--data-dir={os.path.join(workdir, 'p2p')}",
+            ]
+        env = dict(os.environ, ISEK_WALLET_DATA_FILE=os.path.join(workdir, "w.json"))
+        self.process = subprocess.Popen(
+            command,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def wait_ready(self, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with {self.process.returncode}")
+            if os.path.exists(self.ready_file):
+                try:
+                    if httpx.get(f"{self.url}/.well-known/agent.json").is_success:
+                        self.info = json.loads(Path(self.ready_file).read_text())
+                        return
+                except httpx.HTTPError:
+                    pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{self.name} not ready after {timeout:.0f}s")
+            time.sleep(0.1)
+
+    def usage(self) -> dict:
+        return {
+            "agent": process_usage(self.info.get("pid")),
+            "bridge": process_usage(self.info.get("bridge_pid")),
+        }
+
+    def stop(self) -> None:
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def start_relay(port: int) -> tuple:
+    """Start relay.js on *port* and return ``(process, relay multiaddr)``."""
+    process = subprocess.Popen(
+        [
+            "node",
+            str(P2P_DIR / "relay.js"),
+            f"--port={port}",
+            "--data_limit=0",
+            "--duration_limit=0",
+            "--max_reservations=1024",
+        ],
+        cwd=P2P_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    for line in process.stdout:
+        if "peerId=" in line:
+            peer_id = line.strip().split("peerId=", 1)[1]
+            # Keep draining so the relay never blocks on a full pipe.
+            asyncio.get_running_loop().run_in_executor(None, process.stdout.read)
+            return process, f"/ip4/127.0.0.1/tcp/{port}/ws/p2p/{peer_id}"
+    raise RuntimeError(f"relay.js exited with {process.wait()}")
+
+
+async def drive(send, targets, requests: int, concurrency: int, warmup: int) -> dict:
+    """Send *requests* messages round-robin over *targets*; return the stats."""
+    for i in range(warmup):
+        try:
+            await send(targets[i % len(targets)], f"warmup {i}")
+        except Exception:
+            pass  # failures are only counted in the measured phase
+
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                await send(targets[i % len(targets)], f"ping {i}")
+            except Exception:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    if not latencies:
+        raise RuntimeError("every request failed")
+    return {
+        "requests": requests,
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(statistics.fmean(latencies), 2),
+            "max": round(max(latencies), 2),
+        },
+    }
+
+
+async def measure(name, agents, send, targets, args) -> dict:
+    before = {agent.name: agent.usage() for agent in agents}
+    client_before = process_usage(os.getpid())
+    started = time.perf_counter()
+    result = await drive(send, targets, args.requests, args.concurrency, args.warmup)
+    elapsed = time.perf_counter() - started
+    result["client"] = usage_delta(client_before, process_usage(os.getpid()), elapsed)
+    result["agents"] = {}
+    for agent in agents:
+        after = agent.usage()
+        result["agents"][agent.name] = {
+            role: usage_delta(before[agent.name][role], after[role], elapsed)
+            for role in ("agent", "bridge")
+            if after[role] is not None
+        }
+    latency = result["latency_ms"]
+    print(
+        f"{name:<5} {result['throughput_rps']:8.1f} req/s  "
+        f"p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms "
+        f"p99={latency['p99']:.2f}ms errors={result['errors']}"
+    )
+    usages = [("client", "", result["client"])] + [
+        (agent_name, role, stats)
+        for agent_name, usage in result["agents"].items()
+        for role, stats in usage.items()
+    ]
+    for process_name, role, stats in usages:
+        if stats:
+            print(
+                f"      {process_name} {role:<6} cpu={stats['cpu_percent']:.1f}% "
+                f"rss={stats['rss_bytes'] / 2**20:.1f}MiB"
+            )
+    return result
+
+
+async def bench_http(agents, args) -> dict:
+    client = Node(host="127.0.0.1", port=args.port + 99, node_id="bench-client")
+
+    async def send(url, text):
+        reply = await client.send_message(url, text)
+        if isinstance(reply, str):
+            raise RuntimeError(reply)
+        if reply.parts[0].root.text.startswith("Error:"):
+            # Failure simulated by the stub (--error-rate).
+            raise RuntimeError(reply.parts[0].root.text)
+
+    return await measure("http", agents, send, [a.url for a in agents], args)
+
+
+async def bench_p2p(agents, relay, workdir, args) -> dict:
+    from isek.protocol.a2a_protocol_v2 import A2AProtocolV2
+
+    client = A2AProtocolV2(
+        port=args.port + 99,
+        p2p_enabled=True,
+        p2p_server_port=args.port + 199,
+        relays=[relay],
+        p2p_data_dir=os.path.join(workdir, "p2p"),
+        supervise=False,
+    )
+    await asyncio.to_thread(client.start_p2p_server, True)
+
+    async def send(peer_id, text):
+        reply = await asyncio.to_thread(
+            client.send_message, "bench-client", peer_id, text
+        )
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        if reply["result"]["status"]["state"] == "input-required":
+            raise RuntimeError("stub agent error")
+
+    try:
+        peers = [agent.info["peer_id"] for agent in agents]
+        return await measure("p2p", agents, send, peers, args)
+    finally:
+        client.stop_p2p_server()
+
+
+async def bench_inproc(args) -> dict:
+    """Message agents served by this process over HTTP, then in-process."""
+    urls = []
+    for i in range(args.agents):
+        port = args.port + 300 + i
+        card = make_card(f"inproc-agent-{i}", port)
+        stub = StubAgentWrapper(
+            card,
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            response_tokens=args.response_tokens,
+            error_rate=args.error_rate,
+            seed=port,
+        )
+        node = Node(host="127.0.0.1", port=port, node_id=card.name)
+        node.build_server(
+            Node.create_server(StubAgentExecutor(stub), card),
+            name=card.name,
+            daemon=True,
+        )
+        urls.append(f"http://127.0.0.1:{port}")
+    for url in urls:
+        await wait_for_card(url)
+
+    results = {}
+    for name, direct in (("loopback", False), ("inproc", True)):
+        client = Node(
+            host="127.0.0.1",
+            port=args.port + 99,
+            node_id="bench-client",
+            direct_dispatch=direct,
+        )
+
+        async def send(url, text, client=client):
+            reply = await client.send_message(url, text)
+            if isinstance(reply, str):
+                raise RuntimeError(reply)
+            if reply.parts[0].root.text.startswith("Error:"):
+                raise RuntimeError(reply.parts[0].root.text)
+
+        results[name] = await measure(name, [], send, urls, args)
+    return results
+
+
+async def wait_for_card(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        while True:
+            try:
+                (await client.get(f"{url}/.well-known/agent.json")).raise_for_status()
+                return
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Describe every transport that regressed against *baseline*."""
+    regressions = []
+    for transport, current in results["results"].items():
+        previous = baseline.get("results", {}).get(transport)
+        if not previous:
+            continue
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{transport} throughput {previous['throughput_rps']} -> "
+                f"{current['throughput_rps']} req/s"
+            )
+        if current["latency_ms"]["p99"] > previous["latency_ms"]["p99"] * (
+            1 + tolerance
+        ):
+            regressions.append(
+                f"{transport} p99 {previous['latency_ms']['p99']} -> "
+                f"{current['latency_ms']['p99']} ms"
+            )
+    return regressions
+
+
+async def run(args) -> dict:
+    LoggerManager.plain_mode("WARNING")
+    workdir = tempfile.mkdtemp(prefix="isek-bench-")
+    agents = [
+        Agent(f"bench-agent-{i}", args.port + i, workdir) for i in range(args.agents)
+    ]
+    relay_process = None
+    results = {}
+    try:
+        relay = None
+        if args.p2p:
+            relay_process, relay = start_relay(args.port + 200)
+        for agent in agents:
+            agent.start(args, workdir, relay)
+        for agent in agents:
+            agent.wait_ready(timeout=90.0 if args.p2p else 30.0)
+
+        print(
+            f"{args.agents} agents, {args.requests} requests, "
+            f"concurrency {args.concurrency}, stub latency {args.latency}s"
+        )
+        results["http"] = await bench_http(agents, args)
+        if args.p2p:
+            results["p2p"] = await bench_p2p(agents, relay, workdir, args)
+        if args.inproc:
+            results.update(await bench_inproc(args))
+    finally:
+        for agent in agents:
+            agent.stop()
+        if relay_process is not None:
+            relay_process.terminate()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": {
+            key: getattr(args, key)
+            for key in (
+                "agents",
+                "requests",
+                "concurrency",
+                "warmup",
+                "latency",
+                "tokens_per_second",
+                "response_tokens",
+                "error_rate",
+            )
+        },
+        "results": results,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--latency",
+        default="0",
+        help="Stub time to first token: seconds or <kind>:<mean>[,<spread>]",
+    )
+    parser.add_argument("--tokens-per-second", type=float)
+    parser.add_argument("--response-tokens", type=int, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=19300)
+    parser.add_argument("--p2p", action="store_true", help="Also bench the bridge")
+    parser.add_argument(
+        "--inproc",
+        action="store_true",
+        help="Also bench agents co-located with the client, over HTTP and in-process",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier --output file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    # Agent process mode, used by the harness itself.
+    parser.add_argument("--serve-agent", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--name", help=argparse.SUPPRESS)
+    parser.add_argument("--ready-file", help=argparse.SUPPRESS)
+    parser.add_argument("--relay", help=argparse.SUPPRESS)
+    parser.add_argument("--bridge-port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.serve_agent:
+        asyncio.run(run_agent(args))
+        return 0
+
+    results = asyncio.run(run(args))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(Path(args.baseline).read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
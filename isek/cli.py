@@ -5,6 +5,8 @@ import subprocess
 import sys
 import shutil
 import platform
+import threading
+import time
 from pathlib import Path
 
 
@@ -144,12 +146,165 @@ def run():
     """Run ISEK servers and services"""
 
 
+def _relay_output(process, prefix, peer_ids, port):
+    """Echo a relay's output, prefixed, and record the peer id it prints"""
+    for line in process.stdout:
+        if "peerId=" in line:
+            peer_ids[port] = line.strip().split("peerId=", 1)[1]
+        click.echo(f"{prefix}{line}", nl=False)
+
+
+def _run_relays(relay_script, p2p_dir, ports, relay_args, announce_ip):
+    """Run one relay process per port until interrupted or one of them exits"""
+    peer_ids = {}
+    processes = {}
+    threads = []
+    for relay_port in ports:
+        process = subprocess.Popen(
+            [
+                "node",
+                str(relay_script),
+                f"--port={relay_port}",
+                *relay_args(relay_port),
+            ],
+            cwd=p2p_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        processes[relay_port] = process
+        prefix = f"[relay:{relay_port}] " if len(ports) > 1 else ""
+        thread = threading.Thread(
+            target=_relay_output,
+            args=(process, prefix, peer_ids, relay_port),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    try:
+        announced = False
+        while all(p.poll() is None for p in processes.values()):
+            if not announced and len(peer_ids) == len(ports):
+                relays = ",".join(
+                    f"/ip4/{announce_ip}/tcp/{relay_port}/ws/p2p/{peer_ids[relay_port]}"
+                    for relay_port in ports
+                )
+                click.secho(f"✓ Relays ready: {relays}", fg="green")
+                click.secho(
+                    "   Pass them to A2AProtocolV2(relays=[...]) or p2p_server.js --relays",
+                    fg="blue",
+                )
+                announced = True
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.wait()
+        click.secho("\n✓ Relay server stopped", fg="green")
+        return
+
+    failed = [port for port, p in processes.items() if p.poll() not in (None, 0)]
+    for process in processes.values():
+        if process.poll() is None:
+            process.terminate()
+            process.wait()
+    for thread in threads:
+        thread.join(timeout=1)
+    if failed:
+        click.secho(f"\n✗ Relay server on port {failed[0]} failed", fg="red")
+        sys.exit(processes[failed[0]].returncode)
+
+
 @run.command()
 @click.option(
     "--port", default=9090, type=int, help="Port for the relay server (default: 9090)"
 )
-def relay(port):
-    """Start a libp2p circuit relay server"""
+@click.option(
+    "--count",
+    default=1,
+    type=int,
+    help="Number of relay processes to run on consecutive ports (default: 1)",
+)
+@click.option(
+    "--key-dir",
+    type=click.Path(file_okay=False),
+    help="Directory keeping each relay's identity across restarts",
+)
+@click.option(
+    "--max-reservations",
+    default=15,
+    type=int,
+    help="Circuit reservations each relay accepts (default: 15)",
+)
+@click.option(
+    "--reservation-ttl",
+    default=7200,
+    type=int,
+    help="Seconds a reservation lasts before the client must renew it (default: 7200)",
+)
+@click.option(
+    "--data-limit",
+    default=131072,
+    type=int,
+    help="Bytes relayed per connection before it is closed (default: 131072)",
+)
+@click.option(
+    "--duration-limit",
+    default=120,
+    type=int,
+    help="Seconds a relayed connection may stay open (default: 120)",
+)
+@click.option(
+    "--hop-timeout",
+    default=30,
+    type=int,
+    help="Seconds allowed to set up a circuit (default: 30)",
+)
+@click.option(
+    "--max-hop-streams",
+    default=32,
+    type=int,
+    help="Concurrent circuit requests per client connection (default: 32)",
+)
+@click.option(
+    "--max-stop-streams",
+    default=64,
+    type=int,
+    help="Concurrent circuits towards one destination connection (default: 64)",
+)
+@click.option(
+    "--metrics-port",
+    type=int,
+    help="Serve JSON metrics on 127.0.0.1:PORT/metrics (PORT+i for the i-th relay)",
+)
+@click.option(
+    "--announce-ip",
+    default="127.0.0.1",
+    help="IP used in the printed relay addresses (default: 127.0.0.1)",
+)
+def relay(
+    port,
+    count,
+    key_dir,
+    max_reservations,
+    reservation_ttl,
+    data_limit,
+    duration_limit,
+    hop_timeout,
+    max_hop_streams,
+    max_stop_streams,
+    metrics_port,
+    announce_ip,
+):
+    """Start one or more libp2p circuit relay servers
+
+    With --count N, N relays listen on PORT, PORT+1, ... as a cluster; give
+    bridges all of them and each agent reserves a circuit on every relay.
+    Set both --data-limit and --duration-limit to 0 to relay without limits.
+    Load-test a relay with benchmarks/relay_loadtest.mjs.
+    """
     import importlib.resources
 
     # Find the p2p directory
@@ -184,25 +339,55 @@ def relay(port):
         sys.exit(1)
 
     # Validate port range
-    if port <= 0 or port >= 65536:
+    if count < 1:
+        click.secho(f"✗ Invalid count: {count}. Must be at least 1", fg="red")
+        sys.exit(1)
+    if port <= 0 or port + count - 1 >= 65536:
         click.secho(f"✗ Invalid port: {port}. Must be between 1 and 65535", fg="red")
         sys.exit(1)
 
-    click.secho(f"🚀 Starting libp2p relay server on port {port}...", fg="blue")
+    def relay_args(relay_port):
+        options = [
+            f"--max_reservations={max_reservations}",
+            f"--data_limit={data_limit}",
+            f"--duration_limit={duration_limit}",
+            f"--reservation_ttl={reservation_ttl}",
+            f"--hop_timeout={hop_timeout}",
+            f"--max_hop_streams={max_hop_streams}",
+            f"--max_stop_streams={max_stop_streams}",
+        ]
+        if metrics_port:
+            options.append(f"--metrics_port={metrics_port + relay_port - port}")
+        if key_dir:
+            key_file = Path(key_dir).resolve() / f"relay-{relay_port}.key"
+            options.append(f"--key_file={key_file}")
+        return options
+
+    ports = [port + i for i in range(count)]
+    if count == 1:
+        click.secho(f"🚀 Starting libp2p relay server on port {port}...", fg="blue")
+    else:
+        click.secho(
+            f"🚀 Starting {count} libp2p relay servers on ports {ports[0]}-{ports[-1]}...",
+            fg="blue",
+        )
     click.secho("   Press Ctrl+C to stop", fg="yellow")
 
-    # Run the relay server
-    try:
-        subprocess.run(
-            ["node", str(relay_script), f"--port={port}"],
-            cwd=p2p_dir,
-            check=True,
-        )
-    except KeyboardInterrupt:
-        click.secho("\n✓ Relay server stopped", fg="green")
-    except subprocess.CalledProcessError as e:
-        click.secho(f"\n✗ Relay server failed: {e}", fg="red")
-        sys.exit(e.returncode)
+    # Run the relay servers
+    _run_relays(relay_script, p2p_dir, ports, relay_args, announce_ip)
+
+
+@cli.command(
+    context_settings=dict(
+        ignore_unknown_options=True, allow_extra_args=True, help_option_names=[]
+    )
+)
+@click.pass_context
+def bench(ctx):
+    """Benchmark local agents end to end (see --help for options)"""
+    from isek.bench.agents import main as bench_main
+
+    sys.exit(bench_main(ctx.args))
 
 
 @cli.group()
@@ -35,3 +35,15 @@ class NodeUnavailableError(Exception):
         :rtype: str
         """
         return self.message
+
+
+class BridgeUnavailableError(NodeUnavailableError):
+    """
+    Raised when the local Node.js p2p bridge is down or restarting.
+
+    Sends fail with this error immediately instead of waiting for a request
+    timeout; retry once the bridge supervisor has brought the bridge back.
+    """
+
+    def __init__(self, bridge_name: str, message: str = "p2p bridge is down"):
+        super().__init__(bridge_name, message)
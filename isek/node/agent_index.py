@@ -0,0 +1,149 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Index fields and where they come from in an agent card (JSON form).
+FIELDS = ("skill", "tag", "input_mode", "output_mode", "name")
+
+_EMPTY: Set[str] = frozenset()
+
+
+def _card_keys(agent_card: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """Extract the indexed terms of *agent_card*, case-folded, per field."""
+    keys: Dict[str, Set[str]] = {field: set() for field in FIELDS}
+    if agent_card.get("name"):
+        keys["name"].add(agent_card["name"].casefold())
+    keys["input_mode"].update(
+        m.casefold() for m in agent_card.get("defaultInputModes") or []
+    )
+    keys["output_mode"].update(
+        m.casefold() for m in agent_card.get("defaultOutputModes") or []
+    )
+    for skill in agent_card.get("skills") or []:
+        if skill.get("id"):
+            keys["skill"].add(skill["id"].casefold())
+        if skill.get("name"):
+            keys["name"].add(skill["name"].casefold())
+        keys["tag"].update(t.casefold() for t in skill.get("tags") or [])
+        keys["input_mode"].update(m.casefold() for m in skill.get("inputModes") or [])
+        keys["output_mode"].update(m.casefold() for m in skill.get("outputModes") or [])
+    return keys
+
+
+class AgentCardIndex:
+    """In-process inverted index over agent cards.
+
+    Maps skill ids, skill tags, input/output modes and agent/skill names to
+    the URLs of the agents advertising them, so lookups cost a few set
+    intersections regardless of how many cards are indexed.  Terms are matched
+    case-insensitively.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[str, Set[str]]] = {f: {} for f in FIELDS}
+        self._keys_by_url: Dict[str, Dict[str, Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys_by_url)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._keys_by_url
+
+    def add(self, url: str, agent_card: Dict[str, Any]) -> None:
+        """Index *agent_card* under *url*, replacing any previous card for it."""
+        keys = _card_keys(agent_card)
+        with self._lock:
+            self._unindex(url)
+            for field, terms in keys.items():
+                postings = self._postings[field]
+                for term in terms:
+                    postings.setdefault(term, set()).add(url)
+            self._keys_by_url[url] = keys
+
+    def remove(self, url: str) -> None:
+        """Drop the card indexed under *url*, if any."""
+        with self._lock:
+            self._unindex(url)
+
+    def find_agents(
+        self,
+        skill: Optional[str] = None,
+        tag: Optional[str] = None,
+        mode: Optional[str] = None,
+        input_mode: Optional[str] = None,
+        output_mode: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> List[str]:
+        """Return the URLs of agents matching *all* given criteria.
+
+        :param skill: A skill id.
+        :param tag: A skill tag.
+        :param mode: A MIME type accepted as input *or* produced as output.
+        :param input_mode: A MIME type the agent accepts.
+        :param output_mode: A MIME type the agent produces.
+        :param name: An agent or skill name.
+        :return: Matching agent URLs; every indexed agent when no criteria are given.
+        :rtype: typing.List[str]
+        """
+        criteria: List[Tuple[str, str]] = [
+            (field, value.casefold())
+            for field, value in (
+                ("skill", skill),
+                ("tag", tag),
+                ("input_mode", input_mode),
+                ("output_mode", output_mode),
+                ("name", name),
+            )
+            if value is not None
+        ]
+        with self._lock:
+            if not criteria and mode is None:
+                return list(self._keys_by_url)
+
+            inputs = outputs = _EMPTY
+            if mode is not None:
+                folded = mode.casefold()
+                inputs = self._postings["input_mode"].get(folded, _EMPTY)
+                outputs = self._postings["output_mode"].get(folded, _EMPTY)
+                if not criteria:
+                    return list(inputs | outputs)
+
+            # Intersect starting from the rarest term so the working set
+            # stays small; popular modes are applied as a final filter.
+            sets = sorted(
+                (self._postings[f].get(v, _EMPTY) for f, v in criteria), key=len
+            )
+            result = set(sets[0])
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+            if mode is not None:
+                result = {url for url in result if url in inputs or url in outputs}
+            return list(result)
+
+    def find_any(
+        self, term: str, fields: Iterable[str] = ("skill", "name", "tag")
+    ) -> Set[str]:
+        """Return the URLs of agents that have *term* in any of *fields*."""
+        folded = term.casefold()
+        with self._lock:
+            result: Set[str] = set()
+            for field in fields:
+                result |= self._postings[field].get(folded, _EMPTY)
+            return result
+
+    # Callers must hold ``self._lock``.
+    def _unindex(self, url: str) -> None:
+        keys = self._keys_by_url.pop(url, None)
+        if keys is None:
+            return
+        for field, terms in keys.items():
+            postings = self._postings[field]
+            for term in terms:
+                urls = postings.get(term)
+                if urls is None:
+                    continue
+                urls.discard(url)
+                if not urls:
+                    del postings[term]
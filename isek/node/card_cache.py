@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from isek.utils.log import log
+from isek.utils.sqlite_writer import SQLiteWriter
+from isek.utils.tools import dict_md5
+
+CardEntry = Dict[str, Any]
+
+
+class AgentCardCache:
+    """Agent-card cache with HTTP validators and optional SQLite persistence.
+
+    Each entry is a ``CardEntry`` dict with the keys ``card`` (the card JSON),
+    ``etag`` and ``last_modified`` (response validators, if the agent sent
+    any), ``fetched_at`` (epoch seconds of the last successful fetch or
+    revalidation) and ``digest`` (content hash of the card).
+
+    With *persist_path* set, entries are written through to SQLite and loaded
+    back on construction, so a restarted node starts with every card it knew
+    and only needs to revalidate them.  Writes are committed from a background
+    thread, so a card fetch on the event loop never waits for the disk.
+
+    :param max_age: Seconds an entry is served without revalidation.
+    :type max_age: float
+    :param persist_path: Optional SQLite file backing the cache.
+    :type persist_path: typing.Optional[str]
+    """
+
+    def __init__(self, max_age: float = 300.0, persist_path: Optional[str] = None):
+        self.max_age = max_age
+        self._entries: Dict[str, CardEntry] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[SQLiteWriter] = None
+        if persist_path:
+            self._db = SQLiteWriter(
+                persist_path,
+                "CREATE TABLE IF NOT EXISTS agent_cards ("
+                "url TEXT PRIMARY KEY, card TEXT NOT NULL, etag TEXT, "
+                "last_modified TEXT, fetched_at REAL NOT NULL, digest TEXT NOT NULL)",
+                name="agent-card-cache-writer",
+            )
+            for url, card, etag, last_modified, fetched_at, digest in self._db.read(
+                "SELECT url, card, etag, last_modified, fetched_at, digest FROM agent_cards"
+            ):
+                self._entries[url] = {
+                    "card": json.loads(card),
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "fetched_at": fetched_at,
+                    "digest": digest,
+                }
+            log.debug(f"Loaded {len(self._entries)} agent cards from {persist_path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> Dict[str, CardEntry]:
+        """Return a snapshot of every cached entry, keyed by agent URL."""
+        return dict(self._entries)
+
+    def get(self, url: str) -> Optional[CardEntry]:
+        return self._entries.get(url)
+
+    def is_fresh(self, entry: CardEntry) -> bool:
+        return time.time() - entry["fetched_at"] < self.max_age
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Return conditional-request headers for revalidating *url*'s card."""
+        entry = self._entries.get(url)
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(
+        self,
+        url: str,
+        card: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """Store a freshly fetched *card*; return whether its content changed."""
+        digest = dict_md5(card)
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(url)
+            changed = previous is None or previous["digest"] != digest
+            self._entries[url] = {
+                "card": card if changed else previous["card"],
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+                "digest": digest,
+            }
+            if self._db is not None:
+                self._db.write(
+                    "INSERT OR REPLACE INTO agent_cards VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, json.dumps(card), etag, last_modified, now, digest),
+                )
+        return changed
+
+    def touch(self, url: str) -> None:
+        """Mark *url*'s entry as revalidated (the agent answered ``304``)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return
+            entry["fetched_at"] = now
+            if self._db is not None:
+                self._db.write(
+                    "UPDATE agent_cards SET fetched_at = ? WHERE url = ?", (now, url)
+                )
+
+    def remove(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+            if self._db is not None:
+                self._db.write("DELETE FROM agent_cards WHERE url = ?", (url,))
+
+    def flush(self) -> None:
+        """Block until every queued write has reached the on-disk store."""
+        if self._db is not None:
+            self._db.flush()
+
+    def close(self) -> None:
+        """Write out pending entries and close the on-disk store, if any."""
+        if self._db is not None:
+            self._db.close()
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from typing import List, Optional, Set
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+
+from isek.utils.log import log
+
+
+class ExecutionTracker(AgentExecutor):
+    """Agent executor wrapper that knows which executions are in flight.
+
+    :meth:`Node.create_server <isek.node.node_v3_a2a.Node.create_server>`
+    wraps every executor with it, so a stopping server can wait for
+    executions that outlive their HTTP request (non-blocking sends, streams
+    whose client went away) before its event loop is torn down.
+
+    :param executor: The agent's executor.
+    :type executor: AgentExecutor
+    """
+
+    def __init__(self, executor: AgentExecutor) -> None:
+        self.executor = executor
+        self._running: Set[asyncio.Task] = set()
+
+    @property
+    def active(self) -> int:
+        """Number of executions in flight."""
+        return len(self._running)
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        task = asyncio.current_task()
+        self._running.add(task)
+        try:
+            await self.executor.execute(context, event_queue)
+        finally:
+            self._running.discard(task)
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.executor.cancel(context, event_queue)
+
+    async def drain(self, timeout: Optional[float]) -> bool:
+        """Wait up to *timeout* seconds for the executions in flight to finish.
+
+        Must run on the loop serving the agent.  Returns whether they all did;
+        the stragglers are left to the loop's shutdown, which cancels them.
+        """
+        if not self._running:
+            return True
+        log.info(f"Draining {len(self._running)} agent execution(s)")
+        _, pending = await asyncio.wait(set(self._running), timeout=timeout)
+        if pending:
+            log.warning(f"{len(pending)} agent execution(s) still running at shutdown")
+        return not pending
+
+
+def execution_tracker(app: A2AStarletteApplication) -> Optional[ExecutionTracker]:
+    """Return the :class:`ExecutionTracker` of *app*, if it was built with one."""
+    request_handler = getattr(app.handler, "request_handler", None)
+    executor = getattr(request_handler, "agent_executor", None)
+    return executor if isinstance(executor, ExecutionTracker) else None
+
+
+class ServerHandle:
+    """State of a server started by :meth:`Node.start
+    <isek.node.node_v3_a2a.Node.start>`, filled in by ``Node.run_server``.
+
+    :ivar server: The uvicorn server, once created.
+    :ivar loop: The event loop serving it.
+    :ivar local_agents: The in-process entry points registered for its agents.
+    :ivar drain_deadline: ``time.monotonic()`` by which a stopping server
+        must have drained; ``None`` until a stop is requested.
+    :ivar drained: Whether every execution finished before the deadline.
+    """
+
+    def __init__(self) -> None:
+        self.server = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.local_agents: List = []
+        self.thread: Optional[threading.Thread] = None
+        self.p2p = None
+        self.drain_deadline: Optional[float] = None
+        self.drained = False
+
+    def started(self) -> bool:
+        return self.server is not None and self.server.started
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+import httpx
+
+from a2a.auth.user import UnauthenticatedUser
+from a2a.client.errors import A2AClientHTTPError, A2AClientTimeoutError
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.context import ServerCallContext
+from a2a.types import (
+    InternalError,
+    JSONRPCErrorResponse,
+    SendMessageRequest,
+    SendMessageResponse,
+    UnsupportedOperationError,
+)
+from a2a.utils.errors import MethodNotImplementedError
+
+from isek.utils.log import log
+
+# Hosts under which a server bound to a wildcard or loopback address is reached.
+_LOOPBACK_ALIASES = ("127.0.0.1", "localhost")
+
+
+def _normalize(url: str) -> str:
+    return url.rstrip("/")
+
+
+def server_urls(
+    app: A2AStarletteApplication, host: str, port: int, path: str = ""
+) -> List[str]:
+    """Return the URLs a client may use for *app* served on ``host:port``
+    under *path*.
+
+    That is the URL of its agent card, ``http://host:port<path>`` and, for a
+    server bound to a wildcard or loopback address, its loopback aliases.
+    """
+    wildcard = host in ("0.0.0.0", "::", "")
+    hosts = [] if wildcard else [host]
+    if wildcard or host in _LOOPBACK_ALIASES:
+        hosts += _LOOPBACK_ALIASES
+    urls = [app.agent_card.url] + [f"http://{h}:{port}{path}" for h in hosts]
+    return list(dict.fromkeys(_normalize(url) for url in urls if url))
+
+
+class LocalAgent:
+    """An A2A application served by this process, callable without HTTP.
+
+    Requests are handed to the application's JSON-RPC handler as the validated
+    models the client built, on the event loop that serves the application;
+    the response is deep-copied so the caller never shares objects with the
+    agent's task store.  Errors are reported the way the HTTP endpoint reports
+    them, so a caller cannot tell the difference except for speed.
+
+    The call context is that of an unauthenticated request without headers;
+    agents relying on a custom ``context_builder`` should be called over HTTP.
+
+    :param app: The A2A application.
+    :param loop: The event loop serving it.
+    """
+
+    def __init__(
+        self, app: A2AStarletteApplication, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self.app = app
+        self.loop = loop
+        self._pending: Set[asyncio.Future] = set()
+
+    def agent_card(self) -> dict:
+        """Return the agent card as the well-known endpoint serves it."""
+        return self.app.agent_card.model_dump(exclude_none=True, by_alias=True)
+
+    async def send_message(
+        self, request: SendMessageRequest, timeout: Optional[float] = None
+    ) -> SendMessageResponse:
+        """Run ``message/send`` on the agent and return its response.
+
+        :raises A2AClientTimeoutError: If no response arrives within *timeout*
+            seconds, as the HTTP client would raise.
+        :raises A2AClientHTTPError: If the agent's server shuts down before
+            answering, as for a dropped HTTP connection.
+        """
+        call = self._dispatch(request.model_copy(deep=True))
+        if asyncio.get_running_loop() is self.loop:
+            future = asyncio.ensure_future(call)
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+        else:
+            # The agent's task store and queues belong to its own loop.
+            future = asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(call, self.loop)
+            )
+        # Like a request whose HTTP client gave up, a call the caller stops
+        # waiting for (timed out or cancelled) is left to finish: asyncio.wait
+        # neither cancels the future nor raises when only the future is.
+        done, _ = await asyncio.wait({future}, timeout=timeout)
+        if not done:
+            raise A2AClientTimeoutError("Client Request timed out")
+        if future.cancelled():
+            # The agent's server shut down mid-call: a dropped connection.
+            dropped = httpx.RemoteProtocolError("local agent shut down")
+            raise A2AClientHTTPError(
+                503, f"Network communication error: {dropped}"
+            ) from dropped
+        return future.result().model_copy(deep=True)
+
+    async def _dispatch(self, request: SendMessageRequest) -> SendMessageResponse:
+        context = ServerCallContext(
+            user=UnauthenticatedUser(),
+            state={"headers": {}, "method": "message/send"},
+        )
+        try:
+            return await self.app.handler.on_message_send(request, context)
+        except MethodNotImplementedError:
+            error = UnsupportedOperationError()
+        except Exception as e:
+            log.exception("Unhandled exception in local dispatch")
+            error = InternalError(message=str(e))
+        return SendMessageResponse(
+            root=JSONRPCErrorResponse(id=request.id, error=error)
+        )
+
+
+class LocalAgentRegistry:
+    """Process-wide map from agent URL to the :class:`LocalAgent` serving it.
+
+    :meth:`Node.run_server <isek.node.node_v3_a2a.Node.run_server>` registers
+    an application while it is being served, and ``Node.send_message`` calls
+    registered agents directly.
+    """
+
+    def __init__(self) -> None:
+        self._agents: Dict[str, LocalAgent] = {}
+        self._lock = threading.Lock()
+
+    def register(self, urls: Iterable[str], agent: LocalAgent) -> None:
+        with self._lock:
+            for url in urls:
+                self._agents[_normalize(url)] = agent
+
+    def unregister(self, agent: LocalAgent) -> None:
+        with self._lock:
+            for url in [u for u, a in self._agents.items() if a is agent]:
+                del self._agents[url]
+
+    def get(self, url: str) -> Optional[LocalAgent]:
+        return self._agents.get(_normalize(url))
+
+    def urls(self) -> List[str]:
+        with self._lock:
+            return list(self._agents)
+
+
+local_agents = LocalAgentRegistry()
@@ -0,0 +1,224 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.context import ServerCallContext
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import TaskStore
+from a2a.types import AgentCard, Task
+from a2a.utils.constants import (
+    AGENT_CARD_WELL_KNOWN_PATH,
+    EXTENDED_AGENT_CARD_PATH,
+    PREV_AGENT_CARD_WELL_KNOWN_PATH,
+)
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from isek.node.lifecycle import ExecutionTracker
+from isek.node.local_dispatch import server_urls
+from isek.utils.log import log
+
+# Endpoints every hosted agent serves below its own path: suffix -> (method,
+# name of the A2AStarletteApplication endpoint serving it).
+_ENDPOINTS = {
+    AGENT_CARD_WELL_KNOWN_PATH: ("GET", "_handle_get_agent_card"),
+    PREV_AGENT_CARD_WELL_KNOWN_PATH: ("GET", "_handle_get_agent_card"),
+    EXTENDED_AGENT_CARD_PATH: (
+        "GET",
+        "_handle_get_authenticated_extended_agent_card",
+    ),
+}
+_RPC_ENDPOINT = ("POST", "_handle_requests")
+
+
+def _agent_path(url: str) -> str:
+    return urlsplit(url).path.rstrip("/")
+
+
+def _split_endpoint(path: str) -> Tuple[str, Tuple[str, str]]:
+    """Split a request path into the agent's path and the endpoint requested."""
+    for suffix, endpoint in _ENDPOINTS.items():
+        if path.endswith(suffix):
+            return path[: -len(suffix)], endpoint
+    return path, _RPC_ENDPOINT
+
+
+class SharedTaskStore:
+    """One in-memory task table for all the agents of a
+    :class:`MultiAgentApplication`.
+
+    Each agent uses it through its own :meth:`view`, keyed by the agent, so a
+    task id known to one agent's clients cannot be read, resubscribed to or
+    cancelled through another agent.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Tuple[str, str], Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def view(self, owner: str) -> TaskStore:
+        """Return the :class:`TaskStore` of the agent identified by *owner*."""
+        return _TaskStoreView(self._tasks, owner)
+
+
+class _TaskStoreView(TaskStore):
+    # The table is only touched from the serving event loop and no operation
+    # awaits, so it needs no lock.
+    def __init__(self, tasks: Dict[Tuple[str, str], Task], owner: str) -> None:
+        self._tasks = tasks
+        self._owner = owner
+
+    async def save(self, task: Task, context: Optional[ServerCallContext] = None):
+        self._tasks[(self._owner, task.id)] = task
+
+    async def get(
+        self, task_id: str, context: Optional[ServerCallContext] = None
+    ) -> Optional[Task]:
+        return self._tasks.get((self._owner, task_id))
+
+    async def delete(self, task_id: str, context: Optional[ServerCallContext] = None):
+        self._tasks.pop((self._owner, task_id), None)
+
+
+class MultiAgentApplication:
+    """Many A2A agents served by one Starlette application.
+
+    Every agent is an ordinary :class:`A2AStarletteApplication` with its own
+    card, executor and JSON-RPC handler; the server, its event loop and the
+    task store are shared.  An agent added with :meth:`add_agent` is reached
+    either
+
+    - under the path of its card's URL: the agent whose card URL is
+      ``http://host:9000/agents/echo`` answers ``POST /agents/echo`` and
+      serves its card at ``/agents/echo/.well-known/agent.json``; or
+    - at the root of the host names it is added with, for deployments that
+      point one name per agent at the same server.
+
+    Requests are routed with a dictionary lookup, so routing does not slow
+    down as agents are added.
+
+    :param task_store: Task store shared by the agents; a new one by default.
+    :type task_store: Optional[SharedTaskStore]
+    """
+
+    def __init__(self, task_store: Optional[SharedTaskStore] = None) -> None:
+        self.task_store: SharedTaskStore = (
+            task_store if task_store is not None else SharedTaskStore()
+        )
+        self._by_path: Dict[str, A2AStarletteApplication] = {}
+        self._by_host: Dict[str, A2AStarletteApplication] = {}
+        # (application, hosts) of every agent, in the order they were added.
+        self._hosted: List[Tuple[A2AStarletteApplication, List[str]]] = []
+
+    @property
+    def agents(self) -> List[A2AStarletteApplication]:
+        """The applications of the hosted agents, in the order they were added."""
+        return [app for app, _ in self._hosted]
+
+    def add_agent(
+        self,
+        agent_card: AgentCard,
+        agent_executor: AgentExecutor,
+        hosts: Iterable[str] = (),
+    ) -> A2AStarletteApplication:
+        """Host the agent described by *agent_card*.
+
+        Agents should be added before the application is served; an agent
+        added later is routed but not registered for in-process dispatch.
+
+        :param agent_card: The agent's card; without *hosts*, the path of its
+            URL is where the agent is served.
+        :param agent_executor: The agent's executor.
+        :param hosts: Host names whose requests go to this agent, at the root
+            path, instead of routing by path.
+        :return: The agent's application.
+        :raises ValueError: If the path or one of the hosts already serves
+            another agent.
+        """
+        hosts = [host.lower() for host in hosts]
+        path = _agent_path(agent_card.url)
+        if not hosts and path in self._by_path:
+            raise ValueError(f"An agent is already served at {path or '/'}")
+        taken = [host for host in hosts if host in self._by_host]
+        if taken:
+            raise ValueError(f"Hosts already serve another agent: {taken}")
+
+        key = f"host:{hosts[0]}" if hosts else path
+        request_handler = DefaultRequestHandler(
+            agent_executor=ExecutionTracker(agent_executor),
+            task_store=self.task_store.view(key),
+        )
+        app = A2AStarletteApplication(
+            agent_card=agent_card, http_handler=request_handler
+        )
+        for host in hosts:
+            self._by_host[host] = app
+        if not hosts:
+            self._by_path[path] = app
+        self._hosted.append((app, hosts))
+        log.debug(f"Hosting agent {agent_card.name} at {hosts or path or '/'}")
+        return app
+
+    def build(self, **kwargs) -> Starlette:
+        """Return the Starlette application routing requests to the agents."""
+        return Starlette(
+            routes=[Route("/{path:path}", self._route, methods=["GET", "POST"])],
+            **kwargs,
+        )
+
+    def local_urls(
+        self, host: str, port: int
+    ) -> List[Tuple[A2AStarletteApplication, List[str]]]:
+        """Return each agent with the URLs it answers to when served on
+        ``host:port`` (see :func:`isek.node.local_dispatch.server_urls`)."""
+        served = []
+        for app, hosts in self._hosted:
+            if hosts:
+                urls = [app.agent_card.url.rstrip("/")]
+                urls += [f"http://{name}:{port}" for name in hosts]
+                served.append((app, list(dict.fromkeys(urls))))
+            else:
+                path = _agent_path(app.agent_card.url)
+                served.append((app, server_urls(app, host, port, path)))
+        return served
+
+    async def _route(self, request: Request) -> Response:
+        prefix, (method, endpoint) = _split_endpoint(request.url.path.rstrip("/"))
+        app = None
+        if not prefix:
+            app = self._by_host.get((request.url.hostname or "").lower())
+        if app is None:
+            app = self._by_path.get(prefix)
+        if app is None:
+            return JSONResponse(
+                {"error": f"No agent at {request.url.path}"}, status_code=404
+            )
+        if request.method != method:
+            return JSONResponse({"error": "method not allowed"}, status_code=405)
+        if (
+            endpoint == "_handle_get_authenticated_extended_agent_card"
+            and not app.agent_card.supports_authenticated_extended_card
+        ):
+            return JSONResponse(
+                {"error": f"No agent at {request.url.path}"}, status_code=404
+            )
+        # The same endpoints the agent's own routes would call.
+        return await getattr(app, endpoint)(request)
+
+
+def hosted_applications(
+    app, host: str, port: int
+) -> List[Tuple[A2AStarletteApplication, List[str]]]:
+    """Return the agents served by *app* on ``host:port`` with their URLs.
+
+    *app* is either a single :class:`A2AStarletteApplication` or a
+    :class:`MultiAgentApplication`.
+    """
+    if isinstance(app, MultiAgentApplication):
+        return app.local_urls(host, port)
+    return [(app, server_urls(app, host, port))]
@@ -1,7 +1,21 @@
+import atexit
+import contextlib
+import os
 import threading
+import time
 import uuid
 from abc import ABC
-from typing import Dict, Any
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 from isek.utils.log import log
 import httpx
 import uvicorn
@@ -16,13 +30,34 @@ from isek.utils.common import log_a2a_api_call, log_error
 from uuid import uuid4
 from a2a.types import Message, Part, Role, TextPart
 import asyncio
-from isek.web3.isek_identiey import ensure_identity
+from isek.web3.isek_identiey import ensure_identity, resolve_identity_by_address
+from isek.node.card_cache import AgentCardCache
+from isek.node.lifecycle import ExecutionTracker, ServerHandle, execution_tracker
+from isek.node.local_dispatch import LocalAgent, local_agents
+from isek.node.multi_agent import (
+    MultiAgentApplication,
+    SharedTaskStore,
+    hosted_applications,
+)
+from isek.node.profiler import ProfiledA2AApplication
+from isek.node.registry import NodeDetails, NodeRegistry
+from isek.node.resilience import ResilientCaller
+from isek.node.unix_socket import (
+    UnixSocketTransport,
+    agent_socket_path,
+    bind_unix_socket,
+    local_socket_for,
+)
+
+if TYPE_CHECKING:
+    from isek.protocol.a2a_protocol_v2 import A2AProtocolV2
 
 # Alias for consistency with other modules
 logger = log
 
-NodeDetails = Dict[str, Any]
 AGENT_CARD_WELL_KNOWN_PATH = "/.well-known/agent.json"
+# Seconds a stopping server keeps connections it accepted open for a request.
+STOP_ACCEPT_GRACE = 0.5
 
 
 class Node(ABC):
@@ -31,6 +66,12 @@ class Node(ABC):
         host: str,
         port: int,
         node_id: str,
+        resilience: Optional[ResilientCaller] = None,
+        request_timeout: float = 10.0,
+        card_cache: Optional[AgentCardCache] = None,
+        uds: Union[bool, str, None] = None,
+        local_sockets: bool = True,
+        direct_dispatch: bool = True,
         **kwargs: Any,  # To absorb any extra arguments
     ):
         if not host:
@@ -43,14 +84,41 @@ class Node(ABC):
         self.host: str = host
         self.port: int = port
         self.node_id: str = node_id
-        self.all_nodes: Dict[str, NodeDetails] = {}
+        # Peer registry; ``all_nodes`` is its url -> NodeDetails mapping.
+        self.registry: NodeRegistry = NodeRegistry()
+        self.all_nodes: Dict[str, NodeDetails] = self.registry.peers
+        self._health_check_task: Optional[asyncio.Task] = None
+        # Retries, hedging and circuit breaking for outbound calls.
+        self.resilience: ResilientCaller = resilience or ResilientCaller()
+        self.request_timeout: float = request_timeout
+        # Agent cards known to this node; pass a persistent cache to start warm.
+        self.card_cache: AgentCardCache = (
+            card_cache if card_cache is not None else AgentCardCache()
+        )
+        self._revalidating: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._server_handle: Optional[ServerHandle] = None
+        for url, entry in self.card_cache.entries().items():
+            self.registry.add(url, agent_card=entry["card"], source="agent_card")
+        # Unix socket served next to host:port (``True`` for the conventional
+        # path of the port, which same-host clients and the bridge look up;
+        # without agent socket support ``True`` leaves the node on TCP only).
+        self.uds: Optional[str] = (
+            agent_socket_path(port) if uds is True else uds or None
+        )
+        # Reach agents on this host over their socket rather than TCP.
+        self.local_sockets: bool = local_sockets
+        # Call agents served by this process in-process, without HTTP.
+        self.direct_dispatch: bool = direct_dispatch
 
     async def get_agent_card_by_url(self, agent_url: str) -> dict:
         """Fetch and cache agent cards from all configured agent URLs.
 
-        The function uses a simple in-memory cache (``_agent_info_cache``) to avoid
-        fetching the ­same agent card repeatedly.  If a card is not cached, it is
-        retrieved from the agent’s “well-known” endpoint and stored in the cache.
+        Cards are served from :attr:`card_cache` while they are fresh.  A stale
+        card is still returned immediately and revalidated in the background
+        (with ``If-None-Match``/``If-Modified-Since`` when the agent supplied
+        validators).  Only a card that was never seen is fetched inline from the
+        agent's “well-known” endpoint.
 
         Args:
             agent_url: The URL of the agent to fetch the agent card from.
@@ -58,28 +126,148 @@ class Node(ABC):
         Returns:
             dict: ``AgentCard`` fully JSON-serialisable object for interoperability with the rest of the MCP pipeline.
         """
-        timeout_config = httpx.Timeout(10.0)  # seconds
+        agent_url = agent_url.rstrip("/")
+        entry = self.card_cache.get(agent_url)
+        if entry is not None:
+            if not self.card_cache.is_fresh(entry):
+                self._revalidate_card(agent_url)
+            return entry["card"]
+
         log_a2a_api_call(
             "get_agent_card_by_url", f"Fetching agent card for {agent_url}"
         )
-
-        async with httpx.AsyncClient(timeout=timeout_config) as httpx_client:
-            response = await httpx_client.get(
-                f"{agent_url}{AGENT_CARD_WELL_KNOWN_PATH}"
-            )
-            response.raise_for_status()
-            card_data = response.json()
+        self.registry.add(agent_url, source="agent_card")
+        local_agent = self._local_agent(agent_url)
+        if local_agent is not None:
+            card_data = local_agent.agent_card()
+            self.card_cache.put(agent_url, card_data)
+            self.registry.add(agent_url, agent_card=card_data)
             return card_data
+        async with self._http_client(agent_url, 10.0) as httpx_client:
+            return await self._fetch_agent_card(httpx_client, agent_url)
+
+    def _local_agent(self, agent_url: str) -> Optional[LocalAgent]:
+        """Return the agent served by this process at *agent_url*, if any."""
+        return local_agents.get(agent_url) if self.direct_dispatch else None
+
+    def _http_client(self, agent_url: str, timeout: float) -> httpx.AsyncClient:
+        """Return a client for *agent_url*, over its Unix socket when it has one."""
+        path = local_socket_for(agent_url) if self.local_sockets else None
+        if path is None:
+            return httpx.AsyncClient(timeout=httpx.Timeout(timeout))
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout), transport=UnixSocketTransport(path)
+        )
 
-    async def send_message(self, agent_url: str, query: str) -> str:
+    async def _fetch_agent_card(
+        self, client: httpx.AsyncClient, agent_url: str
+    ) -> dict:
+        """Conditionally fetch *agent_url*'s card, updating the cache and registry."""
+        started = time.perf_counter()
+        try:
+            response = await client.get(
+                f"{agent_url}{AGENT_CARD_WELL_KNOWN_PATH}",
+                headers=self.card_cache.validators(agent_url),
+            )
+            if response.status_code == 304:
+                self.card_cache.touch(agent_url)
+                card_data = self.card_cache.get(agent_url)["card"]
+                changed = False
+            else:
+                response.raise_for_status()
+                card_data = response.json()
+                changed = self.card_cache.put(
+                    agent_url,
+                    card_data,
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                )
+        except Exception:
+            self.registry.record_failure(agent_url)
+            raise
+        if changed or not (self.registry.get(agent_url) or {}).get("agent_card"):
+            self.registry.add(agent_url, agent_card=card_data)
+        self.registry.record_success(agent_url, time.perf_counter() - started)
+        return card_data
+
+    def _revalidate_card(self, agent_url: str) -> None:
+        """Schedule a background revalidation of *agent_url*'s cached card."""
+        if agent_url in self._revalidating:
+            return
+        self._revalidating.add(agent_url)
+
+        async def _revalidate() -> None:
+            try:
+                async with self._http_client(agent_url, 10.0) as client:
+                    await self._fetch_agent_card(client, agent_url)
+            except Exception as e:
+                logger.debug("[card_cache] revalidating %s failed: %s", agent_url, e)
+            finally:
+                self._revalidating.discard(agent_url)
+
+        task = asyncio.get_running_loop().create_task(_revalidate())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def revalidate_cached_cards(self) -> None:
+        """Schedule background revalidation of every cached card (e.g. after a restart)."""
+        for url in self.card_cache.entries():
+            self._revalidate_card(url)
+
+    async def send_message(
+        self,
+        agent_url: str,
+        query: str,
+        hedge_urls: Union[List[str], bool, None] = None,
+        failover_peers: Union[List[str], bool, None] = None,
+    ) -> str:
         """Execute a task on a remote agent and return the aggregated response.
 
+        The call goes through :attr:`resilience`: failures that happen before
+        the request reaches the agent are retried with backoff and a target
+        whose circuit breaker is open fails fast.  The query only ever goes
+        to another agent when the caller allows it: a slow call may be
+        duplicated to one of *hedge_urls* when hedging is enabled, and an
+        open circuit fails over to one of *failover_peers*.
+
         Args:
+            agent_url: Base URL of the agent to execute the task on.
             query: The query to send to the agent.
+            hedge_urls: Agents a slow call may be hedged to; ``True`` for the
+                healthy registry peers sharing a skill with the target.
+            failover_peers: Agents to send the query to instead while the
+                target's circuit is open; ``True`` for the healthy registry
+                peers sharing a skill with the target.
 
         Returns:
-            str: The content of the task result.
+            str: The content of the task result, or an ``"Error: ..."`` string
+            describing a JSON-RPC error returned by the agent.
         """
+        agent_url = agent_url.rstrip("/")
+        # One message id for every attempt so the receiver can recognise resends.
+        message_id = uuid4().hex
+
+        async def _attempt(url: str):
+            return await self._send_message_once(url, query, message_id)
+
+        response = await self.resilience.call(
+            agent_url,
+            _attempt,
+            hedge_targets=self._alternates(agent_url, hedge_urls),
+            failover_targets=self._alternates(agent_url, failover_peers),
+        )
+
+        if isinstance(response.root, JSONRPCErrorResponse):
+            error = response.root.error
+            logger.error("[execute_task] Error response received: %s", response)
+            return f"Error: Unable to execute task ({error.code}: {error.message})"
+
+        message_content = response.root.result.status.message
+        logger.info("[execute_task] Task result content: %s", message_content)
+        return message_content
+
+    async def _send_message_once(self, agent_url: str, query: str, message_id: str):
+        """Make a single ``message/send`` attempt and record its outcome."""
         # Fetch the agent-card data and build a proper ``AgentCard`` instance.
         agent_card_data = await self.get_agent_card_by_url(agent_url)
         agent_card = AgentCard(**agent_card_data)
@@ -95,31 +283,162 @@ class Node(ABC):
             message=Message(
                 role=Role.user,
                 parts=[Part(TextPart(text=query))],
-                messageId=uuid4().hex,  # Include required messageId field
+                messageId=message_id,
             )
         )
 
-        logger.debug("[execute_task] Sending non-streaming request …")
-        timeout_config = httpx.Timeout(10.0)
-        async with httpx.AsyncClient(timeout=timeout_config) as httpx_client:
-            client = A2AClient(httpx_client, agent_card=agent_card)
-            response = await client.send_message(
-                SendMessageRequest(id=uuid4().hex, params=msg_params)
-            )
+        request = SendMessageRequest(id=uuid4().hex, params=msg_params)
+        started = time.perf_counter()
+        local_agent = self._local_agent(agent_url)
+        try:
+            if local_agent is not None:
+                logger.debug("[execute_task] Dispatching in-process …")
+                response = await local_agent.send_message(
+                    request, timeout=self.request_timeout
+                )
+            else:
+                logger.debug("[execute_task] Sending non-streaming request …")
+                async with self._http_client(
+                    agent_url, self.request_timeout
+                ) as httpx_client:
+                    client = A2AClient(httpx_client, agent_card=agent_card)
+                    response = await client.send_message(request)
+        except Exception:
+            self.registry.record_failure(agent_url)
+            raise
+
+        if isinstance(response.root, JSONRPCErrorResponse):
+            self.registry.record_failure(agent_url)
+        else:
+            self.registry.record_success(agent_url, time.perf_counter() - started)
+        return response
+
+    def _alternates(
+        self, agent_url: str, peers: Union[List[str], bool, None]
+    ) -> List[str]:
+        """Resolve a ``hedge_urls``/``failover_peers`` argument to URLs."""
+        if peers is True:
+            return self._alternate_peers(agent_url)
+        return [url.rstrip("/") for url in peers or []]
+
+    def _alternate_peers(self, agent_url: str) -> List[str]:
+        """Return healthy registry peers advertising a skill of *agent_url*'s card."""
+        details = self.registry.get(agent_url)
+        if not details or not details["agent_card"]:
+            return []
+        alternates: List[str] = []
+        for skill in details["agent_card"].get("skills") or []:
+            for url in self.registry.candidates(skill.get("id", "")):
+                if url != agent_url and url not in alternates:
+                    alternates.append(url)
+        return alternates
+
+    # ------------------------------ Peer registry ------------------------------
+    async def add_peers(self, agent_urls: Iterable[str]) -> List[str]:
+        """Register statically configured peers and fetch their agent cards.
+
+        Peers whose card cannot be fetched stay registered (and unhealthy) so
+        that later health checks can bring them back.
+
+        Args:
+            agent_urls: Base URLs of the peer agents.
+
+        Returns:
+            List[str]: The URLs whose agent card was fetched successfully.
+        """
+        urls = [url.rstrip("/") for url in agent_urls]
+        for url in urls:
+            self.registry.add(url, source="static")
+        results = await asyncio.gather(
+            *(self.get_agent_card_by_url(url) for url in urls), return_exceptions=True
+        )
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.info("[add_peers] Could not fetch card of %s: %s", url, result)
+        return [
+            url
+            for url, result in zip(urls, results)
+            if not isinstance(result, Exception)
+        ]
+
+    async def discover_onchain_peers(self, addresses: Iterable[str]) -> List[str]:
+        """Resolve wallet *addresses* through the identity registry and add them as peers.
+
+        The domain registered for each address is used as the peer URL.
+
+        Returns:
+            List[str]: The peer URLs that were resolved.
+        """
+        urls = []
+        for address in addresses:
+            try:
+                agent_id, domain, _ = await asyncio.to_thread(
+                    resolve_identity_by_address, address
+                )
+            except Exception as e:
+                logger.info("[discover_onchain_peers] %s not resolved: %s", address, e)
+                continue
+            if agent_id > 0 and domain:
+                self.registry.add(domain, source="onchain")
+                urls.append(domain.rstrip("/"))
+        await self.add_peers(urls)
+        return urls
+
+    async def probe_peers(self, timeout: float = 5.0) -> None:
+        """Probe every registered peer once and update its health stats.
+
+        A probe is a fetch of the peer's agent card, which also keeps the cached
+        card fresh.
+        """
+
+        async def _probe(client: httpx.AsyncClient, url: str) -> None:
+            try:
+                await self._fetch_agent_card(client, url)
+            except Exception as e:
+                logger.debug("[probe_peers] %s failed: %s", url, e)
+
+        async with httpx.AsyncClient(timeout=httpx.Timeout(timeout)) as client:
+            await asyncio.gather(*(_probe(client, url) for url in list(self.all_nodes)))
+
+    def start_health_checks(self, interval: float = 30.0) -> asyncio.Task:
+        """Probe registered peers every *interval* seconds in the running loop."""
+        if self._health_check_task is not None and not self._health_check_task.done():
+            return self._health_check_task
+
+        async def _loop() -> None:
+            while True:
+                await self.probe_peers()
+                await asyncio.sleep(interval)
+
+        self._health_check_task = asyncio.get_running_loop().create_task(_loop())
+        return self._health_check_task
 
-            if isinstance(response, JSONRPCErrorResponse):
-                logger.error("[execute_task] Error response received: %s", response)
-                return "Error: Unable to execute task"
+    def stop_health_checks(self) -> None:
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            self._health_check_task = None
 
-            message_content = response.root.result.status.message
+    def route(self, skill: str) -> Optional[str]:
+        """Return the URL of the fastest healthy peer advertising *skill*.
 
-            logger.info("[execute_task] Task result content: %s", message_content)
+        *skill* matches a skill id, name or tag from the peers' agent cards.
+        Returns ``None`` when no healthy peer advertises it.
+        """
+        return self.registry.route(skill)
+
+    def find_agents(self, **criteria: Optional[str]) -> List[str]:
+        """Return the URLs of known agents whose cards match every criterion.
 
-            return message_content
+        Accepts the keyword arguments of
+        :meth:`isek.node.agent_index.AgentCardIndex.find_agents` (``skill``,
+        ``tag``, ``mode``, ``input_mode``, ``output_mode`` and ``name``).  Only
+        cards already cached by this node are searched.
+        """
+        return self.registry.index.find_agents(**criteria)
 
     def build_server(
         self,
-        app: A2AStarletteApplication,
+        app: Union[A2AStarletteApplication, MultiAgentApplication],
         name: str = "A2A-Agent",
         daemon: bool = False,
     ):
@@ -131,9 +450,9 @@ class Node(ABC):
 
         Parameters
         ----------
-        app : A2AStarletteApplication
-            The Starlette application returned from
-            ``Node.create_agent_a2a_server``.
+        app : A2AStarletteApplication or MultiAgentApplication
+            The application returned from ``Node.create_server`` or
+            ``Node.create_multi_agent_server``.
         name : str, optional
             A human-readable name for the server, only used for logging.
         daemon : bool, default ``False``
@@ -141,33 +460,208 @@ class Node(ABC):
             it in the foreground (blocking call).
         """
 
-        async def _runner():
-            await self.run_server(app, host=self.host, port=self.port, name=name)
-
         if not daemon:
             # Blocking – run the server in the current thread.
-            asyncio.run(_runner())
+            asyncio.run(
+                self.run_server(
+                    app, host=self.host, port=self.port, name=name, uds=self.uds
+                )
+            )
         else:
             # Non-blocking – run the server in a daemonised background thread
             # so that the main thread can still send outbound messages.
-            server_thread = threading.Thread(
-                target=lambda: asyncio.run(_runner()), daemon=True
-            )
-            server_thread.start()
-            logger.info(
-                "A2A server started in daemon thread (name=%s, port=%s)",
-                name,
-                self.port,
+            self.start(app, name=name)
+
+    # -------------------------------- Lifecycle --------------------------------
+    def start(
+        self,
+        app: Union[A2AStarletteApplication, MultiAgentApplication],
+        name: str = "A2A-Agent",
+        p2p: Optional["A2AProtocolV2"] = None,
+        ready_timeout: float = 30.0,
+    ) -> None:
+        """Serve *app* from a background thread until :meth:`stop`.
+
+        Returns once the server accepts connections.  A server still running
+        at interpreter exit is stopped gracefully then.
+
+        Args:
+            app: The application returned by :meth:`create_server`.
+            name: A human-readable name for the server, only used for logging.
+            p2p: The agent's p2p protocol, whose bridge and local transport are
+                closed by :meth:`stop` once inbound work has drained.
+            ready_timeout: Seconds to wait for the server to come up.
+
+        Raises:
+            RuntimeError: If a server is already running, or this one failed
+                to start (e.g. its port is taken).
+        """
+        if self._server_handle is not None:
+            raise RuntimeError(f"Node {self.node_id} is already serving")
+        handle = ServerHandle()
+        handle.p2p = p2p
+
+        def _run() -> None:
+            asyncio.run(
+                self.run_server(
+                    app,
+                    host=self.host,
+                    port=self.port,
+                    name=name,
+                    uds=self.uds,
+                    handle=handle,
+                )
             )
 
+        handle.thread = threading.Thread(
+            target=_run, name=f"a2a-server-{self.port}", daemon=True
+        )
+        handle.thread.start()
+        deadline = time.monotonic() + ready_timeout
+        while not handle.started():
+            if not handle.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"A2A server {name} failed to start on {self.port}")
+            time.sleep(0.02)
+        self._server_handle = handle
+        atexit.register(self.stop)
+        logger.info(
+            "A2A server started in daemon thread (name=%s, port=%s)", name, self.port
+        )
+
+    def stop(self, timeout: float = 30.0) -> bool:
+        """Gracefully stop the server started by :meth:`start`.
+
+        The server stops accepting connections (TCP, Unix socket and
+        in-process dispatch), lets the requests in progress complete, then
+        waits for agent executions that outlive their request.  Whatever is
+        still running *timeout* seconds after the call is cancelled.  Finally
+        the p2p bridge and local transport passed to :meth:`start` are closed
+        and peer health checks stop.
+
+        Returns:
+            bool: Whether everything in flight completed within *timeout*.
+        """
+        handle, self._server_handle = self._server_handle, None
+        if handle is None:
+            return True
+        atexit.unregister(self.stop)
+        deadline = time.monotonic() + timeout
+        handle.drain_deadline = deadline
+        for local_agent in handle.local_agents:
+            local_agents.unregister(local_agent)
+        # Refuse new connections first, so callers fail over, and give the
+        # ones already accepted a moment to send their request: uvicorn's
+        # shutdown closes connections that have not, as idle keep-alives.
+        handle.loop.call_soon_threadsafe(
+            lambda: [listener.close() for listener in handle.server.servers]
+        )
+        time.sleep(min(STOP_ACCEPT_GRACE, timeout))
+        handle.server.config.timeout_graceful_shutdown = max(
+            0.0, deadline - time.monotonic()
+        )
+        handle.server.should_exit = True
+        # Leave a moment for the cancellations past the deadline.
+        handle.thread.join(max(0.0, deadline - time.monotonic()) + 5.0)
+        drained = handle.drained and not handle.thread.is_alive()
+        if handle.p2p is not None:
+            handle.p2p.close()
+        self.stop_health_checks()
+        logger.info(
+            "A2A server on port %s stopped (%s)",
+            self.port,
+            "drained" if drained else "in-flight work cancelled",
+        )
+        return drained
+
+    @contextlib.asynccontextmanager
+    async def serving(
+        self,
+        app: Union[A2AStarletteApplication, MultiAgentApplication],
+        name: str = "A2A-Agent",
+        p2p: Optional["A2AProtocolV2"] = None,
+        stop_timeout: float = 30.0,
+    ) -> AsyncIterator["Node"]:
+        """Async context manager serving *app* for the duration of the block::
+
+            async with node.serving(app):
+                await node.send_message(peer_url, "hello")
+
+        See :meth:`start` and :meth:`stop`.
+        """
+        await asyncio.to_thread(self.start, app, name, p2p)
+        try:
+            yield self
+        finally:
+            await asyncio.to_thread(self.stop, stop_timeout)
+
     @staticmethod
-    def create_server(agent_executor, agent_card: AgentCard) -> A2AStarletteApplication:
+    def create_server(
+        agent_executor,
+        agent_card: AgentCard,
+        profiling: bool = False,
+        profile_token: Optional[str] = None,
+        profile_loopback: bool = False,
+    ) -> A2AStarletteApplication:
         """Create the A2A application and ensure wallet/identity for the agent.
 
         This will:
         - Create or load a wallet scoped to ``agent_card.name``
         - Resolve or register an on-chain identity, if registry settings are provided
+
+        With *profiling* the server also exposes ``GET /admin/profile``, which
+        captures a sampling profile on demand (see
+        :class:`isek.node.profiler.ProfiledA2AApplication`).  Clients must
+        present *profile_token*; without one, the route is served to loopback
+        clients if *profile_loopback* is set.  Without *profiling* nothing is
+        added to the request path.
         """
+        Node._setup_identity(agent_card)
+
+        request_handler = DefaultRequestHandler(
+            agent_executor=ExecutionTracker(agent_executor),
+            task_store=InMemoryTaskStore(),
+        )
+
+        if profiling:
+            return ProfiledA2AApplication(
+                agent_card=agent_card,
+                http_handler=request_handler,
+                profile_token=profile_token,
+                allow_loopback=profile_loopback,
+            )
+        app = A2AStarletteApplication(
+            agent_card=agent_card, http_handler=request_handler
+        )
+        return app
+
+    @staticmethod
+    def create_multi_agent_server(
+        agents: Iterable[tuple] = (),
+        task_store: Optional[SharedTaskStore] = None,
+    ) -> MultiAgentApplication:
+        """Create one application hosting many agents, with their wallets/identities.
+
+        Each agent keeps its card, executor and well-known card endpoint, while
+        the server, its event loop and the task store are shared: a hosted
+        agent costs a request handler rather than a server, a thread and a
+        port.  Agents are served under the path of their card's URL, or at the
+        root of the host names given for them (see
+        :class:`isek.node.multi_agent.MultiAgentApplication`).  Serve the
+        result like any other application, e.g. with :meth:`start`.
+
+        Args:
+            agents: ``(agent_card, agent_executor)`` pairs, optionally followed
+                by the host names routed to the agent.
+            task_store: Task store shared by the agents; a new one by default.
+        """
+        app = MultiAgentApplication(task_store=task_store)
+        for agent_card, agent_executor, *hosts in agents:
+            Node._setup_identity(agent_card)
+            app.add_agent(agent_card, agent_executor, hosts)
+        return app
+
+    @staticmethod
+    def _setup_identity(agent_card: AgentCard) -> None:
         # Ensure wallet + identity, without preventing server startup on failure
         try:
             address, agent_id, tx_hex = ensure_identity(agent_card)
@@ -186,22 +680,34 @@ class Node(ABC):
         except Exception as e:
             logger.info("[create_server] Wallet/identity setup skipped: %s", e)
 
-        request_handler = DefaultRequestHandler(
-            agent_executor=agent_executor, task_store=InMemoryTaskStore()
-        )
-
-        app = A2AStarletteApplication(
-            agent_card=agent_card, http_handler=request_handler
-        )
-        return app
-
     @staticmethod
     async def run_server(
-        app: A2AStarletteApplication,
+        app: Union[A2AStarletteApplication, MultiAgentApplication],
         host: str = "127.0.0.1",
         port: int = 8080,
         name: str = "node",
+        uds: Optional[str] = None,
+        drain_timeout: float = 30.0,
+        handle: Optional[ServerHandle] = None,
     ):
+        """Serve *app* on ``host:port`` and, when *uds* is given, on that Unix
+        socket as well.  The socket is removed when the server stops.
+
+        While it is served, *app* (each of its agents, for a
+        :class:`~isek.node.multi_agent.MultiAgentApplication`) is also
+        registered in :data:`~isek.node.local_dispatch.local_agents` under its
+        URLs, so nodes in this process call it without going through HTTP.
+
+        On shutdown (e.g. SIGTERM) requests in progress get *drain_timeout*
+        seconds to complete, and agent executions still running afterwards
+        as long again, unless the server is being stopped by
+        :meth:`stop`, whose deadline applies."""
+        sockets = None
+        loop = asyncio.get_running_loop()
+        hosted = [
+            (LocalAgent(agent, loop), urls)
+            for agent, urls in hosted_applications(app, host, port)
+        ]
         try:
             config = uvicorn.Config(
                 app.build(),
@@ -209,13 +715,51 @@ class Node(ABC):
                 port=port,
                 log_level="error",
                 loop="asyncio",
+                timeout_graceful_shutdown=drain_timeout,
             )
 
             server = uvicorn.Server(config)
-
+            if handle is not None:
+                handle.server = server
+                handle.loop = loop
+                handle.local_agents = [local_agent for local_agent, _ in hosted]
+
+            if uds:
+                unix_socket = bind_unix_socket(uds)
+                try:
+                    sockets = [config.bind_socket(), unix_socket]
+                except BaseException:
+                    unix_socket.close()
+                    os.unlink(uds)
+                    raise
             log_a2a_api_call(
-                "server.serve()", f"server: {name}, port: {port}, host: {host}"
+                "server.serve()",
+                f"server: {name}, port: {port}, host: {host}"
+                + (f", uds: {uds}" if uds else ""),
+            )
+            for local_agent, urls in hosted:
+                local_agents.register(urls, local_agent)
+            await server.serve(sockets=sockets)
+            for local_agent, _ in hosted:
+                local_agents.unregister(local_agent)
+            if handle is not None and handle.drain_deadline is not None:
+                drain_timeout = max(0.0, handle.drain_deadline - time.monotonic())
+            trackers = [execution_tracker(agent.app) for agent, _ in hosted]
+            drained = all(
+                await asyncio.gather(
+                    *(t.drain(drain_timeout) for t in trackers if t is not None)
+                )
             )
-            await server.serve()
+            if handle is not None:
+                handle.drained = drained
         except Exception as e:
             log_error(f"run_server() error: {e} - name: {name}, port: {port}")
+        finally:
+            for local_agent, _ in hosted:
+                local_agents.unregister(local_agent)
+            # The listening sockets are closed by the server on shutdown.
+            if sockets:
+                try:
+                    os.unlink(uds)
+                except OSError:
+                    pass
@@ -0,0 +1,269 @@
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from a2a.server.apps import A2AStarletteApplication
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from isek.utils.log import log
+
+# Innermost frames of an event loop waiting for I/O or of a thread blocked on a
+# lock or condition; such samples are idle time.
+_IDLE_FILES = ("selectors.py", "threading.py")
+# Upper bounds accepted from the admin route.
+MAX_PROFILE_SECONDS = 300.0
+MIN_INTERVAL = 0.001
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+class RouteTagMiddleware:
+    """ASGI middleware marking which route a stack sample belongs to.
+
+    It only forwards the call: :class:`SamplingProfiler` recognises this
+    method's frame on a sampled stack and reads the request path from its
+    ``scope``, so requests are attributed without any bookkeeping per request.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+
+_ROUTE_TAG_CODE = RouteTagMiddleware.__call__.__code__
+
+
+def _label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfileResult:
+    """Stack samples aggregated by the :class:`SamplingProfiler`.
+
+    :ivar stacks: Folded stack (``thread;outer;...;inner``) -> sample count.
+    :ivar routes: Request path -> samples taken while serving it.
+    :ivar idle: Samples of threads waiting for I/O or blocked; they are folded
+        as ``thread;(idle)``.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.routes: Counter = Counter()
+        self.samples = 0
+        self.idle = 0
+        self.duration = 0.0
+        self.process_cpu = 0.0
+
+    def folded(self) -> str:
+        """Return the stacks in folded format, for flamegraph.pl or speedscope."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def to_dict(self, top: int = 30) -> Dict[str, Any]:
+        busy = self.samples - self.idle
+        # Spread the measured process CPU over the busy samples.
+        cpu_per_sample = self.process_cpu / busy if busy else 0.0
+        return {
+            "duration_s": round(self.duration, 3),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "idle_samples": self.idle,
+            "process_cpu_s": round(self.process_cpu, 3),
+            "routes": {
+                route: {
+                    "samples": count,
+                    "cpu_ms": round(count * cpu_per_sample * 1000, 1),
+                }
+                for route, count in self.routes.most_common()
+            },
+            "top_stacks": [
+                {"stack": stack, "samples": count}
+                for stack, count in self.stacks.most_common(top)
+            ],
+        }
+
+
+class SamplingProfiler:
+    """Time-boxed statistical profiler over every thread of the process.
+
+    A background thread snapshots all Python stacks every *interval* seconds
+    through :func:`sys._current_frames` and aggregates them into folded stacks.
+    Nothing runs between captures, so an idle profiler costs nothing.
+
+    Samples taken while a request is being served (see
+    :class:`RouteTagMiddleware`) are also counted per request path; together
+    with the process CPU time measured over the capture, this gives the CPU
+    time spent per route.  Work an agent does in tasks detached from the
+    request is reported under ``(background)``.
+
+    :param interval: Default seconds between samples.
+    :type interval: float
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def capture(
+        self, seconds: float, interval: Optional[float] = None
+    ) -> ProfileResult:
+        """Sample for *seconds* without blocking the event loop.
+
+        :raises ProfilerBusyError: If a capture is already in progress.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already being captured")
+        try:
+            return await asyncio.to_thread(self._sample, seconds, interval)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: Optional[float]) -> ProfileResult:
+        interval = max(interval or self.interval, MIN_INTERVAL)
+        result = ProfileResult(interval)
+        own_id = threading.get_ident()
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        deadline = started + seconds
+        while True:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._record(result, names.get(thread_id, str(thread_id)), frame)
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+        result.duration = time.perf_counter() - started
+        # Includes the sampler's own overhead, which is small at these rates.
+        result.process_cpu = time.process_time() - cpu_started
+        log.debug(f"Profile captured: {result.samples} samples")
+        return result
+
+    @staticmethod
+    def _record(result: ProfileResult, thread_name: str, frame) -> None:
+        result.samples += 1
+        if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+            result.idle += 1
+            result.stacks[f"{thread_name};(idle)"] += 1
+            return
+        labels = []
+        route = None
+        while frame is not None:
+            code = frame.f_code
+            if code is _ROUTE_TAG_CODE and route is None:
+                scope = frame.f_locals.get("scope") or {}
+                route = f"{scope.get('method', '')} {scope.get('path', '')}".strip()
+            labels.append(_label(code))
+            frame = frame.f_back
+        labels.append(thread_name)
+        result.stacks[";".join(reversed(labels))] += 1
+        result.routes[route or "(background)"] += 1
+
+
+def parse_profile_query(params) -> Tuple[float, Optional[float], str]:
+    """Read ``seconds``, ``interval_ms`` and ``format`` from the admin route's query.
+
+    :raises ValueError: On an out-of-range or unknown value.
+    """
+    seconds = float(params.get("seconds", 10))
+    if not 0 < seconds <= MAX_PROFILE_SECONDS:
+        raise ValueError(f"seconds must be in (0, {MAX_PROFILE_SECONDS:g}]")
+    interval = params.get("interval_ms")
+    interval = float(interval) / 1000 if interval is not None else None
+    if interval is not None and interval < MIN_INTERVAL:
+        raise ValueError(f"interval_ms must be at least {MIN_INTERVAL * 1000:g}")
+    output = params.get("format", "json")
+    if output not in ("json", "folded"):
+        raise ValueError("format must be 'json' or 'folded'")
+    return seconds, interval, output
+
+
+class ProfiledA2AApplication(A2AStarletteApplication):
+    """A2A application exposing ``GET /admin/profile`` for on-demand profiles.
+
+    The route samples the server for ``seconds`` (default 10) every
+    ``interval_ms`` and answers with the summary as JSON, or with the folded
+    stacks as text when ``format=folded``.  With *profile_token* set, every
+    client must send it as ``Authorization: Bearer <token>``; otherwise the
+    route is only served to loopback clients, and only with *allow_loopback*.
+    A reverse proxy on the same host makes every client look local, so prefer
+    the token there.
+
+    :param profile_token: Token clients must present to profile.
+    :type profile_token: Optional[str]
+    :param allow_loopback: Serve loopback clients without a token when no
+        *profile_token* is set.
+    :type allow_loopback: bool
+    :raises ValueError: If neither *profile_token* nor *allow_loopback* is
+        given, so that nobody could use the route.
+    """
+
+    PROFILE_PATH = "/admin/profile"
+
+    def __init__(
+        self,
+        *args,
+        profile_token: Optional[str] = None,
+        allow_loopback: bool = False,
+        **kwargs,
+    ):
+        if not profile_token and not allow_loopback:
+            raise ValueError("Profiling needs a profile_token or allow_loopback")
+        super().__init__(*args, **kwargs)
+        self.profile_token = profile_token
+        self.allow_loopback = allow_loopback
+        self.profiler = SamplingProfiler()
+
+    def routes(self, *args, **kwargs) -> List[Route]:
+        return [
+            *super().routes(*args, **kwargs),
+            Route(self.PROFILE_PATH, self._handle_profile, methods=["GET"]),
+        ]
+
+    def build(self, *args, **kwargs) -> Starlette:
+        app = super().build(*args, **kwargs)
+        app.add_middleware(RouteTagMiddleware)
+        return app
+
+    def _authorized(self, request: Request) -> bool:
+        if self.profile_token:
+            expected = f"Bearer {self.profile_token}"
+            supplied = request.headers.get("authorization", "")
+            return hmac.compare_digest(supplied.encode(), expected.encode())
+        host = request.client.host if request.client else ""
+        return self.allow_loopback and host in ("127.0.0.1", "::1", "localhost")
+
+    async def _handle_profile(self, request: Request) -> Response:
+        if not self._authorized(request):
+            return JSONResponse({"error": "forbidden"}, status_code=403)
+        try:
+            seconds, interval, output = parse_profile_query(request.query_params)
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        try:
+            result = await self.profiler.capture(seconds, interval)
+        except ProfilerBusyError as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+        if output == "folded":
+            return PlainTextResponse(result.folded())
+        return JSONResponse(result.to_dict())
@@ -0,0 +1,167 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from isek.node.agent_index import AgentCardIndex
+
+NodeDetails = Dict[str, Any]
+
+
+class PeerHealth:
+    """Exponentially weighted health statistics for one peer.
+
+    :param alpha: Weight of the newest sample in the moving averages.
+    :type alpha: float
+    """
+
+    def __init__(self, alpha: float = 0.2) -> None:
+        self.alpha: float = alpha
+        self.rtt_ewma: Optional[float] = None  # seconds
+        self.error_rate: float = 0.0
+        self.consecutive_failures: int = 0
+        self.successes: int = 0
+        self.failures: int = 0
+        self.last_seen: Optional[float] = None
+        self.last_checked: Optional[float] = None
+
+    def record_success(self, rtt: float) -> None:
+        """Fold a successful exchange that took *rtt* seconds into the stats."""
+        now = time.time()
+        if self.rtt_ewma is None:
+            self.rtt_ewma = rtt
+        else:
+            self.rtt_ewma += self.alpha * (rtt - self.rtt_ewma)
+        self.error_rate *= 1 - self.alpha
+        self.consecutive_failures = 0
+        self.successes += 1
+        self.last_seen = now
+        self.last_checked = now
+
+    def record_failure(self) -> None:
+        """Fold a failed exchange into the stats."""
+        self.error_rate += self.alpha * (1 - self.error_rate)
+        self.consecutive_failures += 1
+        self.failures += 1
+        self.last_checked = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rtt_ewma": self.rtt_ewma,
+            "error_rate": self.error_rate,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "last_seen": self.last_seen,
+            "last_checked": self.last_checked,
+        }
+
+
+class NodeRegistry:
+    """Registry of known peers, their agent cards and their health.
+
+    Each entry of :attr:`peers` is keyed by the peer's base URL and holds a
+    ``NodeDetails`` dict with the keys ``url``, ``agent_card`` (the card as a
+    JSON dict, or ``None`` until fetched), ``source`` (``"static"``,
+    ``"agent_card"`` or ``"onchain"``) and ``health`` (a :class:`PeerHealth`).
+
+    :param alpha: EWMA weight used for every peer's :class:`PeerHealth`.
+    :type alpha: float
+    :param max_consecutive_failures: Failures in a row after which a peer is unhealthy.
+    :type max_consecutive_failures: int
+    :param max_error_rate: Smoothed error rate above which a peer is unhealthy.
+    :type max_error_rate: float
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        max_consecutive_failures: int = 3,
+        max_error_rate: float = 0.5,
+    ) -> None:
+        self.alpha = alpha
+        self.max_consecutive_failures = max_consecutive_failures
+        self.max_error_rate = max_error_rate
+        self.peers: Dict[str, NodeDetails] = {}
+        # Inverted index over the cached cards, kept in sync by add/remove.
+        self.index: AgentCardIndex = AgentCardIndex()
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        url: str,
+        agent_card: Optional[Dict[str, Any]] = None,
+        source: str = "static",
+    ) -> NodeDetails:
+        """Register *url* (or refresh its card) and return its entry."""
+        url = url.rstrip("/")
+        with self._lock:
+            details = self.peers.get(url)
+            if details is None:
+                details = {
+                    "url": url,
+                    "agent_card": None,
+                    "source": source,
+                    "health": PeerHealth(self.alpha),
+                }
+                self.peers[url] = details
+            if agent_card is not None:
+                details["agent_card"] = agent_card
+                self.index.add(url, agent_card)
+            return details
+
+    def remove(self, url: str) -> None:
+        with self._lock:
+            url = url.rstrip("/")
+            self.peers.pop(url, None)
+            self.index.remove(url)
+
+    def get(self, url: str) -> Optional[NodeDetails]:
+        return self.peers.get(url.rstrip("/"))
+
+    def record_success(self, url: str, rtt: float) -> None:
+        details = self.get(url)
+        if details is not None:
+            details["health"].record_success(rtt)
+
+    def record_failure(self, url: str) -> None:
+        details = self.get(url)
+        if details is not None:
+            details["health"].record_failure()
+
+    def is_healthy(self, url: str) -> bool:
+        details = self.get(url)
+        if details is None:
+            return False
+        health: PeerHealth = details["health"]
+        return (
+            health.consecutive_failures < self.max_consecutive_failures
+            and health.error_rate <= self.max_error_rate
+        )
+
+    def candidates(self, skill: str) -> List[str]:
+        """Return healthy peers advertising *skill*, fastest first.
+
+        *skill* matches a skill id, name or tag (case-insensitively).  Peers
+        without an RTT sample yet sort after every measured peer.
+        """
+        matches = []
+        for url in self.index.find_any(skill):
+            details = self.peers.get(url)
+            if details is None or not self.is_healthy(url):
+                continue
+            rtt = details["health"].rtt_ewma
+            matches.append((rtt is None, rtt or 0.0, url))
+        matches.sort()
+        return [url for _, _, url in matches]
+
+    def route(self, skill: str) -> Optional[str]:
+        """Return the fastest healthy peer advertising *skill*, or ``None``."""
+        candidates = self.candidates(skill)
+        return candidates[0] if candidates else None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return a JSON-serialisable snapshot of every peer's health."""
+        return {
+            url: {**details["health"].to_dict(), "healthy": self.is_healthy(url)}
+            for url, details in list(self.peers.items())
+        }
@@ -0,0 +1,291 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, Sequence, TypeVar
+
+import httpx
+from a2a.client.errors import A2AClientHTTPError
+
+from isek.exceptions import NodeUnavailableError
+from isek.utils.log import log
+
+T = TypeVar("T")
+
+# Failures that happen before the request reaches the peer, so resending
+# cannot execute the task twice.
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Statuses a peer uses to say "not now" without having run the request.
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return whether *exc* is a failure that is safe to retry.
+
+    Only errors raised before the request reached the peer, or explicit
+    overload/unavailable statuses from it, qualify.  Read timeouts and dropped
+    connections are not retried because the peer may already be running the
+    task.
+    """
+    if isinstance(exc, _CONNECT_ERRORS):
+        return True
+    cause = exc.__cause__
+    if isinstance(cause, _CONNECT_ERRORS):
+        return True
+    if isinstance(exc, A2AClientHTTPError):
+        return exc.status_code in RETRYABLE_STATUS_CODES and not isinstance(
+            cause, httpx.RequestError
+        )
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter.
+
+    :param max_attempts: Total attempts, including the first one.
+    :param base_delay: Delay before the first retry, in seconds.
+    :param max_delay: Upper bound of a single delay, in seconds.
+    :param jitter: Fraction of the delay randomly added or removed.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        jitter: float = 0.2,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before retry number *attempt* (1-based)."""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+
+class CircuitBreaker:
+    """Per-target circuit breaker.
+
+    After *failure_threshold* consecutive failures the circuit opens and calls
+    fail fast for *reset_timeout* seconds.  Then a single trial call is let
+    through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def is_open(self) -> bool:
+        """Return whether calls are currently being rejected, without side effects."""
+        return (
+            self.state == self.OPEN
+            and time.monotonic() - self.opened_at < self.reset_timeout
+        )
+
+    def release(self) -> None:
+        """Forget an admitted call that ended without an outcome (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class HedgePolicy:
+    """When to send a duplicate request to a second peer.
+
+    A hedge is sent once the primary call has been running longer than the
+    *percentile* of the target's recent latencies (never earlier than
+    *min_delay*).  Hedging stays off for a target until *min_samples*
+    latencies have been observed.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+    ) -> None:
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+
+
+class ResilientCaller:
+    """Run outbound calls with retries, optional hedging and circuit breaking.
+
+    :param retry: Backoff policy for retryable failures.
+    :param hedge: Hedging policy; ``None`` disables hedged requests.
+    :param failure_threshold: Consecutive failures that open a target's circuit.
+    :param reset_timeout: Seconds an open circuit fails fast before a trial call.
+    """
+
+    def __init__(
+        self,
+        retry: Optional[RetryPolicy] = None,
+        hedge: Optional[HedgePolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.retry = retry or RetryPolicy()
+        self.hedge = hedge
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.retries = 0
+        self.hedges = 0
+
+    def breaker(self, target: str) -> CircuitBreaker:
+        breaker = self.breakers.get(target)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self.breakers[target] = breaker
+        return breaker
+
+    def hedge_delay(self, target: str) -> Optional[float]:
+        """Return how long to wait before hedging a call to *target*, if at all."""
+        samples = self._latencies.get(target)
+        if self.hedge is None or not samples or len(samples) < self.hedge.min_samples:
+            return None
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * self.hedge.percentile / 100))
+        return max(self.hedge.min_delay, ordered[idx])
+
+    async def call(
+        self,
+        target: str,
+        attempt: Callable[[str], Awaitable[T]],
+        hedge_targets: Sequence[str] = (),
+        failover_targets: Sequence[str] = (),
+    ) -> T:
+        """Call ``attempt(target)`` with retries.
+
+        If *target*'s circuit is open the call fails over to the first of
+        *failover_targets* whose circuit is not; if *target* is merely slow,
+        the same call is hedged to the first such target of *hedge_targets*
+        and the first success wins.  Both are empty by default, since sending
+        the call to another peer is the caller's decision.
+
+        :raises NodeUnavailableError: If the chosen target's circuit is open.
+        """
+        if self.breaker(target).is_open():
+            failover = self._first_available(failover_targets, target)
+            if failover is not None:
+                log.debug(
+                    "Circuit for %s is open; failing over to %s", target, failover
+                )
+                return await self._call_with_retries(failover, attempt)
+            return await self._call_with_retries(target, attempt)
+
+        delay = self.hedge_delay(target)
+        alternate = (
+            self._first_available(hedge_targets, target) if delay is not None else None
+        )
+        if alternate is None:
+            return await self._call_with_retries(target, attempt)
+
+        primary = asyncio.ensure_future(self._call_with_retries(target, attempt))
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            # Whatever ends this block, including the caller being cancelled,
+            # no call is left running on its own.
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges += 1
+            log.debug(
+                "Hedging call to %s with %s after %.3fs", target, alternate, delay
+            )
+            pending.add(
+                asyncio.ensure_future(self._call_with_retries(alternate, attempt))
+            )
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _first_available(self, targets: Sequence[str], exclude: str) -> Optional[str]:
+        return next(
+            (t for t in targets if t != exclude and not self.breaker(t).is_open()),
+            None,
+        )
+
+    async def _call_with_retries(
+        self, target: str, attempt: Callable[[str], Awaitable[T]]
+    ) -> T:
+        breaker = self.breaker(target)
+        for n in range(1, self.retry.max_attempts + 1):
+            if not breaker.allow():
+                raise NodeUnavailableError(target, "circuit breaker is open")
+            started = time.perf_counter()
+            try:
+                result = await attempt(target)
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record_failure()
+                if n == self.retry.max_attempts or not is_retryable(e):
+                    raise
+                self.retries += 1
+                delay = self.retry.delay(n)
+                log.debug("Retrying %s in %.3fs after %r", target, delay, e)
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            samples = self._latencies.get(target)
+            if samples is None:
+                window = self.hedge.window if self.hedge else 200
+                samples = self._latencies[target] = deque(maxlen=window)
+            samples.append(time.perf_counter() - started)
+            return result
+        raise AssertionError("unreachable")
@@ -0,0 +1,169 @@
+import os
+import socket
+import ssl
+import stat
+import tempfile
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from isek.utils.log import log
+
+# Hosts for which a URL may be served by a socket on this machine.
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1", "0.0.0.0")
+
+# Agent sockets live in a per-user directory, so they need both Unix sockets
+# and user IDs; elsewhere (Windows) agents are reached over TCP only.
+UNIX_SOCKETS_SUPPORTED = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+_ssl_context: Optional[ssl.SSLContext] = None
+# Result of _private_dir() per directory, so each is checked (and a rejected
+# one reported) once.
+_checked_dirs: Dict[str, bool] = {}
+
+
+def _shared_ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle dominates the cost of a fresh transport; sockets
+    # are plain HTTP in practice, so one context serves every transport.
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+def _private_dir(path: str) -> bool:
+    """Create *path* if missing and return whether it is a directory only this
+    user can reach: owned by them, mode 0700, not a symlink."""
+    if path in _checked_dirs:
+        return _checked_dirs[path]
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+    except OSError as e:
+        log.warning(f"Agent socket directory {path} unusable ({e}); using TCP")
+        st = None
+    private = (
+        st is not None
+        and stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and stat.S_IMODE(st.st_mode) == 0o700
+    )
+    if st is not None and not private:
+        # Someone else could plant sockets there and intercept local calls.
+        log.warning(
+            f"Agent socket directory {path} is not private to this user "
+            "(owner and mode 0700 required); using TCP"
+        )
+    _checked_dirs[path] = private
+    return private
+
+
+def agent_socket_dir() -> Optional[str]:
+    """Directory holding the agents' sockets: ``$ISEK_AGENT_SOCKET_DIR`` or a
+    per-user directory in the system temp dir.
+
+    The directory is created if missing.  Returns ``None``, leaving agents on
+    TCP, where agent sockets are not supported or the directory is not
+    private to this user (owned by them with mode 0700), since anyone able to
+    write to it could impersonate local agents.
+    """
+    if not UNIX_SOCKETS_SUPPORTED:
+        return None
+    path = os.getenv("ISEK_AGENT_SOCKET_DIR") or os.path.join(
+        tempfile.gettempdir(), f"isek-agents-{os.getuid()}"
+    )
+    return path if _private_dir(path) else None
+
+
+def agent_socket_path(port: int) -> Optional[str]:
+    """Conventional socket of the agent serving HTTP on *port*, or ``None``
+    where agent sockets are not available (see :func:`agent_socket_dir`).
+
+    Naming the socket after the port lets a client holding only the agent's URL
+    (or a bridge holding only its port) find it without further configuration.
+    """
+    directory = agent_socket_dir()
+    return os.path.join(directory, f"agent-{port}.sock") if directory else None
+
+
+def local_socket_for(url: str) -> Optional[str]:
+    """Return the socket serving *url* if it is a loopback URL whose agent
+    listens on its conventional socket, else ``None``."""
+    parts = urlsplit(url)
+    if parts.hostname not in LOOPBACK_HOSTS:
+        return None
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        return None
+    path = agent_socket_path(port)
+    if path is None:
+        return None
+    try:
+        return path if stat.S_ISSOCK(os.stat(path).st_mode) else None
+    except OSError:
+        return None
+
+
+def bind_unix_socket(path: str) -> socket.socket:
+    """Bind a listening-ready Unix socket at *path*, accessible to this user only.
+
+    A socket file left behind by a server that died is replaced; one that
+    still accepts connections is not.
+
+    :raises OSError: If another server is listening on *path*.
+    """
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            log.debug(f"Removing stale socket {path}")
+            os.unlink(path)
+        else:
+            raise OSError(f"Another server is listening on {path}")
+        finally:
+            probe.close()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        os.chmod(path, 0o600)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class UnixSocketTransport(httpx.AsyncBaseTransport):
+    """httpx transport sending requests over a local agent's Unix socket.
+
+    The request URL is left untouched, so the agent sees the same ``Host`` and
+    path as over TCP.  A request whose socket cannot be connected (the agent
+    is not serving on it, or exited without removing it) is sent over TCP
+    instead; connecting to a dead socket fails immediately, so the fallback
+    costs next to nothing.
+
+    :param path: The agent's socket.
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._unix = httpx.AsyncHTTPTransport(uds=path, verify=_shared_ssl_context())
+        self._tcp: Optional[httpx.AsyncHTTPTransport] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            return await self._unix.handle_async_request(request)
+        except httpx.ConnectError as e:
+            if self._tcp is None:
+                log.debug(f"Socket {self.path} unusable ({e}), falling back to TCP")
+                self._tcp = httpx.AsyncHTTPTransport(verify=_shared_ssl_context())
+        return await self._tcp.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._unix.aclose()
+        if self._tcp is not None:
+            await self._tcp.aclose()
@@ -4,15 +4,32 @@ import os
 import subprocess
 import threading
 import time
-import urllib
-from typing import Any, Optional
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Sequence, Union
 
 import httpx
 
 from uuid import uuid4
 
+from isek.exceptions import BridgeUnavailableError
+from isek.node.unix_socket import agent_socket_dir, agent_socket_path
+from isek.protocol.bridge_supervisor import BridgeSupervisor
+from isek.protocol.local_transport import (
+    PEER_GONE_ERRORS,
+    LocalPeerClient,
+    LocalPeerDirectory,
+    LocalPeerServer,
+)
+from isek.protocol.sse import aiter_sse
 from isek.utils.log import log
 
+# Compression codecs understood by the bridge's compact framing (framing.js).
+FRAME_COMPRESSIONS = ("none", "gzip", "brotli")
+# Seconds a restarted bridge gets to expose its peer_id and p2p_address.
+BRIDGE_READY_TIMEOUT = 60.0
+# Failures meaning the bridge itself is unreachable or died mid-request.
+_BRIDGE_CONNECTION_ERRORS = (httpx.NetworkError, httpx.RemoteProtocolError)
+
 
 class A2AProtocolV2:
     """
@@ -22,6 +39,45 @@ class A2AProtocolV2:
     - Spawn the Node.js p2p bridge (`p2p_server.js`).
     - Send JSON-RPC messages via the local p2p bridge to a remote peer.
     - Expose discovered p2p `peer_id` and `p2p_address`.
+
+    The bridge reaches remote peers through a circuit relay: the one at
+    `relay_ip` (port 9090) with `relay_peer_id`, or any of `relays`, a list of
+    relay multiaddrs (`/ip4/<ip>/tcp/<port>/ws/p2p/<relay peer id>`, see
+    `isek run relay --count`). With several relays the bridge reserves a
+    circuit address on each and tries them per call in order of measured RTT,
+    so one relay going down or filling up does not cut the agent off.
+
+    Bridges exchange payloads over a compact framing protocol, negotiated per
+    stream, that forwards the JSON-RPC bytes untouched. Compression is opt-in:
+    with `frame_compression` set to "gzip" or "brotli" (default "none"),
+    payloads from `compress_threshold` bytes on are compressed. Bridges that
+    only speak the legacy JSON protocol still work.
+
+    With `direct_upgrade`, the bridge opens a direct WebRTC connection to a
+    peer after the first exchange relayed through the relay, and routes later
+    calls to that peer over it. `peer_stats` reports the transport in use.
+
+    With `local_registry_dir`, agents on the same host that share the
+    directory reach each other over a Unix domain socket named after their
+    peer ID, skipping both bridges and the relay (see `local_transport`).
+
+    With `shared_bridge` (a Unix socket path), agents on a host share one
+    bridge process instead of spawning one each: the first agent starts it in
+    `--shared` mode, and every agent attaches to it with its own libp2p
+    identity. The bridge exits once the last agent has detached. It accepts
+    attachments only from this host, and only an `agent_socket` inside the
+    agents' socket directory (see `isek.node.unix_socket.agent_socket_dir`).
+
+    The bridge keeps each agent's libp2p key and the peers it has talked to in
+    `p2p_data_dir` (else `$ISEK_P2P_DATA_DIR`, else `~/.isek/p2p`), created
+    readable by the current user only, so a restarted agent keeps its peer ID
+    and redials known peers straight away.
+
+    The bridge forwards inbound calls to the agent over `agent_socket`, the
+    Unix socket the agent's server also listens on (by default the one
+    `Node(uds=True)` binds for `port`), and over TCP while nothing listens
+    there. Pass `agent_socket=False` to always use TCP, as the bridge does on
+    platforms without agent sockets.
     """
 
     def __init__(
@@ -33,11 +89,22 @@ class A2AProtocolV2:
         p2p_server_port: int = 9000,
         relay_ip: str = "",
         relay_peer_id: str = "",
+        relays: Optional[Sequence[str]] = None,
+        frame_compression: str = "none",
+        compress_threshold: int = 1024,
+        direct_upgrade: bool = True,
+        local_registry_dir: Optional[str] = None,
+        shared_bridge: Optional[str] = None,
+        supervise: bool = True,
+        p2p_data_dir: Optional[str] = None,
+        agent_socket: Union[bool, str] = True,
     ) -> None:
         if not isinstance(port, int) or not (0 < port < 65536):
             raise ValueError(f"Invalid agent port: {port}")
         if not isinstance(p2p_server_port, int) or not (0 < p2p_server_port < 65536):
             raise ValueError(f"Invalid p2p server port: {p2p_server_port}")
+        if frame_compression not in FRAME_COMPRESSIONS:
+            raise ValueError(f"Invalid frame compression: {frame_compression}")
 
         self.host = host
         self.port = port
@@ -45,18 +112,53 @@ class A2AProtocolV2:
         self.p2p_server_port = p2p_server_port
         self.relay_ip = relay_ip
         self.relay_peer_id = relay_peer_id
+        self.relays: List[str] = list(relays or [])
+        self.frame_compression = frame_compression
+        self.compress_threshold = compress_threshold
+        self.direct_upgrade = direct_upgrade
 
         self.peer_id: Optional[str] = None
         self.p2p_address: Optional[str] = None
+        # Circuit addresses on every relay holding a reservation, fastest first.
+        self.p2p_addresses: List[str] = []
 
         self._p2p_process: Optional[subprocess.Popen] = None
         self._p2p_stdout_thread: Optional[threading.Thread] = None
 
+        self.local_directory: Optional[LocalPeerDirectory] = (
+            LocalPeerDirectory(local_registry_dir) if local_registry_dir else None
+        )
+        self._local_client: Optional[LocalPeerClient] = (
+            LocalPeerClient(self.local_directory) if self.local_directory else None
+        )
+        self._local_server: Optional[LocalPeerServer] = None
+
+        self.shared_bridge = shared_bridge
+        self._bridge_client: Optional[httpx.Client] = None
+
+        self.supervise = supervise
+        self._supervisor: Optional[BridgeSupervisor] = None
+
+        self.p2p_data_dir = (
+            p2p_data_dir
+            or os.getenv("ISEK_P2P_DATA_DIR")
+            or str(Path.home() / ".isek" / "p2p")
+        )
+
+        # Unix socket of the agent; True for the one `Node(uds=True)` serves.
+        self.agent_socket: Optional[str] = (
+            agent_socket_path(port) if agent_socket is True else agent_socket or None
+        )
+
     # ----------------------------- P2P bootstrap -----------------------------
     def start_p2p_server(self, wait_until_ready: bool = True) -> None:
         """
         Start the Node.js p2p bridge process. If `wait_until_ready` is True,
         block until the bridge exposes a valid `peer_id` and `p2p_address`.
+
+        With `supervise` (and `wait_until_ready`), a supervisor then watches
+        the bridge and restarts it with backoff if it dies; see
+        `bridge_metrics`.
         """
         if not self.p2p_enabled:
             log.debug("p2p disabled; skipping p2p server startup")
@@ -67,7 +169,59 @@ class A2AProtocolV2:
 
         if not os.path.exists(p2p_file_path):
             raise FileNotFoundError(f"p2p_server.js not found at {p2p_file_path}")
+        # The directory holds the agent's private libp2p key.
+        os.makedirs(self.p2p_data_dir, mode=0o700, exist_ok=True)
+
+        if self.shared_bridge:
+            self._attach_shared_bridge(p2p_file_path)
+            atexit.register(self.stop_p2p_server)
+        else:
+            self._spawn_bridge(p2p_file_path)
+            atexit.register(self.stop_p2p_server)
+            if not wait_until_ready:
+                return
+            self._wait_until_ready()
+
+        if self.local_directory is not None:
+            self.start_local_transport()
+
+        if self.supervise and self._supervisor is None:
+            self._supervisor = BridgeSupervisor(
+                f"p2p_server[port:{self.p2p_server_port}]",
+                start=lambda: self._restart_bridge(p2p_file_path),
+                check=self._check_bridge,
+            )
+            self._supervisor.start()
+
+    def stop_p2p_server(self) -> None:
+        """Stop supervising and terminate (or detach from) the p2p bridge."""
+        if self._supervisor is not None:
+            self._supervisor.stop()
+        if self.shared_bridge:
+            self._detach_shared_bridge()
+        elif self._p2p_process and self._p2p_process.poll() is None:
+            self._p2p_process.terminate()
+            log.debug(f"p2p_server[port:{self.p2p_server_port}] process terminated")
 
+    def close(self) -> None:
+        """Stop the bridge and the local transport and close the bridge client."""
+        self.stop_p2p_server()
+        self.stop_local_transport()
+        if self._bridge_client is not None:
+            self._bridge_client.close()
+            self._bridge_client = None
+
+    def bridge_metrics(self) -> dict[str, Any]:
+        """
+        Return the bridge supervisor's metrics: `state` ("up", "down" or
+        "stopped"), `crashes`, `restarts`, `failed_restarts`, `last_error`,
+        `uptime`, `current_downtime` and `total_downtime` (seconds).
+        """
+        if self._supervisor is None:
+            return {"state": "unsupervised"}
+        return self._supervisor.metrics()
+
+    def _spawn_bridge(self, p2p_file_path: str) -> None:
         # Spawn node process
         process = subprocess.Popen(
             [
@@ -75,8 +229,8 @@ class A2AProtocolV2:
                 p2p_file_path,
                 f"--port={self.p2p_server_port}",
                 f"--agent_port={self.port}",
-                f"--relay_ip={self.relay_ip}",
-                f"--relay_peer_id={self.relay_peer_id}",
+                *self._agent_socket_options(),
+                *self._bridge_options(),
             ],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
@@ -86,13 +240,6 @@ class A2AProtocolV2:
 
         self._p2p_process = process
 
-        def _cleanup() -> None:
-            if self._p2p_process and self._p2p_process.poll() is None:
-                self._p2p_process.terminate()
-            log.debug(f"p2p_server[port:{self.p2p_server_port}] process terminated")
-
-        atexit.register(_cleanup)
-
         # Stream output in background for visibility
         def _stream_output(stream) -> None:
             for line in iter(stream.readline, ""):
@@ -104,10 +251,10 @@ class A2AProtocolV2:
         stdout_thread.start()
         self._p2p_stdout_thread = stdout_thread
 
-        if not wait_until_ready:
-            return
-
+    def _wait_until_ready(self, timeout: Optional[float] = None) -> None:
         # Wait for the bridge to be ready and expose context
+        process = self._p2p_process
+        deadline = None if timeout is None else time.monotonic() + timeout
         while True:
             if process.poll() is not None:
                 raise RuntimeError(
@@ -118,17 +265,172 @@ class A2AProtocolV2:
             if context and self.peer_id and self.p2p_address:
                 log.debug(f"p2p ready: {context}")
                 break
+            if deadline is not None and time.monotonic() > deadline:
+                process.terminate()
+                raise RuntimeError(f"p2p_server not ready after {timeout:.0f}s")
             time.sleep(1)
 
+    def _restart_bridge(self, p2p_file_path: str) -> None:
+        previous_peer_id = self.peer_id
+        if self.shared_bridge:
+            self._attach_shared_bridge(p2p_file_path)
+        else:
+            self._spawn_bridge(p2p_file_path)
+            self._wait_until_ready(timeout=BRIDGE_READY_TIMEOUT)
+        if self._local_server is not None and self.peer_id != previous_peer_id:
+            # The local socket is named after the peer ID.
+            self._local_server.stop()
+            self._local_server = None
+            self.start_local_transport()
+
+    def _check_bridge(self, timeout: float) -> bool:
+        if self.shared_bridge:
+            time.sleep(timeout)
+            return self._shared_bridge_alive()
+        try:
+            self._p2p_process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return True
+        log.warning(
+            f"p2p_server[port:{self.p2p_server_port}] exited with code "
+            f"{self._p2p_process.returncode}"
+        )
+        return False
+
+    def _ensure_bridge(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.ensure_available()
+
+    def _bridge_failed(self, error: httpx.HTTPError) -> BridgeUnavailableError:
+        """Translate a connection-level failure talking to the bridge."""
+        if self._supervisor is not None:
+            self._supervisor.report_failure(error)
+        return BridgeUnavailableError(
+            f"p2p_server[port:{self.p2p_server_port}]",
+            f"lost connection to the p2p bridge: {error!r}",
+        )
+
+    def _bridge_options(self) -> list[str]:
+        if self.relays:
+            relay_options = [f"--relays={','.join(self.relays)}"]
+        else:
+            relay_options = [
+                f"--relay_ip={self.relay_ip}",
+                f"--relay_peer_id={self.relay_peer_id}",
+            ]
+        return [
+            *relay_options,
+            f"--compress={self.frame_compression}",
+            f"--compress_threshold={self.compress_threshold}",
+            f"--direct_upgrade={'true' if self.direct_upgrade else 'false'}",
+            f"--data_dir={self.p2p_data_dir}",
+        ]
+
+    def _shared_bridge_options(self) -> list[str]:
+        # Without it the shared bridge accepts no agent sockets.
+        socket_dir = agent_socket_dir()
+        return [f"--agent_socket_dir={socket_dir}"] if socket_dir else []
+
+    def _agent_socket_options(self) -> list[str]:
+        return [f"--agent_socket={self.agent_socket}"] if self.agent_socket else []
+
+    def _attach_shared_bridge(self, p2p_file_path: str) -> None:
+        """
+        Attach this agent to the shared bridge, starting the bridge first if
+        nobody has. A lock file serialises concurrent starts on the host.
+        """
+        # POSIX only, like the Unix socket the shared bridge listens on.
+        import fcntl
+
+        with open(f"{self.shared_bridge}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if not self._shared_bridge_alive():
+                # The bridge outlives this agent, so it logs to a file rather
+                # than to a pipe owned by this process.
+                with open(f"{self.shared_bridge}.log", "a") as log_file:
+                    subprocess.Popen(
+                        [
+                            "node",
+                            p2p_file_path,
+                            "--shared",
+                            f"--socket={self.shared_bridge}",
+                            *self._shared_bridge_options(),
+                            *self._bridge_options(),
+                        ],
+                        stdout=log_file,
+                        stderr=subprocess.STDOUT,
+                        start_new_session=True,
+                    )
+                deadline = time.monotonic() + 30.0
+                while not self._shared_bridge_alive():
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(
+                            f"Shared p2p bridge did not start on {self.shared_bridge}"
+                        )
+                    time.sleep(0.1)
+                log.debug(f"Started shared p2p bridge on {self.shared_bridge}")
+
+        params: dict[str, Any] = {"agent_port": self.port}
+        if self.agent_socket:
+            params["agent_socket"] = self.agent_socket
+        response = self._bridge().post("/agents", params=params, timeout=60.0)
+        response.raise_for_status()
+        context = response.json()
+        self.peer_id = context.get("peer_id")
+        self.p2p_address = context.get("p2p_address")
+        self.p2p_addresses = context.get("p2p_addresses") or []
+        log.debug(f"Attached to shared p2p bridge: {context}")
+
+    def _shared_bridge_alive(self) -> bool:
+        try:
+            return self._bridge().get("/agents", timeout=2.0).is_success
+        except httpx.TransportError:
+            return False
+
+    def _detach_shared_bridge(self) -> None:
+        try:
+            self._bridge().delete("/agents", params={"agent_port": self.port})
+        except httpx.HTTPError:
+            log.debug("Shared p2p bridge already gone")
+
+    def start_local_transport(self) -> None:
+        """
+        Publish this agent in the local registry directory under its peer ID,
+        so co-located peers can reach it without the p2p bridges.
+        """
+        if self.local_directory is None:
+            raise RuntimeError("local_registry_dir is not configured")
+        if not self.peer_id:
+            raise RuntimeError("peer_id is unknown; start the p2p server first")
+        if self._local_server is not None:
+            return
+
+        agent_host = "127.0.0.1" if self.host in ("0.0.0.0", "::", "") else self.host
+        server = LocalPeerServer(
+            self.local_directory.socket_path(self.peer_id),
+            f"http://{agent_host}:{self.port}",
+            agent_socket=self.agent_socket,
+        )
+        server.start()
+        self._local_server = server
+        atexit.register(self.stop_local_transport)
+
+    def stop_local_transport(self) -> None:
+        if self._local_server is not None:
+            self._local_server.stop()
+            self._local_server = None
+        if self._local_client is not None:
+            self._local_client.close()
+
     def _load_p2p_context(self) -> Optional[dict]:
         try:
-            response = httpx.get(
-                f"http://localhost:{self.p2p_server_port}/p2p_context",
-                timeout=5.0,
+            response = self._bridge().get(
+                "/p2p_context", params=self._bridge_params(), timeout=5.0
             )
             response_body = json.loads(response.content)
             self.peer_id = response_body.get("peer_id")
             self.p2p_address = response_body.get("p2p_address")
+            self.p2p_addresses = response_body.get("p2p_addresses") or []
             log.debug(f"_load_p2p_context response[{response_body}]")
             return response_body
         except Exception:
@@ -149,35 +451,165 @@ class A2AProtocolV2:
 
         Returns the full JSON-RPC response body, mirroring standard A2A.
         """
-        # Construct the p2p address using relay information
-        receiver_p2p_address = f"/ip4/{self.relay_ip}/tcp/9090/ws/p2p/{self.relay_peer_id}/p2p-circuit/p2p/{receiver_peer_id}"
-
         request_body = self._build_jsonrpc_send_message_request(sender_node_id, message)
-        response = httpx.post(
-            url=(
-                f"http://localhost:{self.p2p_server_port}/call_peer"
-                f"?p2p_address={urllib.parse.quote(receiver_p2p_address)}"
-            ),
-            json=request_body,
-            headers={"Content-Type": "application/json"},
-            timeout=60.0,
-        )
+        payload = json.dumps(request_body, separators=(",", ":")).encode()
+        if self._local_client is not None and self._local_client.has(receiver_peer_id):
+            try:
+                return json.loads(self._local_client.call(receiver_peer_id, payload))
+            except PEER_GONE_ERRORS:
+                log.debug(f"Local peer {receiver_peer_id} is gone; using p2p bridge")
+
+        self._ensure_bridge()
+        try:
+            response = self._bridge().post(
+                "/call_peer",
+                params=self._bridge_params(receiver_peer_id),
+                content=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=60.0,
+            )
+        except _BRIDGE_CONNECTION_ERRORS as e:
+            raise self._bridge_failed(e) from e
         return json.loads(response.content)
 
+    async def stream_message(
+        self, sender_node_id: str, receiver_peer_id: str, message: str
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Send a JSON-RPC 2.0 'message/stream' request via the local p2p bridge
+        and yield each streamed JSON-RPC response body as it arrives.
+
+        The remote bridge relays the agent's SSE events one frame at a time,
+        so nothing is buffered whole on either side. Peers whose bridge cannot
+        stream answer the request as 'message/send', yielding a single event.
+
+        Args:
+            sender_node_id: ID of the sender node
+            receiver_peer_id: Peer ID of the receiver (not full p2p address)
+            message: Message content to send
+        """
+        request_body = self._build_jsonrpc_send_message_request(
+            sender_node_id, message, method="message/stream"
+        )
+        payload = json.dumps(request_body, separators=(",", ":")).encode()
+        if self._local_client is not None and self._local_client.has(receiver_peer_id):
+            events = self._local_client.stream(receiver_peer_id, payload)
+            try:
+                first = await events.__anext__()
+            except PEER_GONE_ERRORS:
+                log.debug(f"Local peer {receiver_peer_id} is gone; using p2p bridge")
+            except StopAsyncIteration:
+                return
+            else:
+                yield json.loads(first)
+                async for event in events:
+                    yield json.loads(event)
+                return
+
+        self._ensure_bridge()
+        try:
+            async for body in self._stream_via_bridge(receiver_peer_id, payload):
+                yield body
+        except _BRIDGE_CONNECTION_ERRORS as e:
+            raise self._bridge_failed(e) from e
+
+    async def _stream_via_bridge(
+        self, receiver_peer_id: str, payload: bytes
+    ) -> AsyncIterator[dict[str, Any]]:
+        async with httpx.AsyncClient(
+            base_url=self._bridge_base_url(),
+            transport=(
+                httpx.AsyncHTTPTransport(uds=self.shared_bridge)
+                if self.shared_bridge
+                else None
+            ),
+            timeout=httpx.Timeout(60.0, read=None),
+        ) as client:
+            async with client.stream(
+                "POST",
+                "/stream_peer",
+                params=self._bridge_params(receiver_peer_id),
+                content=payload,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "text/event-stream",
+                },
+            ) as response:
+                if not response.headers.get("content-type", "").startswith(
+                    "text/event-stream"
+                ):
+                    yield json.loads(await response.aread())
+                    return
+
+                async for event_type, data in aiter_sse(response):
+                    body = json.loads(data)
+                    if event_type == "error":
+                        raise RuntimeError(
+                            f"p2p stream failed: {body.get('error', body)}"
+                        )
+                    yield body
+
+    def peer_stats(self) -> dict[str, Any]:
+        """
+        Return the bridge's per-peer transport stats, keyed by peer ID.
+
+        Each entry reports the `transport` currently used for the peer
+        ("relay" or "webrtc"), call counts per transport, bytes exchanged,
+        the last call latency and the state of the direct-connection upgrade.
+        """
+        self._ensure_bridge()
+        try:
+            response = self._bridge().get(
+                "/p2p_stats", params=self._bridge_params(), timeout=5.0
+            )
+        except _BRIDGE_CONNECTION_ERRORS as e:
+            raise self._bridge_failed(e) from e
+        response.raise_for_status()
+        return response.json().get("peers", {})
+
     # no HTTP direct method; this helper is p2p-only by design
 
     # ------------------------------- Utilities -------------------------------
+    def _bridge_base_url(self) -> str:
+        if self.shared_bridge:
+            return "http://p2p-bridge"
+        return f"http://localhost:{self.p2p_server_port}"
+
+    def _bridge(self) -> httpx.Client:
+        """Keep-alive HTTP client for the bridge (over its socket when shared)."""
+        if self._bridge_client is None:
+            self._bridge_client = httpx.Client(
+                base_url=self._bridge_base_url(),
+                transport=(
+                    httpx.HTTPTransport(uds=self.shared_bridge)
+                    if self.shared_bridge
+                    else None
+                ),
+            )
+        return self._bridge_client
+
+    def _bridge_params(self, receiver_peer_id: Optional[str] = None) -> dict[str, Any]:
+        params: dict[str, Any] = {}
+        if receiver_peer_id is not None:
+            # The bridge picks the relay circuit(s) to reach the peer through.
+            params["peer_id"] = receiver_peer_id
+        if self.shared_bridge:
+            # Selects which of the shared bridge's identities sends the call.
+            params["agent_port"] = self.port
+        return params
+
     @staticmethod
     def _build_jsonrpc_send_message_request(
-        sender_node_id: str, message: str
+        sender_node_id: str, message: str, method: str = "message/send"
     ) -> dict[str, Any]:
         """
-        Build a JSON-RPC 2.0 request body aligned with SendMessageRequest.
+        Build a JSON-RPC 2.0 request body aligned with SendMessageRequest
+        (or SendStreamingMessageRequest for `method="message/stream"`).
         """
         return {
             "id": uuid4().hex,
             "jsonrpc": "2.0",
-            "method": "message/send",
+            "method": method,
             "params": {
                 "message": {
                     "role": "user",
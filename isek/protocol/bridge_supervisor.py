@@ -0,0 +1,163 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from isek.exceptions import BridgeUnavailableError
+from isek.utils.log import log
+
+
+class BridgeSupervisor:
+    """
+    Watch the p2p bridge and restart it with exponential backoff.
+
+    The supervisor runs in a daemon thread. ``check(timeout)`` should block
+    for up to *timeout* seconds and return ``False`` once the bridge is down;
+    ``start()`` should bring it back and block until it is ready, raising on
+    failure. While the bridge is down :meth:`ensure_available` raises
+    :class:`~isek.exceptions.BridgeUnavailableError` so sends fail fast.
+
+    :param name: Bridge name used in errors and logs.
+    :param start: Restarts the bridge; called from the supervisor thread.
+    :param check: Liveness probe, see above.
+    :param interval: Upper bound of one ``check`` call, in seconds.
+    :param base_delay: Delay before the first restart attempt, in seconds.
+    :param max_delay: Upper bound of the restart delay, in seconds.
+    :param stable_after: Uptime, in seconds, after which the backoff resets.
+    """
+
+    UP = "up"
+    DOWN = "down"
+    STOPPED = "stopped"
+
+    def __init__(
+        self,
+        name: str,
+        start: Callable[[], None],
+        check: Callable[[float], bool],
+        interval: float = 1.0,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        stable_after: float = 60.0,
+    ) -> None:
+        self.name = name
+        self._start = start
+        self._check = check
+        self.interval = interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stable_after = stable_after
+
+        self.state = self.UP
+        self.crashes = 0
+        self.restarts = 0
+        self.failed_restarts = 0
+        self.last_error: Optional[str] = None
+        self.total_downtime = 0.0
+        self._up_since: Optional[float] = time.monotonic()
+        self._down_since: Optional[float] = None
+        self._delay = base_delay
+        self._stop = threading.Event()
+        self._suspect = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start supervising a bridge that is already up."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.name}-supervisor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._suspect.set()
+        with self._lock:
+            self.state = self.STOPPED
+
+    def is_up(self) -> bool:
+        return self.state == self.UP
+
+    def ensure_available(self) -> None:
+        """Raise :class:`BridgeUnavailableError` unless the bridge is up."""
+        if self.state == self.UP:
+            return
+        if self.state == self.STOPPED:
+            raise BridgeUnavailableError(self.name, "p2p bridge is stopped")
+        down_for = time.monotonic() - (self._down_since or time.monotonic())
+        raise BridgeUnavailableError(
+            self.name,
+            f"p2p bridge is down ({self.last_error}); restarting, "
+            f"down for {down_for:.1f}s",
+        )
+
+    def report_failure(self, error: BaseException) -> None:
+        """Ask for an immediate liveness check after a connection-level failure."""
+        log.debug(f"{self.name}: send failed with {error!r}; checking bridge")
+        self._suspect.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            current_downtime = now - self._down_since if self._down_since else 0.0
+            return {
+                "state": self.state,
+                "crashes": self.crashes,
+                "restarts": self.restarts,
+                "failed_restarts": self.failed_restarts,
+                "last_error": self.last_error,
+                "uptime": now - self._up_since if self._up_since else 0.0,
+                "current_downtime": current_downtime,
+                "total_downtime": self.total_downtime + current_downtime,
+            }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.state == self.UP:
+                if self._suspect.is_set():
+                    self._suspect.clear()
+                    alive = self._check(0)
+                else:
+                    alive = self._check(self.interval)
+                if alive or self._stop.is_set():
+                    continue
+                self._mark_down("bridge exited")
+
+            if self._stop.wait(self._delay):
+                break
+            try:
+                self._start()
+            except Exception as e:
+                with self._lock:
+                    self.failed_restarts += 1
+                    self.last_error = str(e) or type(e).__name__
+                self._delay = min(self.max_delay, self._delay * 2)
+                log.warning(
+                    f"{self.name}: restart failed ({e}); retrying in {self._delay:.1f}s"
+                )
+                continue
+            self._mark_up()
+
+    def _mark_down(self, reason: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._up_since is not None and now - self._up_since >= self.stable_after:
+                self._delay = self.base_delay
+            self.state = self.DOWN
+            self.crashes += 1
+            self.last_error = reason
+            self._up_since = None
+            self._down_since = now
+        log.warning(f"{self.name}: {reason}; restarting in {self._delay:.1f}s")
+
+    def _mark_up(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            downtime = now - self._down_since if self._down_since else 0.0
+            self.total_downtime += downtime
+            self.state = self.UP
+            self.restarts += 1
+            self._up_since = now
+            self._down_since = None
+        self._delay = min(self.max_delay, self._delay * 2)
+        log.info(f"{self.name}: restarted after {downtime:.1f}s down")
@@ -0,0 +1,340 @@
+"""
+Unix-domain-socket transport between agents on the same host.
+
+Agents that share a registry directory publish a socket there named after
+their p2p peer ID. A sender that finds ``<directory>/<peer_id>.sock`` talks to
+the peer over it instead of going through both Node.js bridges and the relay.
+
+Wire format, in both directions: a 4-byte big-endian length followed by that
+many bytes. A request frame starts with one kind byte (``CALL`` or ``STREAM``)
+followed by the JSON-RPC request. A ``CALL`` is answered with one frame holding
+the JSON-RPC response; a ``STREAM`` with one frame per SSE event, terminated by
+an empty frame. Connections are persistent and carry one request at a time.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from isek.node.unix_socket import UnixSocketTransport
+from isek.protocol.sse import aiter_sse
+from isek.utils.log import log
+
+CALL = b"\x00"
+STREAM = b"\x01"
+
+_LENGTH = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+# Errors meaning nobody is listening on the socket (stale registry entry).
+PEER_GONE_ERRORS = (FileNotFoundError, ConnectionRefusedError)
+
+
+def _frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _internal_error(message: str) -> bytes:
+    return json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32603, "message": f"Local agent error: {message}"},
+        }
+    ).encode()
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionResetError("Local peer closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (length,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    return _recv_exactly(sock, length)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {length} bytes exceeds the limit")
+    return await reader.readexactly(length)
+
+
+class LocalPeerDirectory:
+    """
+    Registry directory of same-host peers: one socket per peer ID.
+
+    Args:
+        path: Directory shared by the co-located agents; created if missing.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def socket_path(self, peer_id: str) -> str:
+        return os.path.join(self.path, f"{peer_id}.sock")
+
+    def has(self, peer_id: str) -> bool:
+        return os.path.exists(self.socket_path(peer_id))
+
+    def peers(self) -> List[str]:
+        return sorted(
+            name[: -len(".sock")]
+            for name in os.listdir(self.path)
+            if name.endswith(".sock")
+        )
+
+    def discard(self, peer_id: str) -> None:
+        """Remove a stale socket left behind by a peer that is gone."""
+        try:
+            os.unlink(self.socket_path(peer_id))
+        except FileNotFoundError:
+            pass
+
+
+class LocalPeerServer:
+    """
+    Serve an agent's A2A endpoint on a Unix socket in a background thread.
+
+    Requests are forwarded to *agent_url* over one keep-alive HTTP client.
+
+    Args:
+        socket_path: Where to bind the socket.
+        agent_url: Base URL of the local A2A server, e.g. ``http://127.0.0.1:8080``.
+        agent_socket: Unix socket the A2A server also listens on (see
+            ``Node(uds=...)``); used instead of TCP while it accepts connections.
+    """
+
+    def __init__(
+        self, socket_path: str, agent_url: str, agent_socket: Optional[str] = None
+    ) -> None:
+        self.socket_path = socket_path
+        self.agent_url = agent_url.rstrip("/") + "/"
+        self.agent_socket = agent_socket
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=10.0)
+        if self._server is None:
+            raise RuntimeError(f"Failed to listen on {self.socket_path}")
+
+    def stop(self) -> None:
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except Exception:
+            log.exception(f"Local transport on {self.socket_path} failed")
+        finally:
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if os.path.exists(self.socket_path):
+            # A previous run of this peer did not clean up.
+            os.unlink(self.socket_path)
+        transport = (
+            UnixSocketTransport(self.agent_socket) if self.agent_socket else None
+        )
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, read=None), transport=transport
+        ) as client:
+            self._client = client
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=self.socket_path, limit=2**20
+            )
+            log.debug(f"Local transport listening on {self.socket_path}")
+            self._ready.set()
+            async with self._server:
+                try:
+                    await self._server.serve_forever()
+                except asyncio.CancelledError:
+                    pass
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    return
+                kind, payload = request[:1], request[1:]
+                if kind == STREAM:
+                    await self._stream(payload, writer)
+                else:
+                    writer.write(_frame(await self._call(payload)))
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            log.debug(f"Local transport connection dropped: {e}")
+        except asyncio.CancelledError:
+            # Server shutting down with the connection still open.
+            pass
+        finally:
+            writer.close()
+
+    async def _call(self, payload: bytes) -> bytes:
+        try:
+            response = await self._client.post(
+                self.agent_url,
+                content=payload,
+                headers={"Content-Type": "application/json"},
+            )
+        except httpx.HTTPError as e:
+            log.warning(f"Local agent at {self.agent_url} unreachable: {e}")
+            return _internal_error(str(e))
+        return response.content
+
+    async def _stream(self, payload: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            await self._relay_stream(payload, writer)
+        except httpx.HTTPError as e:
+            log.warning(f"Local agent stream from {self.agent_url} failed: {e}")
+            writer.write(_frame(_internal_error(str(e))))
+        writer.write(_frame(b""))
+
+    async def _relay_stream(self, payload: bytes, writer: asyncio.StreamWriter) -> None:
+        async with self._client.stream(
+            "POST",
+            self.agent_url,
+            content=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+            },
+        ) as response:
+            if not response.headers.get("content-type", "").startswith(
+                "text/event-stream"
+            ):
+                writer.write(_frame(await response.aread()))
+            else:
+                async for _, data in aiter_sse(response):
+                    writer.write(_frame(data.encode()))
+                    await writer.drain()
+
+
+class LocalPeerClient:
+    """
+    Client side of the local transport, pooling one socket per idle call.
+
+    Args:
+        directory: Registry directory to resolve peer IDs in.
+        timeout: Socket timeout, in seconds, for blocking calls.
+    """
+
+    def __init__(self, directory: LocalPeerDirectory, timeout: float = 60.0) -> None:
+        self.directory = directory
+        self.timeout = timeout
+        self._idle: Dict[str, List[socket.socket]] = {}
+        self._lock = threading.Lock()
+
+    def has(self, peer_id: str) -> bool:
+        return self.directory.has(peer_id)
+
+    def call(self, peer_id: str, payload: bytes) -> bytes:
+        """
+        Send a JSON-RPC request to *peer_id* and return the raw response.
+
+        Raises one of ``PEER_GONE_ERRORS`` if the peer is not listening, in
+        which case its stale socket has been removed from the directory.
+        """
+        sock = self._pooled(peer_id)
+        reused = sock is not None
+        if sock is None:
+            sock = self._connect(peer_id)
+        try:
+            try:
+                sock.sendall(_frame(CALL + payload))
+                response = _recv_frame(sock)
+            except (BrokenPipeError, ConnectionResetError):
+                if not reused:
+                    raise
+                # Pooled connection closed by the peer (idle, or the peer
+                # restarted) before it answered; retry once on a fresh one.
+                sock.close()
+                sock = self._connect(peer_id)
+                sock.sendall(_frame(CALL + payload))
+                response = _recv_frame(sock)
+        except BaseException:
+            sock.close()
+            raise
+        self._checkin(peer_id, sock)
+        return response
+
+    async def stream(self, peer_id: str, payload: bytes) -> AsyncIterator[bytes]:
+        """Send a ``message/stream`` request and yield each event's JSON bytes."""
+        try:
+            reader, writer = await asyncio.open_unix_connection(
+                self.directory.socket_path(peer_id), limit=2**20
+            )
+        except PEER_GONE_ERRORS:
+            self.directory.discard(peer_id)
+            raise
+        try:
+            writer.write(_frame(STREAM + payload))
+            await writer.drain()
+            while True:
+                event = await _read_frame(reader)
+                if not event:
+                    return
+                yield event
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for sockets in self._idle.values():
+                for sock in sockets:
+                    sock.close()
+            self._idle.clear()
+
+    def _pooled(self, peer_id: str) -> Optional[socket.socket]:
+        with self._lock:
+            sockets = self._idle.get(peer_id)
+            return sockets.pop() if sockets else None
+
+    def _checkin(self, peer_id: str, sock: socket.socket) -> None:
+        with self._lock:
+            self._idle.setdefault(peer_id, []).append(sock)
+
+    def _connect(self, peer_id: str) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.directory.socket_path(peer_id))
+        except PEER_GONE_ERRORS:
+            sock.close()
+            self.directory.discard(peer_id)
+            raise
+        return sock
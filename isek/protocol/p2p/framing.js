@@ -0,0 +1,142 @@
+// Compact framing for bridge-to-bridge messages.
+//
+// The legacy protocol (CHAT_PROTOCOL) sends JSON.stringify({path, body}) and
+// both bridges parse and re-serialise the payload on every hop.  FRAME_PROTOCOL
+// carries the JSON-RPC payload as opaque bytes instead, so bridges pass it
+// through untouched, and compresses it above a size threshold.
+//
+// Frame layout:
+//   byte 0      flags: bits 0-1 compression codec (see CODECS), bits 2-7 reserved
+//   bytes 1-2   big-endian uint16 length of the UTF-8 path (0 for responses)
+//   bytes 3..   path, then payload bytes (JSON, possibly compressed)
+//
+// A streamed response is a sequence of response frames, one per event,
+// terminated by a frame with an empty payload.
+
+import zlib from 'zlib'
+import { promisify } from 'util'
+
+export const FRAME_PROTOCOL = '/isek/a2a-frame/1.0.0'
+
+// Largest payload a frame may carry, compressed or once decompressed: the
+// limit on the wire alone would let a small compressed frame expand without
+// bound.
+export const MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+const brotliCompress = promisify(zlib.brotliCompress)
+const brotliDecompress = promisify(zlib.brotliDecompress)
+const gzip = promisify(zlib.gzip)
+const gunzip = promisify(zlib.gunzip)
+
+export const CODECS = {
+  none: 0,
+  gzip: 1,
+  brotli: 2
+}
+
+const CODEC_MASK = 0b11
+
+// Below this size the synchronous zlib calls are cheaper than a round trip
+// through the libuv thread pool and block the event loop for well under 1ms.
+const SYNC_LIMIT = 256 * 1024
+
+const GZIP_OPTIONS = { level: 3 }
+
+function brotliOptions (size) {
+  return {
+    params: {
+      // Low quality keeps CPU per message small; JSON still shrinks a lot.
+      [zlib.constants.BROTLI_PARAM_QUALITY]: 4,
+      [zlib.constants.BROTLI_PARAM_MODE]: zlib.constants.BROTLI_MODE_TEXT,
+      [zlib.constants.BROTLI_PARAM_SIZE_HINT]: size
+    }
+  }
+}
+
+async function compress (codec, payload) {
+  const sync = payload.length < SYNC_LIMIT
+  switch (codec) {
+    case CODECS.gzip:
+      return sync ? zlib.gzipSync(payload, GZIP_OPTIONS) : gzip(payload, GZIP_OPTIONS)
+    case CODECS.brotli: {
+      const options = brotliOptions(payload.length)
+      return sync ? zlib.brotliCompressSync(payload, options) : brotliCompress(payload, options)
+    }
+    default:
+      return payload
+  }
+}
+
+async function decompress (codec, payload, maxOutputLength) {
+  const sync = payload.length < SYNC_LIMIT
+  const options = { maxOutputLength }
+  try {
+    switch (codec) {
+      case CODECS.none:
+        return payload
+      case CODECS.gzip:
+        return sync ? zlib.gunzipSync(payload, options) : await gunzip(payload, options)
+      case CODECS.brotli:
+        return sync
+          ? zlib.brotliDecompressSync(payload, options)
+          : await brotliDecompress(payload, options)
+      default:
+        throw new Error(`Unknown frame compression codec: ${codec}`)
+    }
+  } catch (err) {
+    if (err.code === 'ERR_BUFFER_TOO_LARGE') {
+      throw new Error(`Decompressed frame exceeds ${maxOutputLength} bytes`)
+    }
+    throw err
+  }
+}
+
+/**
+ * Encode a frame.
+ *
+ * @param {string} path - Handler path ('' for responses).
+ * @param {Uint8Array} payload - Raw JSON bytes.
+ * @param {{codec?: string, threshold?: number}} options - Compression codec
+ *   name and the payload size (bytes) from which it is applied.
+ * @returns {Promise<Buffer>}
+ */
+export async function encodeFrame (path, payload, { codec = 'none', threshold = 1024 } = {}) {
+  const pathBytes = Buffer.from(path || '', 'utf8')
+  let codecId = CODECS[codec] ?? CODECS.none
+  let body = payload
+  if (codecId !== CODECS.none && payload.length >= threshold) {
+    body = await compress(codecId, payload)
+    if (body.length >= payload.length) {
+      // Incompressible payload: send it as-is.
+      codecId = CODECS.none
+      body = payload
+    }
+  } else {
+    codecId = CODECS.none
+  }
+
+  const header = Buffer.allocUnsafe(3)
+  header[0] = codecId & CODEC_MASK
+  header.writeUInt16BE(pathBytes.length, 1)
+  return Buffer.concat([header, pathBytes, body])
+}
+
+/**
+ * Decode a frame produced by encodeFrame.
+ *
+ * @param {Uint8Array} frame
+ * @param {{maxPayload?: number}} options - Largest payload accepted once
+ *   decompressed; a frame expanding past it is rejected.
+ * @returns {Promise<{path: string, payload: Buffer}>}
+ */
+export async function decodeFrame (frame, { maxPayload = MAX_FRAME_BYTES } = {}) {
+  const buf = Buffer.from(frame.buffer, frame.byteOffset, frame.byteLength)
+  if (buf.length < 3) {
+    throw new Error('Truncated frame')
+  }
+  const codecId = buf[0] & CODEC_MASK
+  const pathLength = buf.readUInt16BE(1)
+  const path = buf.subarray(3, 3 + pathLength).toString('utf8')
+  const payload = await decompress(codecId, buf.subarray(3 + pathLength), maxPayload)
+  return { path, payload }
+}
@@ -17,12 +17,18 @@ import {
 } from '@libp2p/crypto/keys'
 
 import { multiaddr, protocols } from '@multiformats/multiaddr'
+import { peerIdFromString } from '@libp2p/peer-id'
+import fs from 'fs';
+import http from 'http';
 import path from 'path';
 import { fileURLToPath } from 'url';
+import { FRAME_PROTOCOL, CODECS, MAX_FRAME_BYTES, encodeFrame, decodeFrame } from './framing.js'
+import { PeerStoreFile } from './peer_store.js'
 
 const WEBRTC_CODE = protocols('webrtc').code
 export const CHAT_PROTOCOL = '/libp2p/examples/chat/1.0.0'
 const QUERY_PATH = '/query'
+const STREAM_PATH = '/stream'
 
 // 从命令行参数读取端口和relay信息
 const args = process.argv.slice(2);
@@ -30,56 +36,275 @@ const portArg = args.find(arg => arg.startsWith('--port='));
 const agentPortArg = args.find(arg => arg.startsWith('--agent_port='));
 const relayIpArg = args.find(arg => arg.startsWith('--relay_ip='));
 const relayPeerIdArg = args.find(arg => arg.startsWith('--relay_peer_id='));
-
-if (!portArg || !agentPortArg || !relayIpArg || !relayPeerIdArg) {
-  console.error(`Usage: node ${process.argv[1]} --port=<port_number> --agent_port=<agent_port_number> --relay_ip=<relay_ip> --relay_peer_id=<relay_peer_id>`);
+const relaysArg = args.find(arg => arg.startsWith('--relays='));
+const relayReservationsArg = args.find(arg => arg.startsWith('--relay_reservations='));
+const compressArg = args.find(arg => arg.startsWith('--compress='));
+const compressThresholdArg = args.find(arg => arg.startsWith('--compress_threshold='));
+const directUpgradeArg = args.find(arg => arg.startsWith('--direct_upgrade='));
+const socketArg = args.find(arg => arg.startsWith('--socket='));
+const idleExitArg = args.find(arg => arg.startsWith('--idle_exit='));
+const dataDirArg = args.find(arg => arg.startsWith('--data_dir='));
+const agentSocketArg = args.find(arg => arg.startsWith('--agent_socket='));
+const agentSocketDirArg = args.find(arg => arg.startsWith('--agent_socket_dir='));
+// 共享模式: 一个网桥进程为多个 agent 各自托管一个 libp2p 身份,
+// agent 通过 POST /agents?agent_port=<port>[&agent_socket=<path>] 注册
+const shared_mode = args.includes('--shared');
+
+const hasRelays = relaysArg || (relayIpArg && relayPeerIdArg);
+if (shared_mode ? (!portArg && !socketArg) || !hasRelays
+                : !portArg || !agentPortArg || !hasRelays) {
+  console.error(`Usage: node ${process.argv[1]} --port=<port_number> --agent_port=<agent_port_number> [--agent_socket=<path>] (--relay_ip=<relay_ip> --relay_peer_id=<relay_peer_id> | --relays=<multiaddr>,...)`);
+  console.error(`       node ${process.argv[1]} --shared (--port=<port_number> | --socket=<path>) (--relay_ip=<relay_ip> --relay_peer_id=<relay_peer_id> | --relays=<multiaddr>,...) [--idle_exit=<seconds>] [--agent_socket_dir=<path>]`);
+  process.exit(1);
+}
+const p2p_server_port = portArg ? parseInt(portArg.split('=')[1], 10) : null;
+const p2p_server_socket = socketArg ? socketArg.split('=')[1] : null;
+const isek_agent_port = agentPortArg ? parseInt(agentPortArg.split('=')[1], 10) : null;
+// agent 同时监听的 Unix socket; 设置后网桥经它而非 localhost TCP 转发请求
+const isek_agent_socket = agentSocketArg ? agentSocketArg.split('=')[1] : null;
+// 共享模式下 agent 注册时提供的 socket 必须位于该目录内; 未设置则不接受
+const agent_socket_dir = agentSocketDirArg ? path.resolve(agentSocketDirArg.split('=')[1]) : null;
+// 共享模式下最后一个 agent 注销后, 空闲多久(秒)退出进程
+const idle_exit_ms = (idleExitArg ? parseFloat(idleExitArg.split('=')[1]) : 30) * 1000;
+// 持久化私钥与已知对端, 使重启后的网桥保持相同 peer id 并立即重连
+const data_dir = dataDirArg ? dataDirArg.split('=')[1] : null;
+// 帧压缩: none | gzip | brotli, 仅对不小于阈值(字节)的负载生效; 默认不压缩
+const frame_options = {
+  codec: compressArg ? compressArg.split('=')[1] : 'none',
+  threshold: compressThresholdArg ? parseInt(compressThresholdArg.split('=')[1], 10) : 1024
+};
+if (!(frame_options.codec in CODECS)) {
+  console.error(`Unknown --compress codec: ${frame_options.codec}`);
   process.exit(1);
 }
-const p2p_server_port = parseInt(portArg.split('=')[1], 10);
-const isek_agent_port = parseInt(agentPortArg.split('=')[1], 10);
-const relay_ip = relayIpArg.split('=')[1];
-const relay_peer_id = relayPeerIdArg.split('=')[1];
+// 首次经 relay 通信成功后, 尝试与对端建立 WebRTC 直连
+const direct_upgrade = directUpgradeArg ? directUpgradeArg.split('=')[1] !== 'false' : true;
 
 // 解决 __dirname 在 ES6 中不可用的问题
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-// 动态构建RELAY_ADDRESS
-const RELAY_ADDRESS = `/ip4/${relay_ip}/tcp/9090/ws/p2p/${relay_peer_id}`
+// relay 列表: --relays 给出完整 multiaddr (逗号分隔), 否则由 --relay_ip/--relay_peer_id 构建
+const RELAY_ADDRESSES = relaysArg
+  ? relaysArg.slice('--relays='.length).split(',').map(a => a.trim()).filter(Boolean)
+  : [`/ip4/${relayIpArg.split('=')[1]}/tcp/9090/ws/p2p/${relayPeerIdArg.split('=')[1]}`]
+const RELAY_PEER_IDS = new Set(RELAY_ADDRESSES.map(a => multiaddr(a).getPeerId()))
+// 在多少个 relay 上预约电路地址, 默认全部
+const relay_reservations = relayReservationsArg
+  ? parseInt(relayReservationsArg.split('=')[1], 10)
+  : RELAY_ADDRESSES.length
+// relay RTT 探测间隔
+const RELAY_PROBE_MS = 30000
+// 流式响应的结束帧(空负载)
+const END_OF_STREAM = await encodeFrame('', Buffer.alloc(0))
+// WebRTC 直连升级: 单次尝试超时与失败后的退避
+const UPGRADE_TIMEOUT_MS = 10000
+const UPGRADE_BACKOFF_MS = 30000
+const MAX_UPGRADE_BACKOFF_MS = 10 * 60 * 1000
+
+function jsonBytes(value) {
+  return Buffer.from(JSON.stringify(value))
+}
+
+// POST `body` to the agent's A2A endpoint over its Unix socket, resolving
+// with {contentType, body} where body is an async iterable of chunks.
+function postOverSocket(socketPath, port, body, headers) {
+  return new Promise((resolve, reject) => {
+    const req = http.request({
+      socketPath,
+      path: '/',
+      method: 'POST',
+      headers: { ...headers, Host: `localhost:${port}`, 'Content-Length': body.length }
+    }, res => resolve({ contentType: res.headers['content-type'] || '', body: res }))
+    req.on('error', reject)
+    req.end(body)
+  })
+}
+
+async function readAll(body) {
+  const chunks = []
+  for await (const chunk of body) {
+    chunks.push(chunk)
+  }
+  return Buffer.concat(chunks)
+}
+
+// Yield the `data` of every event in a text/event-stream body, as bytes.
+async function* sseEvents(body) {
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for await (const chunk of body) {
+    buffer += decoder.decode(chunk, { stream: true }).replace(/\r\n?/g, '\n')
+    let end
+    while ((end = buffer.indexOf('\n\n')) !== -1) {
+      const event = buffer.slice(0, end)
+      buffer = buffer.slice(end + 2)
+      const data = event.split('\n')
+        .filter(line => line.startsWith('data:'))
+        .map(line => line.slice(line.startsWith('data: ') ? 6 : 5))
+        .join('\n')
+      if (data) {
+        yield Buffer.from(data)
+      }
+    }
+  }
+}
+
+// 新身份等待 relay 预约地址的最长时间
+const LISTEN_ADDRESS_TIMEOUT_MS = 15000
+// 启动时重连最近见过的对端数量与单次超时
+const REDIAL_PEERS = 20
+const REDIAL_TIMEOUT_MS = 10000
 
 class P2PNode {
-  constructor(name) {
+  constructor(name, agentPort, agentSocket = null) {
     this.name = name
+    this.agentPort = agentPort
+    this.agentSocket = agentSocket
+    // Key and peer-store files are named after the agent port, so an agent
+    // keeps its peer id across restarts and between shared/dedicated bridges.
+    this.dataName = `agent-${agentPort}`
+    this.knownPeers = data_dir
+      ? new PeerStoreFile(path.join(data_dir, `${this.dataName}.peers.json`))
+      : null
+    // Handlers take and return raw JSON bytes so the compact protocol can
+    // pass payloads through without parsing them.
     this.handlers = {
-      '/query': async (body) => {
+      '/query': async (payload) => {
         try {
-          const response = await fetch(`http://localhost:${isek_agent_port}/`, {
-            method: 'POST',
-            headers: {
-              'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(body)
+          const response = await this.postToAgent(payload, {
+            'Content-Type': 'application/json'
           });
-          return await response.json();
+          return await readAll(response.body);
         } catch (err) {
           console.error('Error:', err);
-          return { received: null, status: 'error', message: err.message };
+          return jsonBytes({ received: null, status: 'error', message: err.message });
         }
       }
     }
+    // Streaming handlers yield a sequence of JSON payloads (bytes); they are
+    // only reachable over the compact protocol.
+    this.streamHandlers = {
+      '/stream': (payload) => this.streamAgent(payload)
+    }
+    // peer id -> per-peer transport stats, see peerStats()
+    this.peers = new Map()
+    // relay multiaddr -> last ping RTT in ms (Infinity when unreachable)
+    this.relayRtt = new Map()
+    this.listenAddresses = []
     this.requestHandler = this.requestHandler.bind(this)
+    this.frameHandler = this.frameHandler.bind(this)
     // this.setup()
   }
 
   async setup() {
     try {
       await this.initP2P()
-      await this.connectToPeer(RELAY_ADDRESS)
+      await this.connectRelays()
+      this.redialKnownPeers()
     } catch (err) {
       console.error('Setup failed:', err)
     }
   }
 
+  // Resolve once the relay reservation gives this node a dialable address.
+  async waitForListenAddress(timeoutMs = LISTEN_ADDRESS_TIMEOUT_MS) {
+    const deadline = Date.now() + timeoutMs
+    while (!this.listenAddress && Date.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, 100))
+    }
+    return this.listenAddress
+  }
+
+  async stop() {
+    clearInterval(this.relayProbe)
+    this.knownPeers?.save()
+    if (this.node) {
+      await this.node.stop()
+    }
+  }
+
+  // Seed libp2p's in-memory peer store with the peers persisted last run.
+  async restoreKnownPeers() {
+    if (!this.knownPeers) {
+      return
+    }
+    for (const [peerId, entry] of this.knownPeers.recent()) {
+      try {
+        await this.node.peerStore.merge(peerIdFromString(peerId), {
+          multiaddrs: entry.addrs.map(addr => multiaddr(addr)),
+          protocols: entry.protocols
+        })
+      } catch (err) {
+        console.error(`Skipping stored peer ${peerId}:`, err.message)
+      }
+    }
+    console.log(`Restored ${this.knownPeers.peers.size} known peers`)
+  }
+
+  // Redial the most recently seen peers in the background, so the first
+  // call after a restart does not pay for connection setup.
+  redialKnownPeers() {
+    if (!this.knownPeers) {
+      return
+    }
+    for (const [peerId, entry] of this.knownPeers.recent(REDIAL_PEERS)) {
+      const addr = entry.addrs.find(a => !a.includes('/webrtc')) || entry.addrs[0]
+      if (!addr || peerId === this.peerId) {
+        continue
+      }
+      this.node.dial(multiaddr(addr), { signal: AbortSignal.timeout(REDIAL_TIMEOUT_MS) })
+        .then(() => console.log(`Redialed known peer ${peerId}`))
+        .catch(err => console.log(`Known peer ${peerId} not reachable: ${err.message}`))
+    }
+  }
+
+  // Connect to every configured relay, then keep their RTTs up to date.
+  async connectRelays() {
+    await Promise.all(RELAY_ADDRESSES.map(addr => this.connectToPeer(addr)))
+    await this.probeRelays()
+    this.relayProbe = setInterval(() => this.probeRelays(), RELAY_PROBE_MS)
+    this.relayProbe.unref()
+  }
+
+  async probeRelays() {
+    await Promise.all(RELAY_ADDRESSES.map(async addr => {
+      try {
+        const rtt = await this.node.services.ping.ping(multiaddr(addr), {
+          signal: AbortSignal.timeout(5000)
+        })
+        this.relayRtt.set(addr, rtt)
+      } catch (err) {
+        this.relayRtt.set(addr, Infinity)
+      }
+    }))
+  }
+
+  relaysByRtt() {
+    const rtt = addr => this.relayRtt.get(addr) ?? Infinity
+    return [...RELAY_ADDRESSES].sort((a, b) => rtt(a) - rtt(b))
+  }
+
+  /**
+   * Circuit addresses to try for `peerId`, fastest relay first.  Relays the
+   * peer is known to hold a reservation on come before the others.
+   */
+  circuitAddresses(peerId) {
+    const known = this.knownPeers?.peers.get(peerId)?.addrs || []
+    const hosting = relay => known.some(a => a.startsWith(`${relay}/p2p-circuit`))
+    const relays = this.relaysByRtt()
+    return [...relays.filter(hosting), ...relays.filter(r => !hosting(r))]
+      .map(relay => `${relay}/p2p-circuit/p2p/${peerId}`)
+  }
+
+  relayStats() {
+    return RELAY_ADDRESSES.map(addr => ({
+      address: addr,
+      rtt_ms: Number.isFinite(this.relayRtt.get(addr)) ? this.relayRtt.get(addr) : null,
+      reserved: this.listenAddresses.some(a => a.startsWith(`${addr}/p2p-circuit`))
+    }))
+  }
+
   registerHandler(path, fn) {
     this.handlers[path] = fn
   }
@@ -89,7 +314,8 @@ class P2PNode {
 
     this.node = await createLibp2p({
       privateKey: privateKey,
-      addresses: { listen: ['/p2p-circuit', '/webrtc'] },
+      // One '/p2p-circuit' entry per relay reservation wanted
+      addresses: { listen: [...Array(relay_reservations).fill('/p2p-circuit'), '/webrtc'] },
       transports: [
         webSockets({ filter: filters.all }),
         webRTC(),
@@ -108,6 +334,17 @@ class P2PNode {
     await this.node.start()
     this.peerId = this.node.peerId.toString()
     console.log(`Libp2p node started, peer id: ${this.peerId}`)
+    await this.restoreKnownPeers()
+
+    this.node.addEventListener('peer:identify', (evt) => {
+      const { peerId, listenAddrs, protocols } = evt.detail
+      if (!RELAY_PEER_IDS.has(peerId.toString())) {
+        this.knownPeers?.remember(peerId.toString(), {
+          addrs: listenAddrs.map(ma => ma.toString()),
+          protocols
+        })
+      }
+    })
 
     this.node.addEventListener('connection:open', () => {
       this.updateConnList()
@@ -116,15 +353,18 @@ class P2PNode {
       this.updateConnList()
     })
     this.node.addEventListener('self:peer:update', () => {
-      this.node.getMultiaddrs().forEach(ma => {
-        if (ma.toString() == `${RELAY_ADDRESS}/p2p-circuit/p2p/${this.peerId}`) {
-          this.listenAddress = ma.toString()
-        }
-        console.log(`Listening on ${ma.toString()}`)
-      })
+      const addrs = this.node.getMultiaddrs().map(ma => ma.toString())
+      addrs.forEach(addr => console.log(`Listening on ${addr}`))
+      this.listenAddresses = this.relaysByRtt()
+        .map(relay => `${relay}/p2p-circuit/p2p/${this.peerId}`)
+        .filter(addr => addrs.includes(addr))
+      if (this.listenAddresses.length > 0) {
+        this.listenAddress = this.listenAddresses[0]
+      }
     })
 
     await this.node.handle(CHAT_PROTOCOL, this.requestHandler, { runOnLimitedConnection: true })
+    await this.node.handle(FRAME_PROTOCOL, this.frameHandler, { runOnLimitedConnection: true })
     return this.node
   }
 
@@ -134,9 +374,16 @@ class P2PNode {
     })
   }
 
+  keyFile() {
+    return data_dir ? path.join(data_dir, `${this.dataName}.key`) : null
+  }
+
   async getOrCreatePeerKey() {
     let privateKey
-    const storedBase64 = null
+    const keyFile = this.keyFile()
+    const storedBase64 = keyFile && fs.existsSync(keyFile)
+      ? fs.readFileSync(keyFile, 'utf8').trim()
+      : null
 
     if (storedBase64) {
       try {
@@ -163,9 +410,67 @@ class P2PNode {
   async savePeerKey(privateKey) {
     const protobufData = await privateKeyToProtobuf(privateKey)
     const base64Data = btoa(String.fromCharCode(...protobufData))
-    console.log(`Stored new private key`)
+    const keyFile = this.keyFile()
+    if (!keyFile) {
+      return
+    }
+    fs.mkdirSync(path.dirname(keyFile), { recursive: true, mode: 0o700 })
+    fs.writeFileSync(keyFile, base64Data, { mode: 0o600 })
+    console.log(`Stored new private key in ${keyFile}`)
+  }
+
+  // Forward a request to the agent, over its Unix socket when it has one.
+  // While nobody listens on the socket (the agent serves TCP only, or has
+  // not started yet) requests go over TCP; the failed connect is immediate.
+  async postToAgent(payload, headers) {
+    if (this.agentSocket) {
+      try {
+        return await postOverSocket(this.agentSocket, this.agentPort, payload, headers)
+      } catch (err) {
+        if (err.code !== 'ENOENT' && err.code !== 'ECONNREFUSED') {
+          throw err
+        }
+        if (!this.agentSocketWarned) {
+          console.error(`Agent socket ${this.agentSocket} unusable (${err.code}), using TCP`)
+          this.agentSocketWarned = true
+        }
+      }
+    }
+    const response = await fetch(`http://localhost:${this.agentPort}/`, {
+      method: 'POST',
+      headers,
+      body: payload
+    })
+    return { contentType: response.headers.get('content-type') || '', body: response.body }
   }
 
+  async* streamAgent(payload) {
+    try {
+      const response = await this.postToAgent(payload, {
+        'Content-Type': 'application/json',
+        'Accept': 'text/event-stream'
+      });
+      if (!response.contentType.startsWith('text/event-stream')) {
+        // e.g. a JSON-RPC error for a rejected request
+        yield await readAll(response.body)
+        return
+      }
+      yield* sseEvents(response.body)
+    } catch (err) {
+      console.error('Error:', err);
+      yield jsonBytes({ received: null, status: 'error', message: err.message })
+    }
+  }
+
+  async dispatch(path, payload) {
+    const handler = this.handlers[path]
+    if (!handler) {
+      return jsonBytes({ error: 'Not Found', status: 404 })
+    }
+    return handler(payload)
+  }
+
+  // Legacy protocol: one JSON document {path, body} per direction.
   async requestHandler({ stream }) {
     try {
       const lp = lpStream(stream)
@@ -174,35 +479,278 @@ class P2PNode {
 
       console.log(`Received request: ${path}`)
 
-      const handler = this.handlers[path]
-      let response
+      const response = await this.dispatch(path, jsonBytes(body))
+      await lp.write(response)
+    } catch (err) {
+      console.error('Request handler error:', err)
+    }
+  }
 
-      if (handler) {
-        response = await handler(body)
-      } else {
-        response = { error: 'Not Found', status: 404 }
+  // Compact protocol: see framing.js.
+  async frameHandler({ stream }) {
+    try {
+      const lp = lpStream(stream, { maxDataLength: MAX_FRAME_BYTES })
+      const { path, payload } = await decodeFrame((await lp.read()).subarray())
+
+      console.log(`Received framed request: ${path} (${payload.length} bytes)`)
+
+      const streamHandler = this.streamHandlers[path]
+      if (streamHandler) {
+        for await (const event of streamHandler(payload)) {
+          await lp.write(await encodeFrame('', event, frame_options))
+        }
+        await lp.write(END_OF_STREAM)
+        return
       }
 
-      await lp.write(new TextEncoder().encode(JSON.stringify(response)))
+      const response = await this.dispatch(path, payload)
+      await lp.write(await encodeFrame('', response, frame_options))
     } catch (err) {
-      console.error('Request handler error:', err)
+      console.error('Frame handler error:', err)
     }
   }
 
-  async callPeer(remoteAddrs, body) {
-    const ma = multiaddr(remoteAddrs)
-    const stream = await this.node.dialProtocol(ma, CHAT_PROTOCOL, { runOnLimitedConnection: true })
-    const lp = lpStream(stream)
+  // Open a protocol stream to the peer, over its direct connection if any,
+  // otherwise through the first of `addrs` that can be dialed.
+  async openStream(addrs, peerId) {
+    const direct = peerId ? this.directConnection(peerId) : null
+    if (direct) {
+      try {
+        const stream = await direct.newStream([FRAME_PROTOCOL, CHAT_PROTOCOL])
+        return { stream, transport: 'webrtc', ma: direct.remoteAddr }
+      } catch (err) {
+        console.error(`Direct stream to ${peerId} failed, using relay:`, err.message)
+      }
+    }
+    let lastError
+    for (const ma of addrs) {
+      try {
+        const stream = await this.node.dialProtocol(ma, [FRAME_PROTOCOL, CHAT_PROTOCOL], { runOnLimitedConnection: true })
+        return { stream, transport: 'relay', ma }
+      } catch (err) {
+        console.error(`Dial ${ma.toString()} failed:`, err.message)
+        lastError = err
+      }
+    }
+    throw lastError
+  }
+
+  // Normalise a p2p address, or a list of alternatives for the same peer.
+  targetAddresses(remoteAddrs) {
+    const addrs = [].concat(remoteAddrs).map(addr => multiaddr(addr))
+    if (addrs.length === 0) {
+      throw new Error('No address to dial')
+    }
+    return { addrs, peerId: addrs[0].getPeerId() }
+  }
+
+  recordCall(ma, peerId, stats, transport, sent, received, started) {
+    if (transport === 'relay') {
+      this.knownPeers?.remember(peerId, { addrs: [ma.toString()] })
+    }
+    stats.calls[transport] += 1
+    stats.bytes_sent += sent
+    stats.bytes_received += received
+    stats.last_latency_ms = Date.now() - started
+    stats.last_call_at = Date.now()
+    if (transport === 'relay') {
+      this.upgradePeer(ma, peerId, stats)
+    }
+  }
+
+  recordFailure(stats, err) {
+    if (stats) {
+      stats.failures += 1
+      stats.last_error = err.message
+    }
+  }
+
+  /**
+   * Send a JSON payload (raw bytes) to a remote bridge and return the raw
+   * JSON reply.  The compact protocol is preferred; peers that only speak
+   * the legacy protocol are answered with plain JSON frames.
+   *
+   * Calls go over a direct WebRTC connection to the peer when one is open,
+   * otherwise through the first of the addresses given (normally relay
+   * circuits, see circuitAddresses()) that can be dialed.  After a
+   * successful relayed call a direct connection is set up in the background
+   * for the following calls.
+   */
+  async callPeer(remoteAddrs, payload) {
+    const { addrs, peerId } = this.targetAddresses(remoteAddrs)
+    const stats = peerId ? this.peerStats(peerId) : null
+    const started = Date.now()
 
-    await lp.write(new TextEncoder().encode(JSON.stringify({ path: QUERY_PATH, body: body })))
+    try {
+      const { stream, transport, ma } = await this.openStream(addrs, peerId)
+      const reply = await this.exchange(stream, payload)
+      if (stats) {
+        this.recordCall(ma, peerId, stats, transport, payload.length, reply.length, started)
+      }
+      return reply
+    } catch (err) {
+      this.recordFailure(stats, err)
+      throw err
+    }
+  }
+
+  /**
+   * Send a `message/stream` JSON-RPC payload to a remote bridge and yield
+   * every event of the agent's response (raw JSON bytes) as it arrives.
+   *
+   * Peers that only speak the legacy protocol cannot stream; the request is
+   * sent to them as `message/send` and its reply is yielded as the only event.
+   * Aborting `signal` tears the stream down, cancelling the call remotely.
+   */
+  async* streamPeer(remoteAddrs, payload, signal) {
+    const { addrs, peerId } = this.targetAddresses(remoteAddrs)
+    const stats = peerId ? this.peerStats(peerId) : null
+    const started = Date.now()
+    let stream
+    let finished = false
+    const onAbort = () => stream?.abort(new Error('Stream cancelled'))
+    signal?.addEventListener('abort', onAbort)
+
+    try {
+      const opened = await this.openStream(addrs, peerId)
+      const ma = opened.ma
+      stream = opened.stream
+      signal?.throwIfAborted()
+
+      if (stream.protocol !== FRAME_PROTOCOL) {
+        const request = JSON.parse(new TextDecoder().decode(payload))
+        const reply = await this.exchange(stream, jsonBytes({ ...request, method: 'message/send' }))
+        finished = true
+        if (stats) {
+          this.recordCall(ma, peerId, stats, opened.transport, payload.length, reply.length, started)
+        }
+        yield reply
+        return
+      }
+
+      const lp = lpStream(stream, { maxDataLength: MAX_FRAME_BYTES })
+      await lp.write(await encodeFrame(STREAM_PATH, payload, frame_options))
+      let received = 0
+      while (true) {
+        const { payload: event } = await decodeFrame((await lp.read()).subarray())
+        if (event.length === 0) {
+          break
+        }
+        received += event.length
+        yield event
+      }
+      finished = true
+      await stream.close()
+      if (stats) {
+        this.recordCall(ma, peerId, stats, opened.transport, payload.length, received, started)
+      }
+    } catch (err) {
+      if (!signal?.aborted) {
+        this.recordFailure(stats, err)
+      }
+      throw err
+    } finally {
+      signal?.removeEventListener('abort', onAbort)
+      if (stream && !finished) {
+        // The consumer went away (or the exchange failed) mid-stream.
+        stream.abort(new Error('Stream cancelled'))
+      }
+    }
+  }
+
+  async exchange(stream, payload) {
+    if (stream.protocol === FRAME_PROTOCOL) {
+      const lp = lpStream(stream, { maxDataLength: MAX_FRAME_BYTES })
+      await lp.write(await encodeFrame(QUERY_PATH, payload, frame_options))
+      const { payload: reply } = await decodeFrame((await lp.read()).subarray())
+      return reply
+    }
+
+    const lp = lpStream(stream)
+    const body = JSON.parse(new TextDecoder().decode(payload))
+    await lp.write(jsonBytes({ path: QUERY_PATH, body: body }))
     const res = await lp.read()
-    return JSON.parse(new TextDecoder().decode(res.subarray()))
+    return Buffer.from(res.subarray())
+  }
+
+  peerStats(peerId) {
+    let stats = this.peers.get(peerId)
+    if (!stats) {
+      stats = {
+        calls: { relay: 0, webrtc: 0 },
+        failures: 0,
+        bytes_sent: 0,
+        bytes_received: 0,
+        last_latency_ms: null,
+        last_call_at: null,
+        last_error: null,
+        upgrading: false,
+        upgrade_attempts: 0,
+        upgraded_at: null,
+        last_upgrade_error: null,
+        next_upgrade_at: 0,
+        upgrade_backoff_ms: UPGRADE_BACKOFF_MS
+      }
+      this.peers.set(peerId, stats)
+    }
+    return stats
+  }
+
+  directConnection(peerId) {
+    return this.node.getConnections().find(c =>
+      c.status === 'open' && c.remotePeer.toString() === peerId && this.isWebRTC(c.remoteAddr)
+    )
+  }
+
+  // Dial `<relay>/p2p-circuit/webrtc/p2p/<peer>`: the relayed connection is
+  // only used to exchange SDP, then traffic flows peer to peer.
+  upgradePeer(ma, peerId, stats) {
+    const suffix = `/p2p/${peerId}`
+    const addr = ma.toString()
+    if (!direct_upgrade || stats.upgrading || Date.now() < stats.next_upgrade_at ||
+        !addr.includes('/p2p-circuit') || !addr.endsWith(suffix) || this.isWebRTC(ma)) {
+      return
+    }
+
+    stats.upgrading = true
+    stats.upgrade_attempts += 1
+    const webrtcMa = multiaddr(`${addr.slice(0, -suffix.length)}/webrtc${suffix}`)
+    this.node.dial(webrtcMa, { signal: AbortSignal.timeout(UPGRADE_TIMEOUT_MS) })
+      .then(conn => {
+        stats.upgraded_at = Date.now()
+        stats.last_upgrade_error = null
+        stats.upgrade_backoff_ms = UPGRADE_BACKOFF_MS
+        console.log(`Upgraded ${peerId} to direct connection: ${conn.remoteAddr.toString()}`)
+      })
+      .catch(err => {
+        stats.last_upgrade_error = err.message
+        stats.next_upgrade_at = Date.now() + stats.upgrade_backoff_ms
+        stats.upgrade_backoff_ms = Math.min(stats.upgrade_backoff_ms * 2, MAX_UPGRADE_BACKOFF_MS)
+        console.error(`Direct connection to ${peerId} failed:`, err.message)
+      })
+      .finally(() => {
+        stats.upgrading = false
+      })
+  }
+
+  transportStats() {
+    const peers = {}
+    for (const [peerId, stats] of this.peers) {
+      const direct = this.directConnection(peerId)
+      const { upgrade_backoff_ms, next_upgrade_at, ...rest } = stats
+      peers[peerId] = {
+        ...rest,
+        transport: direct ? 'webrtc' : 'relay',
+        direct_address: direct ? direct.remoteAddr.toString() : null
+      }
+    }
+    return peers
   }
 
   async queryPeer(receiver_peerId, query) {
-    const ma = multiaddr(`${RELAY_ADDRESS}/p2p-circuit/p2p/${receiver_peerId}`)
-    console.log(`Querying peer ${receiver_peerId} at ${ma.toString()}`)
-    return this.callPeer(ma, { name: this.name, query: query, peerid: this.peerId })
+    console.log(`Querying peer ${receiver_peerId}`)
+    const reply = await this.callPeer(this.circuitAddresses(receiver_peerId), jsonBytes({ name: this.name, query: query, peerid: this.peerId }))
+    return JSON.parse(new TextDecoder().decode(reply))
   }
 
   isWebRTC(ma) {
@@ -232,51 +780,244 @@ class P2PNode {
 
 // 创建Express应用
 const app = express();
-app.use(express.json());
 
-// 创建P2P节点但不立即初始化
-const n = new P2PNode("node_name");
+// agent 端口 -> P2PNode
+const nodes = new Map();
+// 共享模式下正在注册中的 agent 端口 -> Promise<P2PNode>
+const pending = new Map();
+let idleTimer = null;
+
+// 退出前落盘各身份的已知对端
+function saveKnownPeers() {
+  for (const node of nodes.values()) {
+    try {
+      node.knownPeers?.save();
+    } catch (err) {
+      console.error('Failed to save peer store:', err);
+    }
+  }
+}
+for (const signal of ['SIGTERM', 'SIGINT']) {
+  process.on(signal, () => {
+    saveKnownPeers();
+    process.exit(0);
+  });
+}
+
+function scheduleIdleExit() {
+  clearTimeout(idleTimer);
+  if (shared_mode && nodes.size === 0 && pending.size === 0) {
+    idleTimer = setTimeout(() => {
+      console.log('No agents attached, exiting');
+      saveKnownPeers();
+      process.exit(0);
+    }, idle_exit_ms);
+  }
+}
+
+// 按 ?agent_port= 选择发送方节点; 只有一个节点时可省略
+function nodeFor(req, res) {
+  const agentPort = req.query.agent_port;
+  const node = agentPort ? nodes.get(parseInt(agentPort, 10))
+                         : nodes.size === 1 ? nodes.values().next().value : undefined;
+  if (!node) {
+    res.status(404).json({ error: `Unknown agent_port: ${agentPort}` });
+  }
+  return node;
+}
+
+function nodeContext(node) {
+  return {
+    agent_port: node.agentPort,
+    peer_id: node.peerId,
+    p2p_address: node.listenAddress,
+    p2p_addresses: node.listenAddresses
+  };
+}
+
+// 目标: ?peer_id= 时按 relay RTT 依次尝试各 relay 电路, 否则使用 ?p2p_address=
+function targetFor(node, req) {
+  return req.query.peer_id ? node.circuitAddresses(req.query.peer_id) : req.query.p2p_address;
+}
+
+if (!shared_mode) {
+  // 创建P2P节点但不立即初始化
+  nodes.set(isek_agent_port, new P2PNode("node_name", isek_agent_port, isek_agent_socket));
+}
 
 // 实现HTTP路由
-app.post('/call_peer', async (req, res) => {
+// 请求体以原始字节转发, 不在网桥上解析/重新序列化
+app.post('/call_peer', express.raw({ type: () => true, limit: MAX_FRAME_BYTES }), async (req, res) => {
 //  const { senderNodeId, receiverP2pAddress, message } = req.body;
-  const receiverP2pAddress = req.query.p2p_address;
+  const n = nodeFor(req, res);
+  if (!n) return;
+  const receiverP2pAddress = targetFor(n, req);
   try {
-    const reply = await n.callPeer(receiverP2pAddress, req.body);
-    console.log(`Received callPeer request: body=${req.body}, receiverP2pAddress=${receiverP2pAddress}`);
-    res.json(reply);
+    const payload = Buffer.isBuffer(req.body) ? req.body : Buffer.alloc(0);
+    const reply = await n.callPeer(receiverP2pAddress, payload);
+    console.log(`Received callPeer request: ${payload.length} bytes, receiverP2pAddress=${receiverP2pAddress}`);
+    res.type('application/json').send(reply);
   } catch (err) {
     res.status(500).json({ error: err.message });
   }
 });
 
+// 以 text/event-stream 逐个转发对端 agent 的流式事件
+app.post('/stream_peer', express.raw({ type: () => true, limit: MAX_FRAME_BYTES }), async (req, res) => {
+  const n = nodeFor(req, res);
+  if (!n) return;
+  const receiverP2pAddress = targetFor(n, req);
+  const payload = Buffer.isBuffer(req.body) ? req.body : Buffer.alloc(0);
+  const controller = new AbortController();
+  res.on('close', () => {
+    if (!res.writableFinished) {
+      controller.abort();
+    }
+  });
+  const events = n.streamPeer(receiverP2pAddress, payload, controller.signal);
+  try {
+    let first = true;
+    for await (const event of events) {
+      if (first) {
+        res.status(200).type('text/event-stream').setHeader('Cache-Control', 'no-cache');
+        first = false;
+      }
+      res.write(`data: ${event.toString('utf8')}\n\n`);
+    }
+    res.end();
+  } catch (err) {
+    if (!res.headersSent) {
+      res.status(500).json({ error: err.message });
+    } else {
+      res.end(`event: error\ndata: ${JSON.stringify({ error: err.message })}\n\n`);
+    }
+  }
+});
+
+app.get('/p2p_stats', (req, res) => {
+  const n = nodeFor(req, res);
+  if (!n) return;
+  res.json({ peer_id: n.peerId, relays: n.relayStats(), peers: n.transportStats() });
+});
+
 app.get('/p2p_context', (req, res) => {
+  const n = nodeFor(req, res);
+  if (!n) return;
   console.log("peer_id: " + n.peerId);
   console.log("listenAddress: " + n.listenAddress);
-  res.json({
-    peer_id: n.peerId,
-    p2p_address: n.listenAddress
-  });
+  res.json(nodeContext(n));
 });
 
+// 共享模式: agent 注册/注销/列表, 只接受经控制 socket 或回环地址的请求
+const LOOPBACK_ADDRESSES = new Set(['127.0.0.1', '::1', '::ffff:127.0.0.1']);
+
+function localOnly(req, res, next) {
+  // Unix socket 上的连接没有 remoteAddress
+  const address = req.socket.remoteAddress;
+  if (address === undefined || LOOPBACK_ADDRESSES.has(address)) {
+    return next();
+  }
+  res.status(403).json({ error: '/agents is only served to local clients' });
+}
+
+function agentSocketAllowed(socketPath) {
+  return agent_socket_dir !== null && path.dirname(path.resolve(socketPath)) === agent_socket_dir;
+}
+
+app.use('/agents', localOnly);
+
+app.post('/agents', async (req, res) => {
+  if (!shared_mode) {
+    return res.status(409).json({ error: 'Bridge is not running in --shared mode' });
+  }
+  const agentPort = parseInt(req.query.agent_port, 10);
+  if (!(agentPort > 0 && agentPort < 65536)) {
+    return res.status(400).json({ error: `Invalid agent_port: ${req.query.agent_port}` });
+  }
+  const agentSocket = req.query.agent_socket || null;
+  if (agentSocket && !agentSocketAllowed(agentSocket)) {
+    return res.status(400).json({ error: `agent_socket must be in the agent socket directory: ${agentSocket}` });
+  }
+  clearTimeout(idleTimer);
+  try {
+    let node = nodes.get(agentPort);
+    if (!node) {
+      if (!pending.has(agentPort)) {
+        pending.set(agentPort, (async () => {
+          const created = new P2PNode(`agent-${agentPort}`, agentPort, agentSocket);
+          await created.initP2P();
+          await created.connectRelays();
+          created.redialKnownPeers();
+          nodes.set(agentPort, created);
+          console.log(`Attached agent on port ${agentPort} as ${created.peerId} (${nodes.size} agents)`);
+          return created;
+        })().finally(() => pending.delete(agentPort)));
+      }
+      node = await pending.get(agentPort);
+    }
+    await node.waitForListenAddress();
+    res.json(nodeContext(node));
+  } catch (err) {
+    console.error(`Failed to attach agent on port ${agentPort}:`, err);
+    res.status(500).json({ error: err.message });
+    scheduleIdleExit();
+  }
+});
+
+app.delete('/agents', async (req, res) => {
+  const agentPort = parseInt(req.query.agent_port, 10);
+  const node = nodes.get(agentPort);
+  if (!node) {
+    return res.status(404).json({ error: `Unknown agent_port: ${req.query.agent_port}` });
+  }
+  nodes.delete(agentPort);
+  await node.stop();
+  console.log(`Detached agent on port ${agentPort} (${nodes.size} agents)`);
+  res.json({ detached: agentPort });
+  scheduleIdleExit();
+});
+
+app.get('/agents', (req, res) => {
+  res.json({ agents: [...nodes.values()].map(nodeContext) });
+});
+
+
+function listen(target, description) {
+  return new Promise((resolve) => {
+    const server = typeof target === 'number'
+      ? app.listen(target, '0.0.0.0', () => resolve(server))
+      : app.listen(target, () => resolve(server));
+    server.on('error', (err) => {
+      console.error('Server error:', err);
+      process.exit(1);
+    });
+  }).then((server) => {
+    console.log(`Libp2p server running at ${description}`);
+    return server;
+  });
+}
 
 try {
-  const server = app.listen(p2p_server_port, '0.0.0.0', async () => {
-    console.log(`Libp2p server running at 0.0.0.0:${p2p_server_port}`);
+  if (p2p_server_socket && fs.existsSync(p2p_server_socket)) {
+    // 上一次运行遗留的 socket 文件
+    fs.unlinkSync(p2p_server_socket);
+  }
+  await Promise.all([
+    p2p_server_port ? listen(p2p_server_port, `0.0.0.0:${p2p_server_port}`) : null,
+    p2p_server_socket ? listen(p2p_server_socket, p2p_server_socket) : null
+  ]);
+  if (shared_mode) {
+    scheduleIdleExit();
+  } else {
     try {
-      await n.setup();
+      await nodes.get(isek_agent_port).setup();
     } catch (err) {
       console.error('Failed to initialize P2P node:', err);
       process.exit(1);
     }
-  });
-
-  server.on('error', (err) => {
-    console.error('Server error:', err);
-    process.exit(1);
-  });
+  }
 } catch (err) {
   // Listen itself threw synchronously!
   console.error('Listen failed immediately:', err);
   process.exit(1);
-}
\ No newline at end of file
+}
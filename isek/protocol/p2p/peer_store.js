@@ -0,0 +1,85 @@
+// File-backed record of the peers a bridge identity has talked to.
+//
+// libp2p keeps its peer store in memory unless given a datastore, so a
+// restarted bridge forgets every address it learned.  This keeps the useful
+// part (addresses, protocols, last-seen time) in a small JSON file that is
+// loaded at startup, merged into libp2p's peer store and used to redial the
+// most recently seen peers.
+
+import fs from 'fs'
+import path from 'path'
+
+const SAVE_DELAY_MS = 2000
+
+export class PeerStoreFile {
+  /**
+   * @param {string} file - JSON file to load from and save to.
+   * @param {{maxPeers?: number, maxAgeMs?: number}} options - Peers beyond
+   *   `maxPeers` (least recently seen first) or unseen for `maxAgeMs` are dropped.
+   */
+  constructor (file, { maxPeers = 500, maxAgeMs = 7 * 24 * 3600 * 1000 } = {}) {
+    this.file = file
+    this.maxPeers = maxPeers
+    this.maxAgeMs = maxAgeMs
+    this.peers = new Map()
+    this.saveTimer = null
+    this.load()
+  }
+
+  load () {
+    try {
+      const data = JSON.parse(fs.readFileSync(this.file, 'utf8'))
+      const cutoff = Date.now() - this.maxAgeMs
+      for (const [peerId, entry] of Object.entries(data.peers || {})) {
+        if (entry.last_seen >= cutoff) {
+          this.peers.set(peerId, entry)
+        }
+      }
+    } catch (err) {
+      if (err.code !== 'ENOENT') {
+        console.error(`Ignoring unreadable peer store ${this.file}:`, err.message)
+      }
+    }
+  }
+
+  /**
+   * Record that `peerId` was seen, merging in any new addresses and protocols.
+   */
+  remember (peerId, { addrs = [], protocols = [] } = {}) {
+    const entry = this.peers.get(peerId) || { addrs: [], protocols: [], last_seen: 0 }
+    entry.addrs = [...new Set([...addrs, ...entry.addrs])].slice(0, 16)
+    if (protocols.length > 0) {
+      entry.protocols = [...new Set(protocols)]
+    }
+    entry.last_seen = Date.now()
+    this.peers.set(peerId, entry)
+    this.scheduleSave()
+  }
+
+  /**
+   * Return up to `limit` [peerId, entry] pairs, most recently seen first.
+   */
+  recent (limit = Infinity) {
+    return [...this.peers.entries()]
+      .sort((a, b) => b[1].last_seen - a[1].last_seen)
+      .slice(0, limit)
+  }
+
+  scheduleSave () {
+    if (!this.saveTimer) {
+      this.saveTimer = setTimeout(() => this.save(), SAVE_DELAY_MS)
+      this.saveTimer.unref()
+    }
+  }
+
+  // Synchronous so it can run from exit handlers.
+  save () {
+    clearTimeout(this.saveTimer)
+    this.saveTimer = null
+    const peers = Object.fromEntries(this.recent(this.maxPeers))
+    fs.mkdirSync(path.dirname(this.file), { recursive: true, mode: 0o700 })
+    const tmp = `${this.file}.tmp`
+    fs.writeFileSync(tmp, JSON.stringify({ peers }))
+    fs.renameSync(tmp, this.file)
+  }
+}
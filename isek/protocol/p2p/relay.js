@@ -1,8 +1,22 @@
 // A minimal libp2p circuit-relay v2 (HOP) node over WebSockets.
 // Usage:
-//   node relay.js --port=9090
-// Output will include the peer id and listen multiaddrs. Use one of the
-// printed addresses (ending with /ws) as the RELAY_ADDRESS in p2p_server.js.
+//   node relay.js --port=9090 [--key_file=relay.key] [--metrics_port=9190]
+//                 [--max_reservations=15] [--reservation_ttl=7200]
+//                 [--data_limit=131072] [--duration_limit=120]
+//                 [--hop_timeout=30] [--max_hop_streams=32] [--max_stop_streams=64]
+// Output will include the peer id and listen multiaddrs. Pass one or more of
+// the printed addresses (ending with /ws/p2p/<peer id>) to p2p_server.js as
+// --relays; several relay processes can run side by side as a cluster.
+//
+// --key_file keeps the relay's identity across restarts, so the addresses
+// configured in bridges stay valid.  --data_limit (bytes) and
+// --duration_limit (seconds) cap each relayed connection; set both to 0 to
+// relay without limits.  --max_hop_streams and --max_stop_streams bound the
+// concurrent circuit streams per client connection.
+//
+// With --metrics_port, GET http://127.0.0.1:<port>/metrics returns active and
+// rejected reservations, open circuits with the bytes relayed through each,
+// and the relay process's CPU and memory use (see relay_metrics.js).
 
 import { createLibp2p } from 'libp2p'
 import { noise } from '@chainsafe/libp2p-noise'
@@ -12,19 +26,91 @@ import * as filters from '@libp2p/websockets/filters'
 import { identify, identifyPush } from '@libp2p/identify'
 import { ping } from '@libp2p/ping'
 import { circuitRelayServer } from '@libp2p/circuit-relay-v2'
+import { generateKeyPair, privateKeyFromProtobuf, privateKeyToProtobuf } from '@libp2p/crypto/keys'
+import fs from 'fs'
+import http from 'http'
+import path from 'path'
+import { RelayMetrics } from './relay_metrics.js'
 
-// Read --port=XXXX from argv (default 9090)
+// Read --name=value options from argv
 const args = process.argv.slice(2)
-const portArg = args.find(a => a.startsWith('--port='))
-const port = portArg ? parseInt(portArg.split('=')[1], 10) : 9090
+function option (name, fallback) {
+  const arg = args.find(a => a.startsWith(`--${name}=`))
+  return arg ? arg.slice(name.length + 3) : fallback
+}
+
+const port = parseInt(option('port', '9090'), 10)
+const keyFile = option('key_file', null)
+const maxReservations = parseInt(option('max_reservations', '15'), 10)
+const dataLimit = BigInt(option('data_limit', String(1 << 17)))
+const durationLimit = parseInt(option('duration_limit', '120'), 10)
+const reservationTtl = parseInt(option('reservation_ttl', '7200'), 10)
+const hopTimeout = parseInt(option('hop_timeout', '30'), 10)
+const maxHopStreams = parseInt(option('max_hop_streams', '32'), 10)
+const maxStopStreams = parseInt(option('max_stop_streams', '64'), 10)
+const metricsPort = parseInt(option('metrics_port', '0'), 10)
 
 if (!Number.isInteger(port) || port <= 0 || port >= 65536) {
-  console.error(`Invalid --port: ${portArg}`)
+  console.error(`Invalid --port: ${option('port')}`)
+  process.exit(1)
+}
+if (!(maxReservations > 0) || dataLimit < 0n || !(durationLimit >= 0) ||
+    !(reservationTtl > 0) || !(hopTimeout > 0) || !(maxHopStreams > 0) || !(maxStopStreams > 0)) {
+  console.error('Invalid relay limits')
   process.exit(1)
 }
 
+// Load the relay's private key from keyFile, creating it on first start
+async function loadPrivateKey () {
+  if (!keyFile) {
+    return undefined
+  }
+  if (fs.existsSync(keyFile)) {
+    return privateKeyFromProtobuf(Buffer.from(fs.readFileSync(keyFile, 'utf8').trim(), 'base64'))
+  }
+  const privateKey = await generateKeyPair('Ed25519')
+  fs.mkdirSync(path.dirname(keyFile), { recursive: true })
+  fs.writeFileSync(keyFile, Buffer.from(privateKeyToProtobuf(privateKey)).toString('base64'), { mode: 0o600 })
+  return privateKey
+}
+
+// Serve metrics.snapshot(), plus process usage, as JSON on /metrics
+function serveMetrics (node, metrics) {
+  let lastCpu = process.cpuUsage()
+  let lastAt = Date.now()
+  const server = http.createServer((req, res) => {
+    if (req.url !== '/metrics') {
+      res.writeHead(404).end()
+      return
+    }
+    const cpu = process.cpuUsage(lastCpu)
+    const elapsedMs = Math.max(Date.now() - lastAt, 1)
+    lastCpu = process.cpuUsage()
+    lastAt = Date.now()
+    const body = {
+      peer_id: node.peerId.toString(),
+      connections: node.getConnections().length,
+      ...metrics.snapshot(),
+      process: {
+        rss_bytes: process.memoryUsage().rss,
+        // CPU use since the previous scrape, as a percentage of one core
+        cpu_percent: (cpu.user + cpu.system) / 1000 / elapsedMs * 100
+      }
+    }
+    res.writeHead(200, { 'Content-Type': 'application/json' })
+    res.end(JSON.stringify(body))
+  })
+  server.listen(metricsPort, '127.0.0.1', () => {
+    console.log(`Metrics on http://127.0.0.1:${metricsPort}/metrics`)
+  })
+  return server
+}
+
 async function main() {
+  const metrics = new RelayMetrics({ reservationTtlMs: reservationTtl * 1000 })
   const node = await createLibp2p({
+    privateKey: await loadPrivateKey(),
+    metrics: () => metrics,
     addresses: {
       listen: [
         // WebSocket listener on the specified port
@@ -46,12 +132,27 @@ async function main() {
         // Enable HOP (act as a relay for other peers)
         hop: {
           enabled: true
+        },
+        hopTimeout: hopTimeout * 1000,
+        maxInboundHopStreams: maxHopStreams,
+        maxOutboundStopStreams: maxStopStreams,
+        reservations: {
+          maxReservations,
+          reservationTtl: reservationTtl * 1000,
+          // Without a cap on both, relayed connections are unlimited
+          applyDefaultLimit: dataLimit > 0n || durationLimit > 0,
+          defaultDataLimit: dataLimit > 0n ? dataLimit : undefined,
+          defaultDurationLimit: durationLimit > 0 ? durationLimit * 1000 : undefined
         }
       })
     }
   })
 
+  node.addEventListener('peer:disconnect', evt => {
+    metrics.peerDisconnected(evt.detail.toString())
+  })
   await node.start()
+  const metricsServer = metricsPort > 0 ? serveMetrics(node, metrics) : null
 
   const peerId = node.peerId.toString()
   console.log(`Relay peer started. peerId=${peerId}`)
@@ -64,7 +165,9 @@ async function main() {
   const logInterval = setInterval(() => {
     try {
       const conns = node.getConnections() || []
-      console.log(`[status] connections=${conns.length}`)
+      const { reservations, circuits } = metrics.snapshot()
+      console.log(`[status] connections=${conns.length} reservations=${reservations.active}/${maxReservations} ` +
+        `circuits=${circuits.active} bytes_relayed=${circuits.bytes_relayed}`)
     } catch (err) {
       // no-op
     }
@@ -72,6 +175,7 @@ async function main() {
 
   const shutdown = async () => {
     clearInterval(logInterval)
+    metricsServer?.close()
     try {
       await node.stop()
     } catch (err) {
@@ -0,0 +1,336 @@
+// Reservation and circuit accounting for relay.js.
+//
+// RelayMetrics is handed to libp2p as its metrics implementation, so libp2p
+// reports every negotiated protocol stream to trackProtocolStream().  Circuit
+// relay v2 streams are followed from there:
+//
+// * an inbound HOP stream carries one request (RESERVE or CONNECT) answered
+//   with a status; both are read off the wire to count accepted and rejected
+//   reservations and failed connects;
+// * an outbound STOP stream is opened towards the destination of every
+//   circuit and lives as long as the circuit, so it gives the active circuits
+//   and the bytes relayed through each of them.
+//
+// Metrics libp2p registers itself are kept too and reported under `libp2p`.
+
+export const HOP_PROTOCOL = '/libp2p/circuit/relay/0.2.0/hop'
+export const STOP_PROTOCOL = '/libp2p/circuit/relay/0.2.0/stop'
+
+// HopMessage.Type and Status values from the circuit relay v2 spec
+const HOP_RESERVE = 0
+const HOP_CONNECT = 1
+const STATUS_OK = 100
+const STATUS_NAMES = {
+  100: 'OK',
+  200: 'RESERVATION_REFUSED',
+  201: 'RESOURCE_LIMIT_EXCEEDED',
+  202: 'PERMISSION_DENIED',
+  203: 'CONNECTION_FAILED',
+  204: 'NO_RESERVATION',
+  400: 'MALFORMED_MESSAGE',
+  401: 'UNEXPECTED_MESSAGE'
+}
+
+function readVarint (buf, offset) {
+  let value = 0
+  let shift = 0
+  while (offset < buf.length) {
+    const byte = buf[offset++]
+    value += (byte & 0x7f) * 2 ** shift
+    if ((byte & 0x80) === 0) {
+      return [value, offset]
+    }
+    shift += 7
+  }
+  return [null, offset]
+}
+
+/**
+ * Read the `type` (field 1) and `status` (field 5) of the first
+ * length-prefixed HopMessage in `buf`.  Returns null until the whole message
+ * has arrived.
+ */
+export function parseHopMessage (buf) {
+  const [length, start] = readVarint(buf, 0)
+  if (length === null || buf.length < start + length) {
+    return null
+  }
+  const end = start + length
+  const message = { type: HOP_RESERVE, status: null }
+  let offset = start
+  while (offset < end) {
+    let tag, value
+    ;[tag, offset] = readVarint(buf, offset)
+    const field = Math.floor(tag / 8)
+    const wireType = tag & 7
+    if (wireType === 0) {
+      ;[value, offset] = readVarint(buf, offset)
+      if (field === 1) message.type = value
+      if (field === 5) message.status = value
+    } else if (wireType === 2) {
+      ;[value, offset] = readVarint(buf, offset)
+      offset += value
+    } else {
+      break
+    }
+  }
+  return message
+}
+
+// Pass `source` through, calling onChunk(bytes) for every chunk and onEnd()
+// once it is exhausted, fails or is abandoned.
+async function * tap (source, onChunk, onEnd) {
+  try {
+    for await (const chunk of source) {
+      onChunk(chunk.subarray())
+      yield chunk
+    }
+  } finally {
+    onEnd()
+  }
+}
+
+// Collect the first HopMessage seen in a direction of a stream.
+function firstMessage (onMessage) {
+  let buffered = new Uint8Array(0)
+  let done = false
+  return (bytes) => {
+    if (done) {
+      return
+    }
+    const joined = new Uint8Array(buffered.length + bytes.length)
+    joined.set(buffered)
+    joined.set(bytes, buffered.length)
+    buffered = joined
+    const message = parseHopMessage(buffered)
+    if (message) {
+      done = true
+      buffered = null
+      onMessage(message)
+    }
+  }
+}
+
+class Value {
+  constructor (calculate) {
+    this.calculate = calculate
+    this.value = 0
+  }
+
+  update (value) { this.value = value }
+  increment (value = 1) { this.value += value }
+  decrement (value = 1) { this.value -= value }
+  reset () { this.value = 0 }
+
+  timer () {
+    const started = Date.now()
+    return () => this.update((Date.now() - started) / 1000)
+  }
+
+  read () {
+    const value = this.calculate ? this.calculate() : this.value
+    return value instanceof Promise ? undefined : value
+  }
+}
+
+class Group {
+  constructor (calculate) {
+    this.calculate = calculate
+    this.values = {}
+  }
+
+  update (values) { Object.assign(this.values, values) }
+
+  increment (values) {
+    for (const [key, value] of Object.entries(values)) {
+      this.values[key] = (this.values[key] || 0) + (value === true ? 1 : value)
+    }
+  }
+
+  decrement (values) {
+    for (const [key, value] of Object.entries(values)) {
+      this.values[key] = (this.values[key] || 0) - (value === true ? 1 : value)
+    }
+  }
+
+  reset () { this.values = {} }
+
+  timer (key) {
+    const started = Date.now()
+    return () => this.update({ [key]: (Date.now() - started) / 1000 })
+  }
+
+  read () {
+    const values = this.calculate ? this.calculate() : this.values
+    return values instanceof Promise ? undefined : values
+  }
+}
+
+export class RelayMetrics {
+  /**
+   * @param {{reservationTtlMs: number, recentCircuits?: number}} options -
+   *   `reservationTtlMs` is the relay's reservation lifetime, after which a
+   *   reservation that was not renewed stops counting as active;
+   *   `recentCircuits` closed circuits are kept for inspection.
+   */
+  constructor ({ reservationTtlMs, recentCircuits = 100 }) {
+    this.reservationTtlMs = reservationTtlMs
+    this.recentCircuits = recentCircuits
+    this.started = Date.now()
+    // peer id -> reservation expiry
+    this.reservations = new Map()
+    this.reservationsAccepted = 0
+    this.reservationsRejected = {}
+    this.connectsFailed = {}
+    this.circuits = new Map()
+    this.circuitsOpened = 0
+    this.closedCircuits = []
+    this.bytesRelayed = 0
+    this.nextCircuitId = 1
+    this.registered = new Map()
+  }
+
+  // ------------------------- libp2p Metrics interface ------------------------
+
+  trackMultiaddrConnection () {}
+
+  trackProtocolStream (stream, connection) {
+    if (stream.protocol === HOP_PROTOCOL && stream.direction === 'inbound') {
+      this.trackHop(stream, connection)
+    } else if (stream.protocol === STOP_PROTOCOL && stream.direction === 'outbound') {
+      this.trackCircuit(stream, connection)
+    }
+  }
+
+  registerMetric (name, options = {}) {
+    return this.register(name, new Value(options.calculate))
+  }
+
+  registerMetricGroup (name, options = {}) {
+    return this.register(name, new Group(options.calculate))
+  }
+
+  registerCounter (name, options = {}) {
+    return this.register(name, new Value(options.calculate))
+  }
+
+  registerCounterGroup (name, options = {}) {
+    return this.register(name, new Group(options.calculate))
+  }
+
+  createTrace () {
+    return undefined
+  }
+
+  traceFunction (name, fn) {
+    return fn
+  }
+
+  // ------------------------------- accounting --------------------------------
+
+  register (name, metric) {
+    this.registered.set(name, metric)
+    return metric
+  }
+
+  trackHop (stream, connection) {
+    const peerId = connection.remotePeer.toString()
+    let request = null
+    const onRequest = firstMessage(message => { request = message })
+    const onResponse = firstMessage(response => {
+      if (request === null) {
+        return
+      }
+      const status = STATUS_NAMES[response.status] || String(response.status)
+      if (request.type === HOP_RESERVE) {
+        if (response.status === STATUS_OK) {
+          this.reservationsAccepted += 1
+          this.reservations.set(peerId, Date.now() + this.reservationTtlMs)
+        } else {
+          this.reservationsRejected[status] = (this.reservationsRejected[status] || 0) + 1
+        }
+      } else if (request.type === HOP_CONNECT && response.status !== STATUS_OK) {
+        this.connectsFailed[status] = (this.connectsFailed[status] || 0) + 1
+      }
+    })
+    const source = stream.source
+    stream.source = tap(source, onRequest, () => {})
+    const sink = stream.sink
+    stream.sink = (data) => sink(tap(data, onResponse, () => {}))
+  }
+
+  trackCircuit (stream, connection) {
+    const circuit = {
+      id: this.nextCircuitId++,
+      destination: connection.remotePeer.toString(),
+      opened_at: Date.now(),
+      bytes: 0
+    }
+    this.circuits.set(circuit.id, circuit)
+    this.circuitsOpened += 1
+
+    const count = (bytes) => {
+      circuit.bytes += bytes.length
+      this.bytesRelayed += bytes.length
+    }
+    const close = () => {
+      if (this.circuits.delete(circuit.id)) {
+        circuit.closed_at = Date.now()
+        this.closedCircuits.push(circuit)
+        if (this.closedCircuits.length > this.recentCircuits) {
+          this.closedCircuits.shift()
+        }
+      }
+    }
+    const source = stream.source
+    stream.source = tap(source, count, close)
+    const sink = stream.sink
+    stream.sink = (data) => sink(tap(data, count, () => {}))
+  }
+
+  // A relay drops a peer's reservation when the peer disconnects.
+  peerDisconnected (peerId) {
+    this.reservations.delete(peerId)
+  }
+
+  activeReservations () {
+    const now = Date.now()
+    for (const [peerId, expires] of this.reservations) {
+      if (expires <= now) {
+        this.reservations.delete(peerId)
+      }
+    }
+    return this.reservations.size
+  }
+
+  snapshot () {
+    const now = Date.now()
+    const circuitView = c => ({
+      id: c.id,
+      destination: c.destination,
+      bytes: c.bytes,
+      duration_s: ((c.closed_at || now) - c.opened_at) / 1000
+    })
+    const libp2p = {}
+    for (const [name, metric] of this.registered) {
+      libp2p[name] = metric.read()
+    }
+    return {
+      uptime_s: (now - this.started) / 1000,
+      reservations: {
+        active: this.activeReservations(),
+        accepted: this.reservationsAccepted,
+        rejected: { ...this.reservationsRejected }
+      },
+      circuits: {
+        active: this.circuits.size,
+        opened: this.circuitsOpened,
+        failed: { ...this.connectsFailed },
+        bytes_relayed: this.bytesRelayed,
+        open: [...this.circuits.values()].map(circuitView),
+        recent: this.closedCircuits.map(circuitView)
+      },
+      libp2p
+    }
+  }
+}
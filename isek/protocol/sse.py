@@ -0,0 +1,24 @@
+from typing import AsyncIterator, Tuple
+
+import httpx
+
+
+async def aiter_sse(response: httpx.Response) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Yield ``(event, data)`` for every event of a ``text/event-stream`` response.
+
+    Multi-line ``data`` fields are joined with newlines; events without data
+    (comments, keep-alives) are skipped. ``event`` defaults to ``"message"``.
+    """
+    event_type, data = "message", []
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            event_type = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+        elif not line:
+            if data:
+                yield event_type, "\n".join(data)
+            event_type, data = "message", []
+    if data:
+        yield event_type, "\n".join(data)
@@ -1,3 +1,7 @@
+import os
+import sys
+
+
 # Color codes for colorful logging
 class Colors:
     HEADER = "\033[95m"
@@ -36,12 +40,15 @@ def _caller_info() -> str:
     corresponds to the original call-site and not to the internals of the
     logging helpers themselves.
     """
-    import traceback
-    import os
-
-    frame = traceback.extract_stack()[-4]  # see docstring for frame math
-    filename = os.path.basename(frame.filename)
-    return f"{Colors.OKCYAN}{filename}:{frame.lineno}{Colors.ENDC}"
+    # ``sys._getframe`` is used instead of ``traceback.extract_stack`` because
+    # the latter walks (and reads source lines for) the whole stack on every
+    # log call.  Frame 3 here is ``extract_stack()[-4]``.
+    try:
+        frame = sys._getframe(3)
+    except ValueError:  # stack shallower than expected
+        return f"{Colors.OKCYAN}<unknown>{Colors.ENDC}"
+    filename = os.path.basename(frame.f_code.co_filename)
+    return f"{Colors.OKCYAN}{filename}:{frame.f_lineno}{Colors.ENDC}"
 
 
 def log_a2a_protocol(
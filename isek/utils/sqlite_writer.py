@@ -0,0 +1,90 @@
+import queue
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+from isek.utils.log import log
+
+
+class SQLiteWriter:
+    """SQLite file whose writes are committed from a background thread.
+
+    Statements passed to :meth:`write` are queued and committed in batches by
+    a daemon thread, so a caller on the event loop never waits for a commit.
+    The database runs in WAL mode and :meth:`read` has a connection of its
+    own, so lookups do not wait for a commit in progress either.
+
+    :param path: The SQLite file.
+    :type path: str
+    :param schema: SQL script creating the tables, run when the file is opened.
+    :type schema: str
+    :param name: Name of the writer thread, also used in log messages.
+    :type name: str
+    """
+
+    def __init__(self, path: str, schema: str, name: str) -> None:
+        self.name = name
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(schema)
+        self._db.commit()
+        # Held by the writer thread while it commits a batch.
+        self.lock = threading.Lock()
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._read_lock = threading.Lock()
+        # (sql, params) statements for the writer; ``None`` stops it.
+        self._writes: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = threading.Thread(
+            target=self._write_loop, name=name, daemon=True
+        )
+        self._thread.start()
+
+    def read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run the query *sql* and return its rows, as of the last commit."""
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def write(self, sql: str, params: tuple = ()) -> None:
+        """Queue the statement *sql* for the writer thread."""
+        if self._thread is not None:
+            self._writes.put((sql, params))
+
+    def flush(self) -> None:
+        """Block until every queued statement has been committed."""
+        if self._thread is not None:
+            self._writes.join()
+
+    def close(self) -> None:
+        """Commit pending statements, stop the writer and close the file."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._writes.put(None)
+        thread.join()
+        with self.lock:
+            self._db.close()
+        with self._read_lock:
+            self._reader.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            # Commit whatever queued up meanwhile in one transaction.
+            ops: List[Optional[Tuple[str, tuple]]] = [self._writes.get()]
+            while True:
+                try:
+                    ops.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            with self.lock:
+                try:
+                    for op in ops:
+                        if op is not None:
+                            self._db.execute(*op)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self._db.rollback()
+                    log.debug(f"{self.name}: persist failed: {e}")
+            for _ in ops:
+                self._writes.task_done()
+            if None in ops:
+                return
@@ -0,0 +1,24 @@
+import pytest
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+
+def build_card(name: str = "agent", url: str = "http://127.0.0.1:9999", skills=()):
+    """Return a minimal agent card; *skills* are ``(id, tags)`` pairs."""
+    return AgentCard(
+        name=name,
+        url=url,
+        description=f"{name} under test",
+        version="1.0",
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text/plain"],
+        defaultOutputModes=["text/plain"],
+        skills=[
+            AgentSkill(id=skill, name=skill, description=skill, tags=list(tags))
+            for skill, tags in skills
+        ],
+    )
+
+
+@pytest.fixture
+def make_card():
+    return build_card
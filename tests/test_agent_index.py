@@ -0,0 +1,87 @@
+import pytest
+
+from isek.node.agent_index import AgentCardIndex
+
+
+def _card(name, skills=(), inputs=("text/plain",), outputs=("text/plain",)):
+    return {
+        "name": name,
+        "defaultInputModes": list(inputs),
+        "defaultOutputModes": list(outputs),
+        "skills": [
+            {"id": skill, "name": skill.title(), "tags": list(tags)}
+            for skill, tags in skills
+        ],
+    }
+
+
+@pytest.fixture
+def index():
+    index = AgentCardIndex()
+    index.add("http://a", _card("Alpha", [("translate", ["lang", "text"])]))
+    index.add(
+        "http://b",
+        _card("Beta", [("ocr", ["image"])], inputs=["image/png"]),
+    )
+    index.add(
+        "http://c",
+        _card("Gamma", [("translate", ["lang"])], outputs=["audio/wav"]),
+    )
+    return index
+
+
+def test_find_by_single_field(index):
+    assert sorted(index.find_agents(skill="translate")) == ["http://a", "http://c"]
+    assert index.find_agents(tag="image") == ["http://b"]
+    assert index.find_agents(input_mode="image/png") == ["http://b"]
+    assert index.find_agents(output_mode="audio/wav") == ["http://c"]
+    assert index.find_agents(name="beta") == ["http://b"]
+    assert index.find_agents(name="OCR") == ["http://b"]  # skill name
+
+
+def test_criteria_are_intersected(index):
+    assert index.find_agents(skill="translate", tag="text") == ["http://a"]
+    assert index.find_agents(skill="translate", output_mode="audio/wav") == ["http://c"]
+    assert index.find_agents(skill="ocr", tag="lang") == []
+    assert index.find_agents(skill="unknown") == []
+
+
+def test_mode_matches_input_or_output(index):
+    assert sorted(index.find_agents(mode="audio/wav")) == ["http://c"]
+    assert sorted(index.find_agents(mode="image/png")) == ["http://b"]
+    assert sorted(index.find_agents(mode="text/plain")) == [
+        "http://a",
+        "http://b",
+        "http://c",
+    ]
+    assert index.find_agents(skill="translate", mode="image/png") == []
+
+
+def test_no_criteria_returns_every_agent(index):
+    assert sorted(index.find_agents()) == ["http://a", "http://b", "http://c"]
+    assert len(index) == 3
+
+
+def test_matching_is_case_insensitive(index):
+    assert sorted(index.find_agents(skill="TRANSLATE")) == ["http://a", "http://c"]
+    assert index.find_any("Alpha") == {"http://a"}
+
+
+def test_readding_replaces_the_previous_card(index):
+    index.add("http://a", _card("Alpha", [("summarize", [])]))
+    assert index.find_agents(skill="translate") == ["http://c"]
+    assert index.find_agents(tag="text") == []
+    assert index.find_agents(skill="summarize") == ["http://a"]
+
+
+def test_remove_cleans_up_postings(index):
+    index.remove("http://b")
+    index.remove("http://missing")
+    assert "http://b" not in index
+    assert index.find_agents(tag="image") == []
+    assert "image" not in index._postings["tag"]
+
+
+def test_find_any_searches_skill_name_and_tag(index):
+    assert index.find_any("lang") == {"http://a", "http://c"}
+    assert index.find_any("lang", fields=("skill",)) == set()
@@ -0,0 +1,113 @@
+import asyncio
+import gc
+
+import pytest
+
+from isek.adapter.batching import MicroBatchingAgentWrapper
+
+
+def _payload(content):
+    return {"is_task_complete": True, "require_user_input": False, "content": content}
+
+
+class _Agent:
+    def __init__(self, card):
+        self._agent_card = card
+        self.calls = []
+
+    async def invoke(self, query, context_id):
+        self.calls.append(query)
+        await asyncio.sleep(0.01)
+        if query == "fail":
+            raise ValueError("model error")
+        return _payload(query.upper())
+
+
+class _BatchAgent(_Agent):
+    def __init__(self, card, drop=0):
+        super().__init__(card)
+        self.batches = []
+        self.drop = drop
+
+    async def invoke_batch(self, items):
+        self.batches.append(items)
+        results = [_payload(query.upper()) for query, _ in items]
+        return results[: len(results) - self.drop]
+
+
+def _gather(wrapper, queries, return_exceptions=False):
+    async def main():
+        return await asyncio.gather(
+            *(wrapper.invoke(q, f"ctx-{i}") for i, q in enumerate(queries)),
+            return_exceptions=return_exceptions,
+        )
+
+    return asyncio.run(main())
+
+
+def test_identical_queries_are_coalesced(make_card):
+    agent = _Agent(make_card())
+    wrapper = MicroBatchingAgentWrapper(agent, max_wait=0.01)
+    results = _gather(wrapper, ["a", "a", " a ", "b"])
+    assert [r["content"] for r in results] == ["A", "A", "A", "B"]
+    assert sorted(agent.calls) == ["a", "b"]
+    assert wrapper.batches_dispatched == 1
+    assert wrapper.requests_coalesced == 2
+
+
+def test_full_batch_dispatches_without_waiting(make_card):
+    agent = _BatchAgent(make_card())
+    wrapper = MicroBatchingAgentWrapper(agent, max_batch_size=2, max_wait=60)
+    results = _gather(wrapper, ["a", "b", "c", "d"])
+    assert [r["content"] for r in results] == ["A", "B", "C", "D"]
+    assert len(agent.batches) == 2
+
+
+def test_errors_reach_every_caller_of_the_query(make_card):
+    agent = _Agent(make_card())
+    wrapper = MicroBatchingAgentWrapper(agent)
+    results = _gather(wrapper, ["fail", "fail", "ok"], return_exceptions=True)
+    assert isinstance(results[0], ValueError)
+    assert isinstance(results[1], ValueError)
+    assert results[2]["content"] == "OK"
+
+
+def test_short_batch_result_fails_every_caller(make_card):
+    agent = _BatchAgent(make_card(), drop=1)
+    wrapper = MicroBatchingAgentWrapper(agent)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                wrapper.invoke("a", "1"),
+                wrapper.invoke("b", "2"),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_dispatch_survives_garbage_collection(make_card):
+    agent = _Agent(make_card())
+    wrapper = MicroBatchingAgentWrapper(agent, max_wait=0)
+
+    async def main():
+        call = asyncio.ensure_future(wrapper.invoke("a", "1"))
+        await asyncio.sleep(0.001)
+        assert len(wrapper._dispatches) == 1
+        gc.collect()
+        result = await asyncio.wait_for(call, timeout=1)
+        await asyncio.sleep(0)  # let the done callbacks run
+        assert not wrapper._dispatches
+        return result
+
+    assert asyncio.run(main())["content"] == "A"
+
+
+@pytest.mark.parametrize("max_batch_size, max_wait", [(0, 0.0), (1, -1.0)])
+def test_invalid_settings_are_rejected(make_card, max_batch_size, max_wait):
+    with pytest.raises(ValueError):
+        MicroBatchingAgentWrapper(_Agent(make_card()), max_batch_size, max_wait)
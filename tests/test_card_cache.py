@@ -0,0 +1,195 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from isek.node.card_cache import AgentCardCache
+from isek.node.node_v3_a2a import AGENT_CARD_WELL_KNOWN_PATH, Node
+
+URL = "http://agent.test:9000"
+
+
+def _card(name="agent", version="1.0"):
+    return {"name": name, "version": version, "url": URL, "skills": []}
+
+
+def test_validators_and_freshness():
+    cache = AgentCardCache(max_age=60)
+    assert cache.validators(URL) == {}
+    cache.put(URL, _card(), etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    assert cache.validators(URL) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    entry = cache.get(URL)
+    assert cache.is_fresh(entry)
+    entry["fetched_at"] -= 61
+    assert not cache.is_fresh(entry)
+    cache.touch(URL)
+    assert cache.is_fresh(cache.get(URL))
+
+
+def test_put_reports_content_changes():
+    cache = AgentCardCache()
+    assert cache.put(URL, _card())
+    assert not cache.put(URL, _card(), etag='"v2"')
+    assert cache.get(URL)["etag"] == '"v2"'
+    assert cache.put(URL, _card(version="2.0"))
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cards.sqlite")
+    cache = AgentCardCache(persist_path=path)
+    cache.put(URL, _card(), etag='"v1"')
+    cache.put("http://other", _card("other"))
+    cache.remove("http://other")
+    cache.close()
+
+    reopened = AgentCardCache(persist_path=path)
+    assert list(reopened.entries()) == [URL]
+    assert reopened.get(URL)["card"] == _card()
+    assert reopened.validators(URL) == {"If-None-Match": '"v1"'}
+    reopened.close()
+
+
+def test_writes_do_not_wait_for_the_disk(tmp_path):
+    cache = AgentCardCache(persist_path=str(tmp_path / "cards.sqlite"))
+    done = []
+
+    def update():
+        cache.put(URL, _card())
+        cache.touch(URL)
+        cache.remove(URL)
+        done.append(True)
+
+    with cache._db.lock:  # a commit in progress
+        writer = threading.Thread(target=update)
+        writer.start()
+        writer.join(timeout=5)
+        assert done
+    cache.close()
+
+
+class _Agent:
+    """Mock transport serving one agent card with an ETag."""
+
+    def __init__(self):
+        self.card = _card()
+        self.etag = '"v1"'
+        self.requests = []
+        self.down = False
+
+    def handler(self, request):
+        self.requests.append(request)
+        assert request.url.path == AGENT_CARD_WELL_KNOWN_PATH
+        if self.down:
+            raise httpx.ConnectError("refused", request=request)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=self.card, headers={"ETag": self.etag})
+
+
+@pytest.fixture
+def agent():
+    return _Agent()
+
+
+def _node(agent, cache):
+    node = Node(
+        host="127.0.0.1",
+        port=9001,
+        node_id="n",
+        card_cache=cache,
+        direct_dispatch=False,
+        local_sockets=False,
+    )
+    node._http_client = lambda url, timeout: httpx.AsyncClient(
+        transport=httpx.MockTransport(agent.handler)
+    )
+    return node
+
+
+async def _settle(node):
+    while node._background_tasks:
+        await asyncio.gather(*node._background_tasks)
+
+
+def test_fresh_card_is_served_from_cache(agent):
+    node = _node(agent, AgentCardCache(max_age=60))
+
+    async def main():
+        first = await node.get_agent_card_by_url(URL + "/")
+        second = await node.get_agent_card_by_url(URL)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == second == agent.card
+    assert len(agent.requests) == 1
+    assert node.registry.get(URL)["agent_card"] == agent.card
+
+
+def test_stale_card_is_revalidated_in_background(agent):
+    cache = AgentCardCache(max_age=60)
+    node = _node(agent, cache)
+
+    async def main():
+        await node.get_agent_card_by_url(URL)
+        cache.get(URL)["fetched_at"] -= 120
+        stale = await node.get_agent_card_by_url(URL)
+        await _settle(node)
+        return stale
+
+    assert asyncio.run(main()) == agent.card
+    revalidation = agent.requests[1]
+    assert revalidation.headers["if-none-match"] == '"v1"'
+    assert cache.is_fresh(cache.get(URL))
+
+
+def test_changed_card_replaces_the_cached_one(agent):
+    cache = AgentCardCache(max_age=60)
+    node = _node(agent, cache)
+
+    async def main():
+        await node.get_agent_card_by_url(URL)
+        agent.card, agent.etag = _card(version="2.0"), '"v2"'
+        cache.get(URL)["fetched_at"] -= 120
+        stale = await node.get_agent_card_by_url(URL)
+        await _settle(node)
+        return stale, await node.get_agent_card_by_url(URL)
+
+    stale, current = asyncio.run(main())
+    assert stale["version"] == "1.0"
+    assert current["version"] == "2.0"
+    assert cache.get(URL)["etag"] == '"v2"'
+    assert node.registry.get(URL)["agent_card"]["version"] == "2.0"
+
+
+def test_failed_revalidation_keeps_the_stale_card(agent):
+    cache = AgentCardCache(max_age=60)
+    node = _node(agent, cache)
+
+    async def main():
+        await node.get_agent_card_by_url(URL)
+        agent.down = True
+        cache.get(URL)["fetched_at"] -= 120
+        await node.get_agent_card_by_url(URL)
+        await _settle(node)
+
+    asyncio.run(main())
+    assert cache.get(URL)["card"] == agent.card
+    assert not cache.is_fresh(cache.get(URL))
+    assert node.registry.get(URL)["health"].failures == 1
+    assert not node._revalidating
+
+
+def test_persisted_cards_seed_the_registry(agent, tmp_path):
+    path = str(tmp_path / "cards.sqlite")
+    cache = AgentCardCache(persist_path=path)
+    cache.put(URL, _card())
+    cache.close()
+
+    node = _node(agent, AgentCardCache(persist_path=path))
+    assert node.registry.get(URL)["agent_card"] == _card()
+    assert node.find_agents(name="agent") == [URL]
+    node.card_cache.close()
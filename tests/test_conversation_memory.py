@@ -0,0 +1,140 @@
+import asyncio
+import threading
+
+from pydantic_ai.messages import ModelRequest, ModelResponse
+
+from isek.adapter.batching import MicroBatchingAgentWrapper
+from isek.adapter.conversation_memory import (
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+)
+from isek.adapter.open_ai_sdk_adapter import (
+    PydanticAIAgentWrapper as PlainReplyAgentWrapper,
+)
+from isek.adapter.response_cache import CachedAgentWrapper
+
+
+class _PlainReplyAgent:
+    """Agent whose ``run`` returns the reply text itself."""
+
+    def __init__(self):
+        self.histories = []
+
+    async def run(self, query, message_history=None):
+        self.histories.append(message_history)
+        return f"reply to {query}"
+
+
+def _wrapper(make_card, memory):
+    agent = _PlainReplyAgent()
+    return agent, PlainReplyAgentWrapper(agent, make_card(), memory=memory)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_plain_reply_agent_records_turns(make_card):
+    memory = InMemoryConversationStore()
+    agent, wrapper = _wrapper(make_card, memory)
+
+    first = _run(wrapper.invoke("hello", "ctx"))
+    assert first["is_task_complete"] and first["content"] == "reply to hello"
+    _run(wrapper.invoke("and then?", "ctx"))
+
+    assert agent.histories[0] is None
+    replayed = agent.histories[1]
+    assert isinstance(replayed[0], ModelRequest)
+    assert isinstance(replayed[1], ModelResponse)
+    assert replayed[1].parts[0].content == "reply to hello"
+
+
+def test_history_survives_reopening_sqlite_store(make_card, tmp_path):
+    path = str(tmp_path / "memory.sqlite")
+    _, wrapper = _wrapper(make_card, SQLiteConversationStore(path))
+    _run(wrapper.invoke("hello", "ctx"))
+    wrapper.memory.close()
+
+    store = SQLiteConversationStore(path)
+    assert store.has_history("ctx")
+    assert len(store.load("ctx")) == 2
+    store.close()
+
+
+class _ThreadRecordingStore(SQLiteConversationStore):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def load(self, context_id):
+        self.threads.add(threading.get_ident())
+        return super().load(context_id)
+
+    def append(self, context_id, messages):
+        self.threads.add(threading.get_ident())
+        super().append(context_id, messages)
+
+
+def test_sqlite_store_is_used_off_the_event_loop(make_card, tmp_path):
+    store = _ThreadRecordingStore(str(tmp_path / "memory.sqlite"))
+    _, wrapper = _wrapper(make_card, store)
+
+    async def turn():
+        await wrapper.invoke("hello", "ctx")
+        return threading.get_ident()
+
+    loop_thread = _run(turn())
+    assert store.threads and loop_thread not in store.threads
+    assert store.has_history("ctx")
+    store.close()
+
+
+def test_wrappers_expose_the_adapters_memory(make_card):
+    memory = InMemoryConversationStore()
+    _, adapter = _wrapper(make_card, memory)
+    batched = MicroBatchingAgentWrapper(adapter)
+    cached = CachedAgentWrapper(batched)
+    assert adapter.memory is memory
+    assert batched.memory is memory
+    assert cached.memory is memory
+
+
+def test_cache_hit_does_not_skip_recording_the_turn(make_card):
+    memory = InMemoryConversationStore()
+    agent, adapter = _wrapper(make_card, memory)
+    cached = CachedAgentWrapper(adapter)
+
+    _run(cached.invoke("hello", "ctx-a"))
+    _run(cached.invoke("hello", "ctx-b"))  # same first turn, other conversation
+    _run(cached.invoke("and then?", "ctx-b"))
+
+    assert len(agent.histories) == 3
+    assert memory.has_history("ctx-a") and memory.has_history("ctx-b")
+    assert agent.histories[2] is not None
+
+
+def test_cache_still_serves_agents_without_memory(make_card):
+    agent, adapter = _wrapper(make_card, None)
+    cached = CachedAgentWrapper(adapter)
+    _run(cached.invoke("hello", "ctx-a"))
+    _run(cached.invoke("hello", "ctx-b"))
+    assert len(agent.histories) == 1
+
+
+def test_batcher_behind_cache_keeps_conversations_apart(make_card):
+    memory = InMemoryConversationStore()
+    agent, adapter = _wrapper(make_card, memory)
+    # The batcher wraps the adapter and the cache wraps the batcher: memory must
+    # be seen through both layers.
+    cached = CachedAgentWrapper(MicroBatchingAgentWrapper(adapter))
+
+    async def main():
+        await asyncio.gather(cached.invoke("hi", "a"), cached.invoke("hi", "b"))
+        return await asyncio.gather(
+            cached.invoke("more", "a"), cached.invoke("more", "b")
+        )
+
+    _run(main())
+    assert len(agent.histories) == 4
+    assert len(memory.load("a")) == 4
+    assert len(memory.load("b")) == 4
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import TaskState
+
+from isek.adapter.base import AgentAdapter, AgentAdapterExecutor
+
+
+class _SlowAdapter(AgentAdapter):
+    """Runs until cancelled, recording what happened to the run."""
+
+    def __init__(self, card):
+        super().__init__(card)
+        self.started = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+    async def run(self, query: str, context_id: str) -> str:
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return "too late"
+
+
+def _rpc(method: str, params: dict) -> dict:
+    return {"jsonrpc": "2.0", "id": method, "method": method, "params": params}
+
+
+def test_cancel_stops_the_running_agent(make_card):
+    async def scenario():
+        adapter = _SlowAdapter(make_card())
+        executor = AgentAdapterExecutor(adapter)
+        handler = DefaultRequestHandler(
+            agent_executor=executor, task_store=InMemoryTaskStore()
+        )
+        app = A2AStarletteApplication(agent_card=make_card(), http_handler=handler)
+        transport = httpx.ASGITransport(app=app.build())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://agent.test"
+        ) as client:
+            sent = await client.post(
+                "/",
+                json=_rpc(
+                    "message/send",
+                    {
+                        "message": {
+                            "role": "user",
+                            "parts": [{"kind": "text", "text": "take your time"}],
+                            "messageId": "m1",
+                        },
+                        "configuration": {"blocking": False},
+                    },
+                ),
+            )
+            task_id = sent.json()["result"]["id"]
+            await asyncio.wait_for(adapter.started.wait(), 5)
+            assert task_id in executor._running_tasks
+
+            canceled = await client.post(
+                "/", json=_rpc("tasks/cancel", {"id": task_id})
+            )
+            await asyncio.wait_for(adapter.cancelled.wait(), 5)
+            fetched = await client.post("/", json=_rpc("tasks/get", {"id": task_id}))
+
+        assert canceled.json()["result"]["status"]["state"] == TaskState.canceled
+        assert fetched.json()["result"]["status"]["state"] == TaskState.canceled
+        assert executor._running_tasks == {}
+
+    asyncio.run(scenario())
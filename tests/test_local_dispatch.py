@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from a2a.client.errors import A2AClientHTTPError, A2AClientTimeoutError
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    SendMessageRequest,
+    SendMessageResponse,
+    SendMessageSuccessResponse,
+    TextPart,
+)
+
+from isek.node.local_dispatch import LocalAgent
+
+
+def _message(text: str) -> Message:
+    return Message(
+        role=Role.user, parts=[Part(root=TextPart(text=text))], message_id=text
+    )
+
+
+def _request(text: str = "ping") -> SendMessageRequest:
+    return SendMessageRequest(id=1, params=MessageSendParams(message=_message(text)))
+
+
+class _Handler:
+    """Answers each message once ``release`` is set."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+        self.finished = 0
+
+    async def on_message_send(self, request, context):
+        self.started.set()
+        await self.release.wait()
+        self.finished += 1
+        return SendMessageResponse(
+            root=SendMessageSuccessResponse(
+                id=request.id, result=_message(f"re: {request.id}")
+            )
+        )
+
+
+def _agent():
+    handler = _Handler()
+    app = SimpleNamespace(handler=handler)
+    return LocalAgent(app, asyncio.get_running_loop()), handler
+
+
+def test_answers_with_the_handlers_response():
+    async def scenario():
+        agent, handler = _agent()
+        handler.release.set()
+        response = await agent.send_message(_request())
+        assert response.root.result.message_id == "re: 1"
+
+    asyncio.run(scenario())
+
+
+def test_timeout_leaves_the_call_running():
+    async def scenario():
+        agent, handler = _agent()
+        with pytest.raises(A2AClientTimeoutError):
+            await agent.send_message(_request(), timeout=0.05)
+        handler.release.set()
+        await asyncio.gather(*agent._pending)
+        assert handler.finished == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelling_the_caller_propagates_and_leaves_the_call_running():
+    async def scenario():
+        agent, handler = _agent()
+        caller = asyncio.ensure_future(agent.send_message(_request()))
+        await handler.started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert len(agent._pending) == 1
+        handler.release.set()
+        await asyncio.gather(*agent._pending)
+        assert handler.finished == 1
+
+    asyncio.run(scenario())
+
+
+def test_agent_shutdown_looks_like_a_dropped_connection():
+    async def scenario():
+        agent, handler = _agent()
+        caller = asyncio.ensure_future(agent.send_message(_request()))
+        await handler.started.wait()
+        for future in list(agent._pending):
+            future.cancel()
+        with pytest.raises(A2AClientHTTPError) as raised:
+            await caller
+        assert raised.value.status_code == 503
+
+    asyncio.run(scenario())
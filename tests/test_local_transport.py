@@ -0,0 +1,124 @@
+import json
+import os
+import socket
+import threading
+
+import pytest
+
+from isek.protocol.local_transport import (
+    PEER_GONE_ERRORS,
+    LocalPeerClient,
+    LocalPeerDirectory,
+    _frame,
+    _recv_frame,
+)
+
+PEER = "peer"
+
+
+class _Peer:
+    """Raw local-transport peer answering every call with its generation.
+
+    :meth:`restart` rebinds the socket as a new generation; connections of
+    the previous one drop the next request they read, as a peer shutting
+    down does with a request still in its socket buffer.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.generation = 0
+        self.calls = 0
+        self._listener = None
+        self._listen()
+
+    def restart(self) -> None:
+        self.stop()
+        self._listen()
+
+    def stop(self) -> None:
+        # shutdown() wakes the thread blocked in accept(); close() alone does not.
+        self._listener.shutdown(socket.SHUT_RDWR)
+        self._listener.close()
+        self._listener = None
+
+    def _listen(self) -> None:
+        self.generation += 1
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        listener.bind(self.path)
+        listener.listen()
+        self._listener = listener
+        threading.Thread(
+            target=self._accept, args=(listener, self.generation), daemon=True
+        ).start()
+
+    def _accept(self, listener, generation) -> None:
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(
+                target=self._serve, args=(conn, generation), daemon=True
+            ).start()
+
+    def _serve(self, conn, generation) -> None:
+        with conn:
+            while True:
+                try:
+                    request = _recv_frame(conn)
+                except ConnectionError:
+                    return
+                if generation != self.generation:
+                    return
+                self.calls += 1
+                reply = {"id": json.loads(request[1:])["id"], "generation": generation}
+                conn.sendall(_frame(json.dumps(reply).encode()))
+
+
+@pytest.fixture
+def peer(tmp_path):
+    directory = LocalPeerDirectory(str(tmp_path))
+    peer = _Peer(directory.socket_path(PEER))
+    client = LocalPeerClient(directory, timeout=5.0)
+    yield peer, client
+    client.close()
+    if peer._listener is not None:
+        peer.stop()
+
+
+def _call(client, request_id):
+    return json.loads(client.call(PEER, json.dumps({"id": request_id}).encode()))
+
+
+def test_pooled_connection_is_reused(peer):
+    _, client = peer
+
+    assert _call(client, 1) == {"id": 1, "generation": 1}
+    assert _call(client, 2) == {"id": 2, "generation": 1}
+    assert len(client._idle[PEER]) == 1
+
+
+def test_peer_restart_between_calls_reconnects(peer):
+    server, client = peer
+    assert _call(client, 1)["generation"] == 1
+
+    server.restart()
+
+    assert _call(client, 2) == {"id": 2, "generation": 2}
+    assert server.calls == 2
+
+
+def test_peer_gone_after_a_call_is_reported(peer):
+    server, client = peer
+    assert _call(client, 1)["generation"] == 1
+
+    server.stop()
+    server.generation += 1  # the pooled connection drops the next request
+
+    with pytest.raises(PEER_GONE_ERRORS):
+        _call(client, 2)
+    assert not client.has(PEER)
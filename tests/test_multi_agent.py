@@ -0,0 +1,108 @@
+import pytest
+from starlette.testclient import TestClient
+
+from isek.adapter.base import AgentAdapter, AgentAdapterExecutor
+from isek.node.multi_agent import MultiAgentApplication
+from isek.node.node_v3_a2a import Node
+
+
+class _NamedAdapter(AgentAdapter):
+    """Answers every query with ``<agent name>: <query>``."""
+
+    async def run(self, query: str, context_id: str) -> str:
+        return f"{self._agent_card.name}: {query}"
+
+
+def _agent(card):
+    return card, AgentAdapterExecutor(_NamedAdapter(card))
+
+
+def _send(text: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "message/send",
+        "params": {
+            "message": {
+                "role": "user",
+                "parts": [{"kind": "text", "text": text}],
+                "messageId": text,
+            }
+        },
+    }
+
+
+def _get_task(task_id: str) -> dict:
+    return {"jsonrpc": "2.0", "id": 2, "method": "tasks/get", "params": {"id": task_id}}
+
+
+def _reply(response) -> str:
+    task = response.json()["result"]
+    return task["status"]["message"]["parts"][0]["text"]
+
+
+@pytest.fixture
+def server(make_card, monkeypatch):
+    # No wallets or on-chain identities for the test agents.
+    monkeypatch.setattr(Node, "_setup_identity", staticmethod(lambda card: None))
+    app = Node.create_multi_agent_server(
+        [
+            (*_agent(make_card("echo", "http://echo.local:8080")), "echo.local"),
+            _agent(make_card("upper", "http://127.0.0.1:8080/agents/upper")),
+        ]
+    )
+    return app, TestClient(app.build())
+
+
+def test_routes_by_host_and_by_path(server):
+    app, client = server
+
+    by_host = client.post("http://echo.local:8080/", json=_send("hi"))
+    by_path = client.post("http://127.0.0.1:8080/agents/upper", json=_send("hi"))
+
+    assert _reply(by_host) == "echo: hi"
+    assert _reply(by_path) == "upper: hi"
+    assert len(app.task_store) == 2
+
+
+def test_each_agent_serves_its_own_card(server):
+    _, client = server
+
+    echo = client.get("http://echo.local:8080/.well-known/agent-card.json")
+    upper = client.get("http://127.0.0.1:8080/agents/upper/.well-known/agent.json")
+
+    assert echo.json()["name"] == "echo"
+    assert upper.json()["name"] == "upper"
+
+
+def test_unknown_paths_and_methods_are_rejected(server):
+    _, client = server
+
+    assert client.post("/agents/missing", json=_send("hi")).status_code == 404
+    assert client.get("http://echo.local:8080/").status_code == 405
+    extended = client.get("/agents/upper/agent/authenticatedExtendedCard")
+    assert extended.status_code == 404
+
+
+def test_tasks_are_only_visible_to_the_agent_that_ran_them(server):
+    _, client = server
+    sent = client.post("http://echo.local:8080/", json=_send("hi"))
+    task_id = sent.json()["result"]["id"]
+
+    own = client.post("http://echo.local:8080/", json=_get_task(task_id))
+    other = client.post("/agents/upper", json=_get_task(task_id))
+
+    assert own.json()["result"]["id"] == task_id
+    assert "result" not in other.json()
+    assert other.json()["error"]["code"] == -32001  # TaskNotFoundError
+
+
+def test_a_path_or_host_serves_one_agent(make_card):
+    app = MultiAgentApplication()
+    app.add_agent(*_agent(make_card("a", "http://127.0.0.1:8080/agents/a")))
+    app.add_agent(*_agent(make_card("b", "http://b.local")), hosts=["B.local"])
+
+    with pytest.raises(ValueError):
+        app.add_agent(*_agent(make_card("c", "http://127.0.0.1:9090/agents/a")))
+    with pytest.raises(ValueError):
+        app.add_agent(*_agent(make_card("d", "http://d.local")), hosts=["b.local"])
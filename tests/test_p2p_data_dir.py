@@ -0,0 +1,29 @@
+import stat
+
+from isek.protocol.a2a_protocol_v2 import A2AProtocolV2
+
+
+def _protocol(**kwargs):
+    return A2AProtocolV2(
+        port=9999, p2p_enabled=True, supervise=False, agent_socket=False, **kwargs
+    )
+
+
+def test_data_dir_defaults_to_the_users_home(tmp_path, monkeypatch):
+    monkeypatch.delenv("ISEK_P2P_DATA_DIR", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    assert _protocol().p2p_data_dir == str(tmp_path / ".isek" / "p2p")
+
+
+def test_data_dir_is_created_private_before_the_bridge_starts(tmp_path):
+    protocol = _protocol(p2p_data_dir=str(tmp_path / "p2p"))
+    modes = []
+    protocol._spawn_bridge = lambda _path: modes.append(
+        stat.S_IMODE((tmp_path / "p2p").stat().st_mode)
+    )
+    protocol._wait_until_ready = lambda: None
+
+    protocol.start_p2p_server()
+
+    assert modes == [0o700]
@@ -0,0 +1,61 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+FRAMING = Path(__file__).resolve().parents[1] / "isek/protocol/p2p/framing.js"
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="needs node")
+
+SCRIPT = """
+import zlib from 'zlib'
+import { encodeFrame, decodeFrame } from '%s'
+
+const results = {}
+const frame = (codec, body) => Buffer.concat([Buffer.from([codec, 0, 0]), body])
+const attempt = async (name, promise) => {
+  try {
+    results[name] = (await promise).payload.length
+  } catch (err) {
+    results[name] = err.message
+  }
+}
+
+const json = Buffer.from(JSON.stringify({ text: 'agent '.repeat(4000) }))
+for (const codec of ['none', 'gzip', 'brotli']) {
+  const encoded = await encodeFrame('/query', json, { codec, threshold: 1024 })
+  const decoded = await decodeFrame(encoded)
+  results[codec] = [decoded.path, decoded.payload.equals(json), encoded.length]
+}
+const zeros = Buffer.alloc(8 * 1024 * 1024)
+await attempt('gzip_bomb', decodeFrame(frame(1, zlib.gzipSync(zeros)), { maxPayload: 1024 * 1024 }))
+await attempt('brotli_bomb', decodeFrame(frame(2, zlib.brotliCompressSync(zeros)), { maxPayload: 1024 * 1024 }))
+await attempt('within_limit', decodeFrame(frame(2, zlib.brotliCompressSync(zeros))))
+console.log(JSON.stringify(results))
+"""
+
+
+@pytest.fixture(scope="module")
+def results(tmp_path_factory):
+    script = tmp_path_factory.mktemp("framing") / "check.mjs"
+    script.write_text(SCRIPT % FRAMING.as_uri())
+    out = subprocess.run(
+        ["node", str(script)], capture_output=True, text=True, check=True, timeout=60
+    )
+    return json.loads(out.stdout)
+
+
+def test_frames_round_trip(results):
+    size = {}
+    for codec in ("none", "gzip", "brotli"):
+        path, equal, size[codec] = results[codec]
+        assert path == "/query" and equal
+    assert size["brotli"] < size["none"] and size["gzip"] < size["none"]
+
+
+def test_decompression_bombs_are_rejected(results):
+    assert "exceeds 1048576 bytes" in results["gzip_bomb"]
+    assert "exceeds 1048576 bytes" in results["brotli_bomb"]
+    assert results["within_limit"] == 8 * 1024 * 1024
@@ -0,0 +1,54 @@
+import pytest
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from starlette.testclient import TestClient
+
+from isek.adapter.stub_adapter import StubAgentExecutor, StubAgentWrapper
+from isek.node.profiler import ProfiledA2AApplication
+
+LOOPBACK = ("127.0.0.1", 50000)
+REMOTE = ("203.0.113.7", 50000)
+PROFILE = "/admin/profile?seconds=0.05&interval_ms=5"
+
+
+def _client(make_card, client, **kwargs) -> TestClient:
+    card = make_card()
+    handler = DefaultRequestHandler(
+        agent_executor=StubAgentExecutor(StubAgentWrapper(card)),
+        task_store=InMemoryTaskStore(),
+    )
+    app = ProfiledA2AApplication(agent_card=card, http_handler=handler, **kwargs)
+    return TestClient(app.build(), client=client)
+
+
+def test_token_is_required_even_from_loopback(make_card):
+    client = _client(make_card, LOOPBACK, profile_token="s3cret", allow_loopback=True)
+
+    assert client.get(PROFILE).status_code == 403
+    assert (
+        client.get(PROFILE, headers={"Authorization": "Bearer wrong"}).status_code
+        == 403
+    )
+    response = client.get(PROFILE, headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "samples" in response.json()
+
+
+def test_token_admits_remote_clients(make_card):
+    client = _client(make_card, REMOTE, profile_token="s3cret")
+
+    headers = {"Authorization": "Bearer s3cret"}
+    assert client.get(PROFILE, headers=headers).status_code == 200
+
+
+def test_loopback_is_only_trusted_when_enabled(make_card):
+    local = _client(make_card, LOOPBACK, allow_loopback=True)
+    remote = _client(make_card, REMOTE, allow_loopback=True)
+
+    assert local.get(PROFILE).status_code == 200
+    assert remote.get(PROFILE).status_code == 403
+
+
+def test_profiling_without_token_or_loopback_is_refused(make_card):
+    with pytest.raises(ValueError):
+        _client(make_card, LOOPBACK)
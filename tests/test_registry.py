@@ -0,0 +1,92 @@
+import pytest
+
+from isek.node.registry import NodeRegistry, PeerHealth
+
+
+def _card(make_card, name, skills):
+    return make_card(name, skills=skills).model_dump(by_alias=True, exclude_none=True)
+
+
+@pytest.fixture
+def registry(make_card):
+    registry = NodeRegistry()
+    registry.add("http://a/", _card(make_card, "a", [("translate", ["lang"])]))
+    registry.add("http://b", _card(make_card, "b", [("translate", ["lang"])]))
+    registry.add("http://c", _card(make_card, "c", [("summarize", ["text"])]))
+    return registry
+
+
+def test_urls_are_normalised(registry):
+    assert registry.get("http://a")["agent_card"]["name"] == "a"
+    assert registry.get("http://a/") is registry.get("http://a")
+    assert registry.get("http://a")["source"] == "static"
+
+
+def test_adding_again_keeps_health_and_refreshes_card(registry, make_card):
+    registry.record_success("http://a", 0.1)
+    registry.add("http://a", _card(make_card, "a2", [("summarize", [])]))
+    details = registry.get("http://a")
+    assert details["agent_card"]["name"] == "a2"
+    assert details["health"].successes == 1
+    assert registry.candidates("translate") == ["http://b"]
+
+
+def test_health_follows_failures_and_recovers(registry):
+    for _ in range(2):
+        registry.record_failure("http://a")
+    assert registry.is_healthy("http://a")
+    registry.record_failure("http://a")
+    assert not registry.is_healthy("http://a")
+    registry.record_success("http://a", 0.05)
+    assert registry.get("http://a")["health"].consecutive_failures == 0
+    assert not registry.is_healthy("http://unknown")
+
+
+def test_error_rate_threshold():
+    registry = NodeRegistry(max_consecutive_failures=100, max_error_rate=0.3)
+    registry.add("http://a")
+    registry.record_failure("http://a")
+    assert registry.is_healthy("http://a")  # error rate 0.2
+    registry.record_failure("http://a")
+    assert not registry.is_healthy("http://a")  # error rate 0.36
+
+
+def test_candidates_are_healthy_peers_fastest_first(registry):
+    registry.record_success("http://a", 0.3)
+    registry.record_success("http://b", 0.1)
+    assert registry.candidates("translate") == ["http://b", "http://a"]
+    assert registry.candidates("LANG") == ["http://b", "http://a"]
+    assert registry.route("translate") == "http://b"
+
+    for _ in range(3):
+        registry.record_failure("http://b")
+    assert registry.route("translate") == "http://a"
+    assert registry.route("unknown") is None
+
+
+def test_unmeasured_peers_sort_last(registry):
+    registry.record_success("http://b", 2.0)
+    assert registry.candidates("translate") == ["http://b", "http://a"]
+
+
+def test_remove_drops_peer_and_index_entry(registry):
+    registry.remove("http://c/")
+    assert registry.get("http://c") is None
+    assert registry.candidates("summarize") == []
+    assert "http://c" not in registry.index
+
+
+def test_rtt_is_exponentially_smoothed():
+    health = PeerHealth(alpha=0.5)
+    health.record_success(1.0)
+    health.record_success(3.0)
+    assert health.rtt_ewma == pytest.approx(2.0)
+    assert health.to_dict()["successes"] == 2
+
+
+def test_stats_snapshot(registry):
+    registry.record_failure("http://c")
+    stats = registry.stats()
+    assert set(stats) == {"http://a", "http://b", "http://c"}
+    assert stats["http://c"]["failures"] == 1
+    assert stats["http://c"]["healthy"] is True
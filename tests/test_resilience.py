@@ -0,0 +1,204 @@
+import asyncio
+from collections import deque
+
+import httpx
+import pytest
+from a2a.client.errors import A2AClientHTTPError
+from a2a.types import (
+    SendMessageResponse,
+    SendMessageSuccessResponse,
+    Task,
+    TaskState,
+    TaskStatus,
+)
+
+from isek.exceptions import NodeUnavailableError
+from isek.node.node_v3_a2a import Node
+from isek.node.resilience import (
+    CircuitBreaker,
+    HedgePolicy,
+    ResilientCaller,
+    RetryPolicy,
+    is_retryable,
+)
+
+
+def _connect_error():
+    return httpx.ConnectError("refused")
+
+
+class _Peers:
+    """``attempt`` callable whose behaviour is scripted per target."""
+
+    def __init__(self, **behaviour):
+        self.behaviour = behaviour
+        self.calls = []
+        self.cancelled = []
+
+    async def __call__(self, target):
+        self.calls.append(target)
+        outcome = self.behaviour.get(target, "ok")
+        if isinstance(outcome, list):
+            outcome = outcome.pop(0) if len(outcome) > 1 else outcome[0]
+        if isinstance(outcome, float):
+            try:
+                await asyncio.sleep(outcome)
+            except asyncio.CancelledError:
+                self.cancelled.append(target)
+                raise
+            return target
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return target
+
+
+def _caller(**kwargs):
+    kwargs.setdefault("retry", RetryPolicy(max_attempts=3, base_delay=0.001))
+    return ResilientCaller(**kwargs)
+
+
+def test_retryable_failures():
+    assert is_retryable(_connect_error())
+    assert is_retryable(A2AClientHTTPError(503, "busy"))
+    assert not is_retryable(A2AClientHTTPError(500, "boom"))
+    assert not is_retryable(httpx.ReadTimeout("slow"))
+    dropped = A2AClientHTTPError(503, "dropped")
+    dropped.__cause__ = httpx.RemoteProtocolError("closed")
+    assert not is_retryable(dropped)
+
+
+def test_retry_delay_grows_and_is_capped():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3, jitter=0)
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [0.1, 0.2, 0.3, 0.3]
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+def test_connect_errors_are_retried():
+    peers = _Peers(a=[_connect_error(), _connect_error(), "ok"])
+    caller = _caller()
+    assert asyncio.run(caller.call("a", peers)) == "a"
+    assert peers.calls == ["a", "a", "a"]
+    assert caller.retries == 2
+
+
+def test_non_retryable_errors_fail_at_once():
+    peers = _Peers(a=ValueError("bad"))
+    with pytest.raises(ValueError):
+        asyncio.run(_caller().call("a", peers))
+    assert peers.calls == ["a"]
+
+
+def test_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open() and not breaker.allow()
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.allow()  # the trial call
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+def test_open_circuit_fails_fast():
+    caller = _caller(failure_threshold=1, retry=RetryPolicy(max_attempts=1))
+    peers = _Peers(a=_connect_error())
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(caller.call("a", peers))
+    with pytest.raises(NodeUnavailableError):
+        asyncio.run(caller.call("a", peers))
+    assert peers.calls == ["a"]
+
+
+def test_failover_only_to_given_targets():
+    caller = _caller(failure_threshold=1, retry=RetryPolicy(max_attempts=1))
+    caller.breaker("a").record_failure()
+    peers = _Peers()
+    with pytest.raises(NodeUnavailableError):
+        asyncio.run(caller.call("a", peers, hedge_targets=["b"]))
+    assert asyncio.run(caller.call("a", peers, failover_targets=["b"])) == "b"
+    assert peers.calls == ["b"]
+
+
+def _hedging_caller():
+    caller = _caller(hedge=HedgePolicy(min_samples=1, min_delay=0.01))
+    caller._latencies["a"] = deque([0.01])
+    return caller
+
+
+def test_slow_call_is_hedged():
+    caller = _hedging_caller()
+    peers = _Peers(a=1.0, b=0.0)
+    assert asyncio.run(caller.call("a", peers, hedge_targets=["b"])) == "b"
+    assert caller.hedges == 1
+    assert peers.cancelled == ["a"]
+
+
+def test_no_hedge_without_targets():
+    caller = _hedging_caller()
+    peers = _Peers(a=0.05)
+    assert asyncio.run(caller.call("a", peers, failover_targets=["b"])) == "a"
+    assert peers.calls == ["a"] and caller.hedges == 0
+
+
+@pytest.mark.parametrize("cancel_after", [0.005, 0.05])
+def test_cancelled_caller_leaves_no_call_running(cancel_after):
+    caller = _hedging_caller()
+    peers = _Peers(a=1.0, b=1.0)
+
+    async def main():
+        call = asyncio.ensure_future(caller.call("a", peers, hedge_targets=["b"]))
+        await asyncio.sleep(cancel_after)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0.01)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == []
+    assert sorted(peers.cancelled) == sorted(peers.calls)
+
+
+def _success():
+    task = Task(
+        id="t",
+        context_id="c",
+        status=TaskStatus(state=TaskState.completed, message=None),
+    )
+    return SendMessageResponse(root=SendMessageSuccessResponse(id="1", result=task))
+
+
+def test_node_fails_over_only_when_asked(make_card):
+    node = Node(
+        host="127.0.0.1",
+        port=9000,
+        node_id="n",
+        resilience=_caller(failure_threshold=1),
+    )
+    card = make_card(skills=[("translate", [])]).model_dump(
+        by_alias=True, exclude_none=True
+    )
+    node.registry.add("http://a", card)
+    node.registry.add("http://b", card)
+    node.resilience.breaker("http://a").record_failure()
+    sent = []
+
+    async def send_once(url, query, message_id):
+        sent.append(url)
+        return _success()
+
+    node._send_message_once = send_once
+    with pytest.raises(NodeUnavailableError):
+        asyncio.run(node.send_message("http://a", "hi"))
+    assert sent == []
+    asyncio.run(node.send_message("http://a", "hi", failover_peers=True))
+    asyncio.run(node.send_message("http://a", "hi", failover_peers=["http://b/"]))
+    assert sent == ["http://b", "http://b"]
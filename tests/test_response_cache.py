@@ -0,0 +1,137 @@
+import asyncio
+import threading
+
+from isek.adapter import response_cache
+from isek.adapter.response_cache import CachedAgentWrapper, ResponseCache
+
+
+def _payload(content):
+    return {"is_task_complete": True, "require_user_input": False, "content": content}
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class _CountingAgent:
+    def __init__(self, card, delay=0.0):
+        self._agent_card = card
+        self.delay = delay
+        self.calls = 0
+
+    async def invoke(self, query, context_id):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return _payload(f"answer to {query}")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    cache = ResponseCache(ttl=10)
+    cache.set("k", _payload("v"))
+    clock.now += 9
+    assert cache.get("k")["content"] == "v"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", _payload("a"))
+    cache.set("b", _payload("b"))
+    cache.get("a")
+    cache.set("c", _payload("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_hits_return_copies():
+    cache = ResponseCache()
+    cache.set("k", _payload("v"))
+    cache.get("k")["content"] = "changed"
+    assert cache.get("k")["content"] == "v"
+
+
+def test_persisted_entries_reload_after_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(persist_path=path)
+    cache.set("k", _payload("v"))
+    cache.close()
+
+    reopened = ResponseCache(persist_path=path)
+    assert reopened.get("k")["content"] == "v"
+    reopened.clear()
+    reopened.close()
+    cleared = ResponseCache(persist_path=path)
+    assert cleared.get("k") is None
+    cleared.close()
+
+
+def test_persisted_entries_expire(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(ttl=10, persist_path=path)
+    cache.set("k", _payload("v"))
+    cache.close()
+
+    clock.now += 11
+    reopened = ResponseCache(ttl=10, persist_path=path)
+    assert reopened.get("k") is None
+    reopened.close()
+
+
+def test_set_does_not_wait_for_the_disk(tmp_path):
+    cache = ResponseCache(persist_path=str(tmp_path / "cache.sqlite"))
+    with cache._db.lock:  # a commit in progress
+        cache.set("k", _payload("v"))
+        assert cache.get("k")["content"] == "v"
+    cache.flush()
+    cache.close()
+
+
+def test_disk_lookups_do_not_wait_for_a_commit(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(persist_path=path)
+    cache.set("k", _payload("v"))
+    cache.close()
+
+    reopened = ResponseCache(persist_path=path)
+    found = []
+    with reopened._db.lock:  # a commit in progress
+        lookup = threading.Thread(target=lambda: found.append(reopened.get("k")))
+        lookup.start()
+        lookup.join(timeout=5)
+    assert found and found[0]["content"] == "v"
+    reopened.close()
+
+
+def test_identical_concurrent_queries_run_once(make_card):
+    agent = _CountingAgent(make_card(), delay=0.05)
+    wrapper = CachedAgentWrapper(agent)
+
+    async def main():
+        return await asyncio.gather(*(wrapper.invoke("q", "") for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert agent.calls == 1
+    assert {r["content"] for r in results} == {"answer to q"}
+    asyncio.run(wrapper.invoke("q", ""))
+    assert agent.calls == 1
+    assert wrapper.cache.hits >= 1
+
+
+def test_an_explicit_empty_cache_is_used(make_card):
+    cache = ResponseCache()
+    wrapper = CachedAgentWrapper(_CountingAgent(make_card()), cache=cache)
+
+    asyncio.run(wrapper.invoke("q", ""))
+    assert wrapper.cache is cache
+    assert len(cache) == 1
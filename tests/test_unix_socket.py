@@ -0,0 +1,119 @@
+import asyncio
+import os
+
+import pytest
+
+from isek.node import unix_socket
+from isek.node.node_v3_a2a import Node
+from isek.node.unix_socket import (
+    UnixSocketTransport,
+    agent_socket_dir,
+    agent_socket_path,
+    bind_unix_socket,
+    local_socket_for,
+)
+from isek.protocol.a2a_protocol_v2 import A2AProtocolV2
+
+PORT = 9123
+
+needs_unix = pytest.mark.skipif(
+    not unix_socket.UNIX_SOCKETS_SUPPORTED, reason="needs AF_UNIX"
+)
+
+
+@pytest.fixture
+def socket_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ISEK_AGENT_SOCKET_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def unsupported(monkeypatch):
+    monkeypatch.setattr(unix_socket, "UNIX_SOCKETS_SUPPORTED", False)
+
+
+def _transport(node, url):
+    async def build():
+        async with node._http_client(url, 1.0) as client:
+            return client._transport
+
+    return asyncio.run(build())
+
+
+@needs_unix
+def test_loopback_urls_resolve_to_the_agents_socket(socket_dir):
+    path = agent_socket_path(PORT)
+    assert path == str(socket_dir / f"agent-{PORT}.sock")
+    assert local_socket_for(f"http://127.0.0.1:{PORT}") is None
+
+    sock = bind_unix_socket(path)
+    try:
+        assert local_socket_for(f"http://localhost:{PORT}/") == path
+        assert local_socket_for(f"http://example.com:{PORT}") is None
+        node = Node(host="127.0.0.1", port=PORT, node_id="n", uds=True)
+        assert node.uds == path
+        assert isinstance(
+            _transport(node, f"http://127.0.0.1:{PORT}"), UnixSocketTransport
+        )
+    finally:
+        sock.close()
+
+
+def test_without_unix_sockets_everything_stays_on_tcp(socket_dir, unsupported):
+    (socket_dir / f"agent-{PORT}.sock").touch()
+
+    assert agent_socket_path(PORT) is None
+    assert local_socket_for(f"http://127.0.0.1:{PORT}") is None
+    node = Node(host="127.0.0.1", port=PORT, node_id="n", uds=True)
+    assert node.uds is None
+    assert not isinstance(
+        _transport(node, f"http://127.0.0.1:{PORT}"), UnixSocketTransport
+    )
+    protocol = A2AProtocolV2(port=PORT, agent_socket=True)
+    assert protocol.agent_socket is None
+    assert protocol._agent_socket_options() == []
+
+
+@needs_unix
+def test_socket_dir_is_created_private(tmp_path, monkeypatch):
+    path = tmp_path / "sockets"
+    monkeypatch.setenv("ISEK_AGENT_SOCKET_DIR", str(path))
+
+    assert agent_socket_dir() == str(path)
+    assert (path.stat().st_mode & 0o777) == 0o700
+
+
+@needs_unix
+@pytest.mark.parametrize("mode", [0o770, 0o777, 0o755])
+def test_shared_socket_dir_is_rejected(tmp_path, monkeypatch, mode):
+    path = tmp_path / "sockets"
+    path.mkdir()
+    path.chmod(mode)
+    (path / f"agent-{PORT}.sock").touch()
+    monkeypatch.setenv("ISEK_AGENT_SOCKET_DIR", str(path))
+
+    assert agent_socket_dir() is None
+    assert agent_socket_path(PORT) is None
+    assert local_socket_for(f"http://127.0.0.1:{PORT}") is None
+
+
+@needs_unix
+def test_foreign_socket_dir_is_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "sockets"
+    path.mkdir(mode=0o700)
+    monkeypatch.setenv("ISEK_AGENT_SOCKET_DIR", str(path))
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+
+    assert agent_socket_dir() is None
+    assert Node(host="127.0.0.1", port=PORT, node_id="n", uds=True).uds is None
+
+
+@needs_unix
+def test_symlinked_socket_dir_is_rejected(tmp_path, monkeypatch):
+    target = tmp_path / "elsewhere"
+    target.mkdir(mode=0o700)
+    (tmp_path / "sockets").symlink_to(target)
+    monkeypatch.setenv("ISEK_AGENT_SOCKET_DIR", str(tmp_path / "sockets"))
+
+    assert agent_socket_dir() is None